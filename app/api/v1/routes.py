@@ -1,23 +1,43 @@
 # app/api/v1/routes.py
 
 import traceback
-from fastapi import APIRouter, HTTPException, Depends
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel, Field
 from app.schemas.hiring_manager import HiringManagerRequest
+from app.schemas.automation import AutomationRequest, AutomationTaskResponse
 from app.services.agent_service import search_jobs_structured
 # from app.services.job_pipeline import search_and_match_jobs
 from app.services.automation_pipeline import run_full_automation
-from app.services.hiring_manager_pipeline import run_hiring_manager_pipeline
+from app.services.hiring_manager_pipeline import run_hiring_manager_pipeline, stream_hiring_manager_pipeline
 from app.tools.adzuna_search import search_jobs_adzuna
 from app.schemas.job import JobSearchResponse
-from app.database import get_db
-from app.services.job_collector import collect_jobs
-from app.services.job_pipeline import match_unprocessed_jobs
+from app.database import get_db, get_read_db
+from app.services.job_collector import collect_jobs, stream_collect_jobs
+from app.services.job_pipeline import match_unprocessed_jobs, stream_match_unprocessed_jobs
+from app.services.adzuna_service import adzuna_cache, adzuna_quota
+from app.services.task_queue import automation_queue
+from app.services.domain_scheduler import domain_scheduler
+from app.services.http_cache import http_cache
+from app.services.main_content import main_content_stats
+from app.services.scraper_service import download_stats
+from app.services.robots_cache import robots_cache
+from app.services.http_clients import http_clients
+from app.services.description_store import description_store_stats
+from app.services.resilience import resilience
+from app.services.llm_cache import llm_cache
+from app.services.llm_limiter import llm_limiter_stats
 from app.schemas.job import JobSearchResponse
+from app.api.v1.streaming import StreamFormat, stream_pipeline
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
+STREAM_QUERY = Query(
+    None,
+    description="Stream one record per job/person as it completes: 'ndjson' or 'sse'"
+)
+
 
 class JobSearchRequest(BaseModel):
     role: str
@@ -69,18 +89,32 @@ class JobSearchRequest(BaseModel):
 class JobCollectionRequest(BaseModel):
     query: str = Field(..., min_length=2)
     location: str = Field(default="in")
-    max_results: int = Field(default=20, ge=1, le=50)
+    max_results: int = Field(default=20, ge=1, le=500, description="Paginated across Adzuna pages of 50")
 
 
 class JobMatchingRequest(BaseModel):
     min_match_score: int = Field(default=40, ge=0, le=100)
     limit: int = Field(default=20, ge=1, le=100, description="Max jobs to process")
+    rescore: bool = Field(default=False, description="Re-match jobs with stored descriptions, no scraping")
+    cursor: Optional[str] = Field(default=None, description="Rescore: next_cursor from the previous page")
 
 @router.post("/collect")
 async def collect_jobs_endpoint(
     request: JobCollectionRequest,
+    stream: Optional[StreamFormat] = STREAM_QUERY,
     db: AsyncSession = Depends(get_db)   # <-- Inject async DB session
 ):
+    if stream:
+        return stream_pipeline(
+            lambda session: stream_collect_jobs(
+                db=session,
+                query=request.query,
+                location=request.location,
+                max_results=request.max_results
+            ),
+            stream
+        )
+
     try:
         result = await collect_jobs(
             db=db,  # Pass DB session
@@ -99,13 +133,28 @@ async def collect_jobs_endpoint(
 @router.post("/match", response_model=JobSearchResponse)
 async def match_jobs_endpoint(
     request: JobMatchingRequest,
+    stream: Optional[StreamFormat] = STREAM_QUERY,
     db: AsyncSession = Depends(get_db)   # <-- Inject async DB session
 ):
+    if stream:
+        return stream_pipeline(
+            lambda session: stream_match_unprocessed_jobs(
+                db=session,
+                min_match_score=request.min_match_score,
+                limit=request.limit,
+                rescore=request.rescore,
+                cursor=request.cursor
+            ),
+            stream
+        )
+
     try:
         result = await match_unprocessed_jobs(
             db=db,  # Pass DB session
             min_match_score=request.min_match_score,
-            limit=request.limit
+            limit=request.limit,
+            rescore=request.rescore,
+            cursor=request.cursor
         )
         return result
 
@@ -119,8 +168,20 @@ async def match_jobs_endpoint(
 @router.post("/hiring-managers")
 async def hiring_managers_endpoint(
     request: HiringManagerRequest,
+    stream: Optional[StreamFormat] = STREAM_QUERY,
     db: AsyncSession = Depends(get_db)
 ):
+    if stream:
+        return stream_pipeline(
+            lambda session: stream_hiring_manager_pipeline(
+                db=session,
+                company=request.company,
+                location=request.location,
+                job_title=request.job_title
+            ),
+            stream
+        )
+
     result = await run_hiring_manager_pipeline(
         db=db,
         company=request.company,
@@ -132,13 +193,6 @@ async def hiring_managers_endpoint(
 
 
 
-class AutomationRequest(BaseModel):
-    query: str
-    location: str = "in"
-    max_results: int = 20
-    min_match_score: int = 40
-
-
 @router.post("/run-automation")
 async def run_automation_endpoint(
     request: AutomationRequest,
@@ -153,6 +207,49 @@ async def run_automation_endpoint(
     )
 
 
+@router.post("/automation/tasks", response_model=AutomationTaskResponse, status_code=202)
+async def submit_automation_task(request: AutomationRequest):
+    """Queue a full automation run and return its task id immediately"""
+    return await automation_queue.submit(request.model_dump())
+
+
+@router.get("/automation/tasks", response_model=List[AutomationTaskResponse])
+async def list_automation_tasks(
+    status: Optional[str] = Query(None, description="queued, running, succeeded or failed"),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await automation_queue.list_tasks(db, status=status, limit=limit)
+
+
+@router.get("/automation/tasks/{task_id}", response_model=AutomationTaskResponse)
+async def get_automation_task(task_id: str, db: AsyncSession = Depends(get_read_db)):
+    """Status, per-stage timings and result of a queued run"""
+    task = await automation_queue.get(db, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+@router.get("/metrics")
+async def metrics_endpoint():
+    """Cache, quota and pool statistics for this process"""
+    return {
+        "adzuna_cache": adzuna_cache.stats(),
+        "adzuna_quota_remaining": round(await adzuna_quota.remaining(), 2),
+        "scrape_domains": domain_scheduler.stats(),
+        "http_cache": http_cache.stats(),
+        "main_content": main_content_stats.stats(),
+        "scrape_downloads": download_stats,
+        "robots_txt": robots_cache.stats(),
+        "http_pools": http_clients.stats(),
+        "description_store": await description_store_stats(),
+        "resilience": resilience.stats(),
+        "llm_cache": await llm_cache.stats(),
+        "llm_limits": llm_limiter_stats(),
+    }
+
+
 # @router.post("/apply")
 # async def apply_for_job_endpoint(request: JobApplicationRequest):
 #     """
@@ -0,0 +1,51 @@
+# app/api/v1/streaming.py
+
+import json
+import traceback
+from typing import AsyncIterator, Callable, Dict, Literal
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import AsyncSessionLocal
+
+StreamFormat = Literal["ndjson", "sse"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def format_event(event: Dict, fmt: StreamFormat) -> str:
+    """Serialize one pipeline event as an NDJSON line or an SSE frame"""
+    data = json.dumps(jsonable_encoder(event))
+    if fmt == "sse":
+        return f"event: {event.get('event', 'message')}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+def stream_pipeline(
+    make_events: Callable[[AsyncSession], AsyncIterator[Dict]],
+    fmt: StreamFormat
+) -> StreamingResponse:
+    """
+    Stream a pipeline's events to the client as they are produced.
+
+    The pipeline gets its own session: request-scoped dependencies may be
+    torn down before a streaming body finishes.
+    """
+
+    async def body():
+        async with AsyncSessionLocal() as db:
+            try:
+                async for event in make_events(db):
+                    yield format_event(event, fmt)
+            except Exception as e:
+                traceback.print_exc()
+                yield format_event({"event": "error", "detail": str(e)}, fmt)
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
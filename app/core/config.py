@@ -2,6 +2,7 @@ from pathlib import Path
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 from functools import lru_cache
+from typing import Dict, Tuple
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
@@ -12,7 +13,118 @@ class Settings(BaseSettings):
     API_V1_PREFIX: str = "/api/v1"
     PROJECT_NAME: str = "Job Application AI"
     DEBUG: bool = True
+
+    # Database
+    DATABASE_URL: str = "sqlite+aiosqlite:///./data/jobs.db"
+    DB_ECHO: bool = False
+    DB_READ_POOL_SIZE: int = 5
+
+    # SQLite performance profile (SQLITE_TUNING=False keeps SQLite defaults)
+    SQLITE_TUNING: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
     
+    # Scraping
+    SCRAPE_CONCURRENCY: int = 8
+    SCRAPE_TIMEOUT_SECONDS: float = 30.0
+
+    # Streaming downloads: hard cap on body bytes read, and stop early once
+    # this much visible text has arrived (well above what the LLM prompts use).
+    # A declared Content-Length above SCRAPE_MAX_CONTENT_LENGTH is refused outright.
+    SCRAPE_MAX_BYTES: int = 2 * 1024 * 1024
+    SCRAPE_TEXT_TARGET_CHARS: int = 20000
+    SCRAPE_MAX_CONTENT_LENGTH: int = 50 * 1024 * 1024
+
+    # HTML → text backend: "auto" (lxml if installed), "lxml" or "bs4"
+    HTML_TEXT_BACKEND: str = "auto"
+
+    # Keep only the job posting / team section of scraped pages (needs lxml)
+    MAIN_CONTENT_EXTRACTION: bool = True
+
+    # Per-domain politeness: requests/sec and burst, overridable per registered domain
+    # e.g. SCRAPE_DOMAIN_LIMITS='{"adzuna.in": [0.5, 1]}'
+    SCRAPE_DOMAIN_RATE: float = 1.0
+    SCRAPE_DOMAIN_BURST: int = 2
+    SCRAPE_DOMAIN_LIMITS: Dict[str, Tuple[float, int]] = {}
+
+    # robots.txt: cached per origin; failed fetches are retried sooner
+    RESPECT_ROBOTS_TXT: bool = True
+    ROBOTS_USER_AGENT: str = "*"
+    ROBOTS_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    ROBOTS_ERROR_TTL_SECONDS: int = 5 * 60
+
+    # On-disk HTTP cache for scraped pages (FRESH_TTL=0 → always revalidate)
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_DIR: str = str(PROJECT_ROOT / "data" / "http_cache")
+    HTTP_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    HTTP_CACHE_FRESH_TTL_SECONDS: int = 6 * 60 * 60
+
+    # Near-duplicate jobs (MinHash LSH over title + description): jobs with the same
+    # company and title whose estimated Jaccard similarity to a cluster's first job
+    # reaches the threshold share one LLM match
+    NEAR_DUPLICATE_DETECTION: bool = True
+    NEAR_DUPLICATE_THRESHOLD: float = 0.7
+
+    # Stored job descriptions: "auto" (zstd if installed, else zlib), "zstd" or "zlib"
+    DESCRIPTION_CODEC: str = "auto"
+
+    # Shared HTTP pools (adzuna / scraping / search); HTTP/2 needs `h2` installed
+    HTTP2_ENABLED: bool = True
+
+    # Outbound retries: 429/5xx and timeouts back off exponentially (full jitter,
+    # Retry-After honoured). Retries are capped at RETRY_BUDGET_RATIO of traffic.
+    RETRY_MAX_ATTEMPTS: int = 3
+    RETRY_BACKOFF_BASE_SECONDS: float = 0.5
+    RETRY_BACKOFF_MAX_SECONDS: float = 10.0
+    RETRY_BUDGET_RATIO: float = 0.2
+    RETRY_BUDGET_MIN_PER_SECOND: float = 0.5
+    RETRY_BUDGET_MAX_TOKENS: float = 10.0
+
+    # Per-domain circuit breaker: fail fast after this many consecutive errors
+    BREAKER_FAILURE_THRESHOLD: int = 5
+    BREAKER_RESET_SECONDS: float = 60.0
+
+    # Two-tier matching. The local score uses the LLM's metric (% of your skills
+    # mentioned) but only sees explicit mentions, so it errs low: JDs scoring at
+    # least min_match_score + ACCEPT_MARGIN pass without the LLM, and only JDs more
+    # than REJECT_MARGIN points below min_match_score are rejected without it
+    # (with 16 skills and min 40: at most one skill mentioned)
+    SKILL_PREFILTER_ENABLED: bool = True
+    SKILL_PREFILTER_REJECT_MARGIN: int = 30
+    SKILL_PREFILTER_ACCEPT_MARGIN: int = 0
+
+    # Batched LLM matching: several truncated JDs per structured-output call,
+    # packed until the estimated prompt + response tokens reach the budget
+    # (kept below GROQ_TPM — a single request over it is rejected outright)
+    SKILL_BATCH_ENABLED: bool = True
+    SKILL_BATCH_TOKEN_BUDGET: int = 4000
+    SKILL_BATCH_MAX_JOBS: int = 8
+    SKILL_BATCH_JD_CHARS: int = 2000
+
+    # LLM provider limits, shared by every caller in the process (Groq free tier:
+    # 30 requests / 6,000 tokens per minute), and max concurrent calls per provider
+    GROQ_RPM: int = 30
+    GROQ_TPM: int = 6000
+    VERTEX_RPM: int = 60
+    VERTEX_TPM: int = 200000
+    LLM_MAX_CONCURRENCY: int = 4
+
+    # Persistent cache of LLM results (structured outputs and cover letters); TTL=0 disables
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    LLM_CACHE_MAX_ENTRIES: int = 5000
+
+    # Background automation queue. A running task's lease is renewed every
+    # third of AUTOMATION_LEASE_SECONDS; once it lapses (the owning process
+    # died) any process re-queues the task.
+    AUTOMATION_WORKERS: int = 2
+    AUTOMATION_POLL_SECONDS: float = 2.0
+    AUTOMATION_MAX_ATTEMPTS: int = 3
+    AUTOMATION_LEASE_SECONDS: float = 120.0
+    AUTOMATION_MAX_BACKOFF_SECONDS: float = 60.0
+
     # Google Cloud
     GOOGLE_CLOUD_PROJECT: str
     GOOGLE_CLOUD_REGION: str = "us-central1"
@@ -29,7 +141,16 @@ class Settings(BaseSettings):
     
     ADZUNA_APP_ID: str
     ADZUNA_APP_KEY: str
-    
+
+    # Adzuna quota (free tier: 5,000 requests/month) and harvesting
+    ADZUNA_MONTHLY_QUOTA: int = 5000
+    ADZUNA_QUOTA_BURST: int = 166  # ~ one day's share of the monthly budget
+    ADZUNA_MAX_CONCURRENCY: int = 4
+
+    # Adzuna response cache
+    ADZUNA_CACHE_TTL_SECONDS: int = 3600
+    ADZUNA_CACHE_MAX_ENTRIES: int = 2000
+
     model_config = ConfigDict(
         env_file=".env",
         case_sensitive=True,
@@ -1,14 +1,143 @@
 # app/database.py
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from typing import List
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from app.core.config import get_settings
 
-DATABASE_URL = "sqlite+aiosqlite:///./data/jobs.db"
+settings = get_settings()
 
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+DATABASE_URL = settings.DATABASE_URL
+
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def database_label(url: str) -> str:
+    """Dialect and database name only — safe to show (the URL may carry a password)"""
+    parsed = make_url(url)
+    return f"{parsed.get_backend_name()}: {parsed.database}"
+
+
+def sqlite_pragmas(read_only: bool = False) -> List[str]:
+    """
+    PRAGMAs applied to every new SQLite connection.
+
+    journal_mode is persisted in the database file, so only the writer
+    sets it; read-only connections just pick up the rest.
+    """
+    if not settings.SQLITE_TUNING:
+        return []
+
+    pragmas = [
+        f"PRAGMA busy_timeout = {settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA mmap_size = {settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size = -{settings.SQLITE_CACHE_SIZE_KB}",  # negative = KiB
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if not read_only:
+        pragmas += [
+            f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}",
+            f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}",
+        ]
+    return pragmas
+
+
+def read_only_url(url: str) -> str:
+    """sqlite+aiosqlite:///./x.db → sqlite+aiosqlite:///file:./x.db?mode=ro&uri=true"""
+    prefix, _, path = url.partition(":///")
+    return f"{prefix}:///file:{path}?mode=ro&uri=true"
+
+
+def build_engine(url: str, read_only: bool = False, pragmas: List[str] = None, **kwargs) -> AsyncEngine:
+    """
+    Create an async engine, applying the SQLite performance profile
+    (or the given `pragmas`) on connect.
+    """
+    if is_sqlite(url) and read_only:
+        url = read_only_url(url)
+
+    new_engine = create_async_engine(url, echo=settings.DB_ECHO, future=True, **kwargs)
+
+    if is_sqlite(url):
+        pragmas = sqlite_pragmas(read_only) if pragmas is None else pragmas
+
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, _connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+
+    return new_engine
+
+
+engine = build_engine(DATABASE_URL)
 AsyncSessionLocal = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+# Separate pool for read endpoints — WAL lets these run alongside the writer
+if is_sqlite(DATABASE_URL) and ":memory:" not in DATABASE_URL:
+    read_engine = build_engine(DATABASE_URL, read_only=True, pool_size=settings.DB_READ_POOL_SIZE)
+else:
+    read_engine = engine
+ReadSessionLocal = sessionmaker(read_engine, expire_on_commit=False, class_=AsyncSession)
+
 Base = declarative_base()
 
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+
+def create_missing_indexes(sync_conn):
+    """
+    create_all skips indexes on tables that already exist — add any that are missing.
+
+    IF NOT EXISTS rather than checkfirst: SQLite reflection does not report
+    expression indexes, so checkfirst would try to recreate them every start.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            sync_conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+async def get_read_db():
+    """Session on the read-only pool, for endpoints that never write"""
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+# Dialects whose INSERT supports ON CONFLICT ... DO NOTHING / DO UPDATE
+UPSERT_DIALECTS = ("sqlite", "postgresql")
+
+
+def check_upsert_support(bind=None):
+    """
+    Fail at startup, not on the first insert, when DATABASE_URL points at
+    a database without ON CONFLICT upserts (every write path relies on them).
+    """
+    dialect = (bind or engine).dialect.name
+    if dialect not in UPSERT_DIALECTS:
+        raise RuntimeError(
+            f"DATABASE_URL uses '{dialect}', which has no ON CONFLICT upserts — "
+            f"use one of: {', '.join(UPSERT_DIALECTS)}"
+        )
+
+
+def dialect_insert(db: AsyncSession, model):
+    """
+    Return an INSERT construct for the session's dialect that supports
+    ON CONFLICT clauses (SQLite and PostgreSQL share the same API).
+    """
+    bind = db.get_bind()
+    check_upsert_support(bind)
+
+    if bind.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+
+    return insert(model)
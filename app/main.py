@@ -3,7 +3,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import get_settings
 from app.api.v1 import routes
-from app.database import engine, Base
+from app.database import engine, Base, create_missing_indexes, check_upsert_support
+from app.services.hiring_manager_service import collapse_duplicate_hiring_managers
+from app.services.task_queue import automation_queue
+from app.services.http_clients import http_clients
 
 settings =  get_settings()
 
@@ -12,9 +15,17 @@ settings =  get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: create tables asynchronously
+    check_upsert_support()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(collapse_duplicate_hiring_managers)
+        await conn.run_sync(create_missing_indexes)
+
+    await http_clients.start()
+    await automation_queue.start()
     yield
+    await automation_queue.stop()
+    await http_clients.aclose()
 
 
 app= FastAPI(
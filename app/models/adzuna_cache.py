@@ -0,0 +1,12 @@
+# app/models/adzuna_cache.py
+from sqlalchemy import Column, String, Text, DateTime
+from app.database import Base
+
+class AdzunaCacheEntry(Base):
+    """Cached Adzuna search response keyed by a hash of the search params"""
+    __tablename__ = "adzuna_cache"
+
+    key = Column(String(64), primary_key=True)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    last_accessed_at = Column(DateTime, nullable=False, index=True)
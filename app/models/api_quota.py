@@ -0,0 +1,11 @@
+# app/models/api_quota.py
+from sqlalchemy import Column, String, Float, DateTime
+from app.database import Base
+
+class ApiQuota(Base):
+    """Persisted token bucket state for a metered external API"""
+    __tablename__ = "api_quotas"
+
+    name = Column(String, primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
@@ -0,0 +1,29 @@
+# app/models/automation_task.py
+
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Text, JSON
+from app.database import Base
+
+class AutomationTask(Base):
+    """A queued /run-automation request, persisted so it survives restarts"""
+    __tablename__ = "automation_tasks"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    # queued → running → succeeded | failed
+    status = Column(String(20), nullable=False, default="queued", index=True)
+
+    params = Column(JSON, nullable=False)
+    stages = Column(JSON, nullable=True)  # {"collect": {"seconds": 1.2, "summary": {...}}, ...}
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0)
+
+    # Lease held by the running worker: "<host>:<pid>:<nonce>" and its last renewal
+    owner = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
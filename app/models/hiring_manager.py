@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, Text
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index, func, literal_column
 from sqlalchemy.dialects.sqlite import BLOB
 from app.database import Base 
 
@@ -27,3 +27,13 @@ class HiringManager(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Case-insensitive identity used by the batch upsert's ON CONFLICT target
+    __table_args__ = (
+        Index(
+            "uq_hiring_managers_name_company",
+            func.lower(name),
+            func.lower(func.coalesce(company, literal_column("''"))),
+            unique=True
+        ),
+    )
@@ -0,0 +1,22 @@
+# app/models/http_cache.py
+from sqlalchemy import Column, String, Integer, DateTime, Text, Boolean
+from app.database import Base
+
+class HttpCacheEntry(Base):
+    """Validators and body pointer for a cached page; the body lives on disk"""
+    __tablename__ = "http_cache_entries"
+
+    url_hash = Column(String(64), primary_key=True)
+    url = Column(Text, nullable=False)
+
+    body_hash = Column(String(64), nullable=False, index=True)  # sha256 → file name
+    body_size = Column(Integer, nullable=False)
+    encoding = Column(String(50), nullable=True)
+    content_type = Column(String(255), nullable=True)
+
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(255), nullable=True)
+    partial = Column(Boolean, nullable=False, default=False)  # body cut short; stored without validators
+
+    fetched_at = Column(DateTime, nullable=False)  # last 200 or 304
+    last_accessed_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,15 @@
+# app/models/job_description.py
+from sqlalchemy import Column, String, Integer, DateTime, LargeBinary, Text
+from app.database import Base
+
+class JobDescription(Base):
+    """Scraped job description, compressed, so re-matching never re-scrapes"""
+    __tablename__ = "job_descriptions"
+
+    job_id = Column(String, primary_key=True)
+    content = Column(LargeBinary, nullable=False)
+    codec = Column(String(10), nullable=False)  # "zstd" or "zlib"
+    content_hash = Column(String(64), nullable=False, index=True)  # sha256 of the text
+    char_count = Column(Integer, nullable=False)
+    source_url = Column(Text, nullable=True)
+    fetched_at = Column(DateTime, nullable=False)
@@ -0,0 +1,13 @@
+# app/models/job_link.py
+from sqlalchemy import Column, Integer, DateTime, Text
+from app.database import Base
+
+class JobLink(Base):
+    """Where an Adzuna apply link ends up after redirects"""
+    __tablename__ = "job_links"
+
+    apply_link = Column(Text, primary_key=True)
+    final_url = Column(Text, nullable=False)
+    canonical_url = Column(Text, nullable=False, index=True)  # dedupe key across listings
+    status_code = Column(Integer, nullable=True)
+    resolved_at = Column(DateTime, nullable=False)
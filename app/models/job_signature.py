@@ -0,0 +1,23 @@
+# app/models/job_signature.py
+from sqlalchemy import Column, String, BigInteger, DateTime, LargeBinary
+from app.database import Base
+
+class JobSignature(Base):
+    """MinHash signature of a job's title + description, and its near-duplicate cluster"""
+    __tablename__ = "job_signatures"
+
+    job_id = Column(String, primary_key=True)
+    minhash = Column(LargeBinary, nullable=True)  # packed uint32s; NULL when the text is too short
+    cluster_id = Column(String, nullable=False, index=True)  # job_id of the cluster's first member
+    created_at = Column(DateTime, nullable=False)
+
+
+class JobSignatureBucket(Base):
+    """
+    LSH index: one row per (band hash, job). Jobs sharing any bucket are
+    near-duplicate candidates, found through the primary key index.
+    """
+    __tablename__ = "job_signature_buckets"
+
+    bucket = Column(BigInteger, primary_key=True)
+    job_id = Column(String, primary_key=True)
@@ -0,0 +1,14 @@
+# app/models/llm_cache.py
+from sqlalchemy import Column, String, Text, DateTime
+from app.database import Base
+
+class LLMCacheEntry(Base):
+    """Validated LLM result keyed by a hash of model, temperature, schema and prompt"""
+    __tablename__ = "llm_cache"
+
+    key = Column(String(64), primary_key=True)
+    model = Column(String(100), nullable=False)
+    schema_name = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    last_accessed_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,28 @@
+# app/schemas/automation.py
+
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Dict, Optional
+
+
+class AutomationRequest(BaseModel):
+    query: str
+    location: str = "in"
+    max_results: int = 20
+    min_match_score: int = 40
+
+
+class AutomationTaskResponse(BaseModel):
+    """Status, per-stage timings and result of a queued automation run"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    status: str = Field(description="queued, running, succeeded or failed")
+    params: Dict[str, Any]
+    stages: Optional[Dict[str, Any]] = Field(None, description="Per-stage seconds and summaries")
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -11,6 +11,16 @@ class SkillMatchResult(BaseModel):
     match_score: int = Field(description="Match percentage 0-100", ge=0, le=100)
 
 
+class BatchSkillMatchItem(SkillMatchResult):
+    """Skill matching for one job of a batch"""
+    job_id: str = Field(description="The id from the job's '### JOB <id>' header")
+
+
+class BatchSkillMatchResult(BaseModel):
+    """Skill matching for several jobs in one call"""
+    results: List[BatchSkillMatchItem] = Field(description="One entry per job, in any order")
+
+
 class MatchedJob(BaseModel):
     """Single job with matching results"""
     id: str
@@ -26,6 +36,7 @@ class MatchedJob(BaseModel):
     matched_skills: List[str]
     missing_skills: List[str]
     jd_preview: Optional[str] = Field(None, description="First 500 chars of JD")
+    match_method: Optional[str] = Field(None, description="'prefilter' (local score) or 'llm'")
 
 
 class JobSearchResponse(BaseModel):
@@ -37,4 +48,10 @@ class JobSearchResponse(BaseModel):
     total_found: int = Field(description="Total jobs from Adzuna")
     total_scraped: int = Field(description="Jobs successfully scraped")
     total_matched: int = Field(description="Jobs passing filter")
+    unique_postings: Optional[int] = Field(None, description="Distinct postings scraped and matched after link dedupe")
+    llm_calls: Optional[int] = Field(None, description="Postings scored by the LLM")
+    llm_calls_avoided: Optional[int] = Field(None, description="Postings decided by the local pre-filter")
+    llm_calls_avoided_ratio: Optional[float] = Field(None, description="Fraction of postings that skipped the LLM")
+    llm_requests: Optional[int] = Field(None, description="LLM round trips made (batched, cache misses only)")
+    next_cursor: Optional[str] = Field(None, description="Rescore: pass as cursor to match the next page; null on the last page")
     matched_jobs: List[MatchedJob]
@@ -0,0 +1,148 @@
+# app/services/adzuna_cache.py
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import select, delete, func, update
+from app.database import AsyncSessionLocal, ReadSessionLocal, dialect_insert
+from app.models.adzuna_cache import AdzunaCacheEntry
+
+# LRU bookkeeping is coarse: a hit refreshes last_accessed_at only when it is
+# older than this, and refreshes are written in batches, never by the read itself
+TOUCH_INTERVAL = timedelta(hours=1)
+TOUCH_BATCH_SIZE = 50
+
+
+class AdzunaResponseCache:
+    """
+    Persistent TTL cache for Adzuna search responses.
+
+    Entries live in the `adzuna_cache` table, expire after `ttl_seconds`
+    and are evicted least-recently-used once `max_entries` is exceeded.
+    Hit/miss counters are per process.
+
+    Reads go through the read-only pool; access times are queued and
+    written with the next store (or every TOUCH_BATCH_SIZE hits). A
+    database error on read is a miss and on write a skipped store, so the
+    cache can never fail a search.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._touched: Dict[str, datetime] = {}  # key → access time not yet written
+
+    @staticmethod
+    def make_key(**params) -> str:
+        """Stable hash of the search parameters"""
+        raw = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict]:
+        if self.ttl.total_seconds() <= 0:
+            return None
+
+        try:
+            async with ReadSessionLocal() as session:
+                entry = await session.get(AdzunaCacheEntry, key)
+        except Exception as e:
+            self.errors += 1
+            self.misses += 1
+            print(f"⚠️ Adzuna cache read failed: {str(e)[:100]}")
+            return None
+
+        now = datetime.utcnow()
+        if entry is None or now - entry.created_at > self.ttl:
+            self.misses += 1
+            return None
+
+        try:
+            value = json.loads(entry.payload)
+        except ValueError:
+            self.misses += 1
+            return None
+
+        if now - entry.last_accessed_at > TOUCH_INTERVAL:
+            self._touched[key] = now
+            if len(self._touched) >= TOUCH_BATCH_SIZE:
+                try:
+                    async with AsyncSessionLocal() as session:
+                        await self._flush_touched(session)
+                        await session.commit()
+                except Exception as e:
+                    self.errors += 1
+                    print(f"⚠️ Adzuna cache access-time update failed: {str(e)[:100]}")
+
+        self.hits += 1
+        return value
+
+    async def _flush_touched(self, session):
+        """Write queued access times in one UPDATE (the newest time stands for the batch)"""
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, {}
+        await session.execute(
+            update(AdzunaCacheEntry)
+            .where(AdzunaCacheEntry.key.in_(list(touched)))
+            .values(last_accessed_at=max(touched.values()))
+        )
+
+    async def set(self, key: str, value: Dict):
+        if self.ttl.total_seconds() <= 0:
+            return
+
+        try:
+            await self._write(key, value)
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ Adzuna cache write failed, response not cached: {str(e)[:100]}")
+
+    async def _write(self, key: str, value: Dict):
+        now = datetime.utcnow()
+        payload = json.dumps(value)
+
+        async with AsyncSessionLocal() as session:
+            stmt = dialect_insert(session, AdzunaCacheEntry).values(
+                key=key, payload=payload, created_at=now, last_accessed_at=now
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[AdzunaCacheEntry.key],
+                set_={"payload": payload, "created_at": now, "last_accessed_at": now}
+            )
+            await session.execute(stmt)
+
+            # Access times first, so eviction sees recent hits
+            await self._flush_touched(session)
+
+            # Drop expired entries, then trim the least recently used
+            await session.execute(
+                delete(AdzunaCacheEntry).where(AdzunaCacheEntry.created_at < now - self.ttl)
+            )
+            count = await session.scalar(select(func.count()).select_from(AdzunaCacheEntry))
+            overflow = count - self.max_entries
+            if overflow > 0:
+                oldest = (
+                    select(AdzunaCacheEntry.key)
+                    .order_by(AdzunaCacheEntry.last_accessed_at)
+                    .limit(overflow)
+                )
+                await session.execute(
+                    delete(AdzunaCacheEntry).where(AdzunaCacheEntry.key.in_(oldest))
+                )
+
+            await session.commit()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "ttl_seconds": int(self.ttl.total_seconds()),
+            "max_entries": self.max_entries,
+        }
@@ -1,23 +1,45 @@
 # app/services/adzuna_service.py
 
+import asyncio
+import math
 import httpx
 from typing import List, Dict, Optional
 from app.core.config import get_settings
+from app.services.quota_service import PersistentTokenBucket
+from app.services.adzuna_cache import AdzunaResponseCache
+from app.services.http_clients import http_clients
+from app.services.resilience import resilience, CircuitOpenError, RETRYABLE_STATUSES
 
 settings = get_settings()
 
+SECONDS_PER_MONTH = 30 * 24 * 60 * 60
+
+# Shared by every AdzunaService instance so parallel /collect calls draw on one budget
+adzuna_quota = PersistentTokenBucket(
+    name="adzuna",
+    capacity=settings.ADZUNA_QUOTA_BURST,
+    refill_per_second=settings.ADZUNA_MONTHLY_QUOTA / SECONDS_PER_MONTH
+)
+
+# Identical searches within the TTL are served from the database
+adzuna_cache = AdzunaResponseCache(
+    ttl_seconds=settings.ADZUNA_CACHE_TTL_SECONDS,
+    max_entries=settings.ADZUNA_CACHE_MAX_ENTRIES
+)
+
 class AdzunaService:
     """
     Adzuna API client for job search
     Free tier: 5,000 requests/month = 166/day
     """
-    
+
     BASE_URL = "https://api.adzuna.com/v1/api/jobs"
-    
+    MAX_RESULTS_PER_PAGE = 50
+
     def __init__(self):
         self.app_id = settings.ADZUNA_APP_ID
         self.app_key = settings.ADZUNA_APP_KEY
-    
+
     async def search_jobs(
         self,
         query: str,
@@ -29,7 +51,7 @@ class AdzunaService:
     ) -> Dict:
         """
         Search for jobs on Adzuna
-        
+
         Args:
             query: Job title/keywords (e.g., "Python Developer")
             location: Country code (in=India, us=USA, uk=UK)
@@ -37,61 +59,196 @@ class AdzunaService:
             page: Page number (for pagination)
             max_days_old: Only jobs posted in last N days
             sort_by: "date" (latest first) or "relevance"
-            
+
         Returns:
             Dict with jobs list and metadata
         """
-        
+
         url = f"{self.BASE_URL}/{location}/search/{page}"
-        
+
         params = {
             "app_id": self.app_id,
             "app_key": self.app_key,
             "results_per_page": results_per_page,
-            "what": query, 
+            "what": query,
             "max_days_old": max_days_old,
             "sort_by": sort_by
         }
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            try:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Parse Adzuna response
-                jobs = self._parse_jobs(data.get("results", []))
-                
-                return {
-                    "jobs": jobs,
-                    "total_results": data.get("count", 0),
-                    "page": page,
-                    "results_per_page": results_per_page,
-                    "status": "success"
-                }
-            
-            except httpx.HTTPStatusError as e:
-                print(f"❌ Adzuna API error: {e.response.status_code}")
-                return {
-                    "jobs": [],
-                    "error": f"API error: {e.response.status_code}",
-                    "status": "failed"
-                }
-            
-            except Exception as e:
-                print(f"❌ Adzuna request failed: {str(e)}")
-                return {
-                    "jobs": [],
-                    "error": str(e),
-                    "status": "failed"
-                }
-    
+
+        cache_key = adzuna_cache.make_key(
+            query=query,
+            location=location,
+            results_per_page=results_per_page,
+            page=page,
+            max_days_old=max_days_old,
+            sort_by=sort_by
+        )
+        cached = await adzuna_cache.get(cache_key)
+        if cached is not None:
+            print(f"⚡ Adzuna cache hit: '{query}' page {page}")
+            return cached
+
+        if not await adzuna_quota.try_acquire():
+            print("❌ Adzuna monthly quota exhausted")
+            return {
+                "jobs": [],
+                "error": "Adzuna request quota exhausted",
+                "status": "failed"
+            }
+
+        client = http_clients.get("adzuna")
+        try:
+            # Every retry is another metered request: charge the quota for it,
+            # and leave 429s alone — retrying those only burns more quota
+            response = await resilience.run(
+                url,
+                lambda: client.get(url, params=params),
+                retry_statuses=RETRYABLE_STATUSES - {429},
+                before_retry=adzuna_quota.try_acquire
+            )
+            response.raise_for_status()
+
+            data = response.json()
+
+            # Parse Adzuna response
+            jobs = self._parse_jobs(data.get("results", []))
+
+            result = {
+                "jobs": jobs,
+                "total_results": data.get("count", 0),
+                "page": page,
+                "results_per_page": results_per_page,
+                "status": "success"
+            }
+
+        except CircuitOpenError as e:
+            print(f"⛔ Adzuna skipped: {e}")
+            return {
+                "jobs": [],
+                "error": str(e),
+                "status": "failed"
+            }
+
+        except httpx.HTTPStatusError as e:
+            print(f"❌ Adzuna API error: {e.response.status_code}")
+            return {
+                "jobs": [],
+                "error": f"API error: {e.response.status_code}",
+                "status": "failed"
+            }
+
+        except Exception as e:
+            print(f"❌ Adzuna request failed: {str(e)}")
+            return {
+                "jobs": [],
+                "error": str(e),
+                "status": "failed"
+            }
+
+        # Fail-soft: the search succeeded (and spent quota) whatever the cache does
+        await adzuna_cache.set(cache_key, result)
+        return result
+
+    async def harvest_jobs(
+        self,
+        query: str,
+        location: str = "in",
+        max_results: int = 100,
+        max_days_old: int = 7,
+        sort_by: str = "date",
+        concurrency: Optional[int] = None
+    ) -> Dict:
+        """
+        Collect up to `max_results` jobs across as many pages as needed.
+
+        Page 1 is fetched first to learn the total count, then the remaining
+        pages are fetched concurrently (bounded by `concurrency`) on the
+        shared client. Every page costs one quota token.
+
+        Returns:
+            Dict shaped like search_jobs, plus pages_fetched and errors.
+            status is "partial" if some pages failed after page 1 succeeded.
+        """
+
+        per_page = min(max_results, self.MAX_RESULTS_PER_PAGE)
+
+        first = await self.search_jobs(
+            query=query,
+            location=location,
+            results_per_page=per_page,
+            page=1,
+            max_days_old=max_days_old,
+            sort_by=sort_by
+        )
+        if first["status"] != "success":
+            return first
+
+        total_results = first["total_results"]
+        wanted = min(max_results, total_results)
+        last_page = math.ceil(wanted / per_page) if wanted else 1
+
+        pages = [first]
+        errors = []
+        collected = len(first["jobs"])
+
+        if last_page > 1:
+            semaphore = asyncio.Semaphore(concurrency or settings.ADZUNA_MAX_CONCURRENCY)
+
+            async def fetch_page(page: int) -> Optional[Dict]:
+                nonlocal collected
+                async with semaphore:
+                    # Earlier pages may already have filled the request
+                    if collected >= max_results:
+                        return None
+                    result = await self.search_jobs(
+                        query=query,
+                        location=location,
+                        results_per_page=per_page,
+                        page=page,
+                        max_days_old=max_days_old,
+                        sort_by=sort_by
+                    )
+                    collected += len(result["jobs"])
+                    return result
+
+            results = await asyncio.gather(*(
+                fetch_page(page) for page in range(2, last_page + 1)
+            ))
+
+            for page, result in enumerate(results, 2):
+                if result is None:
+                    continue
+                if result["status"] != "success":
+                    errors.append({"page": page, "error": result.get("error")})
+                    continue
+                pages.append(result)
+
+        # Listings can shift between pages while we paginate — dedupe by id
+        jobs = []
+        seen = set()
+        for result in pages:
+            for job in result["jobs"]:
+                if job["id"] in seen:
+                    continue
+                seen.add(job["id"])
+                jobs.append(job)
+
+        print(f"✅ Harvested {len(jobs)} jobs from {len(pages)} page(s)")
+
+        return {
+            "jobs": jobs[:max_results],
+            "total_results": total_results,
+            "pages_fetched": len(pages),
+            "results_per_page": per_page,
+            "errors": errors,
+            "status": "partial" if errors else "success"
+        }
+
     def _parse_jobs(self, results: List[Dict]) -> List[Dict]:
         """Parse Adzuna API response into clean job objects"""
-        
+
         jobs = []
-        
+
         for result in results:
             job = {
                 "id": result.get("id"),
@@ -108,9 +265,9 @@ class AdzunaService:
                 "source": "Adzuna",
                 "link_status": "found" if result.get("redirect_url") else "not_found"
             }
-            
+
             jobs.append(job)
-            
+
         print(f"✅ Parsed {len(jobs)} jobs from Adzuna")
-        print(jobs)        
+        print(jobs)
         return jobs
@@ -5,9 +5,10 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 from app.services.llm_service import get_llm
 from app.tools.adzuna_search import search_jobs_adzuna
-from app.tools.fetch_job_description import fetch_job_description
+from app.tools.fetch_job_description import fetch_job_descriptions
 from app.tools.skill_matcher import match_skills
 
+from app.services.http_clients import http_clients
 import json
 
 
@@ -106,16 +107,18 @@ def search_jobs_structured(
     # ============================================
     print(f"📄 Fetching descriptions...")
     
+    jobs = [job for job in raw_jobs[:max_results] if job.get("apply_link")]
+    descriptions = http_clients.run(
+        fetch_job_descriptions.ainvoke({"urls": [job["apply_link"] for job in jobs]})
+    )
+
     jobs_with_jd = []
-    for job in raw_jobs[:max_results]:
-        try:
-            jd = fetch_job_description.invoke({"url": job["apply_link"]})
-            if jd and not jd.startswith("ERROR"):
-                job["full_description"] = jd
-                jobs_with_jd.append(job)
-        except:
-            continue
-    
+    for job in jobs:
+        result = descriptions.get(job["apply_link"], {})
+        if result.get("status") == "ok":
+            job["full_description"] = result["description"]
+            jobs_with_jd.append(job)
+
     print(f"✅ Fetched {len(jobs_with_jd)} descriptions")
     
     # ============================================
@@ -1,39 +1,62 @@
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.job_collector import collect_jobs
 from app.services.job_pipeline import match_unprocessed_jobs
 from app.services.hiring_manager_pipeline import run_hiring_manager_pipeline
 
+# Called after each stage with (stage name, seconds taken, stage summary)
+StageCallback = Callable[[str, float, Dict[str, Any]], Awaitable[None]]
+
 
 async def run_full_automation(
     db: AsyncSession,
     query: str,
     location: str,
     max_results: int,
-    min_match_score: int
+    min_match_score: int,
+    on_stage: Optional[StageCallback] = None
 ):
+    async def finish_stage(name: str, started: float, summary: Dict[str, Any]):
+        if on_stage:
+            await on_stage(name, time.perf_counter() - started, summary)
+
     # Step 1 — Collect jobs
+    started = time.perf_counter()
     collected = await collect_jobs(
         db=db,
         query=query,
         location=location,
         max_results=max_results
     )
+    await finish_stage("collect", started, collected)
 
     # Step 2 — Match jobs
+    started = time.perf_counter()
     matched = await match_unprocessed_jobs(
         db=db,
         min_match_score=min_match_score,
         limit=max_results
     )
+    await finish_stage("match", started, {
+        "total_found": matched.total_found,
+        "total_scraped": matched.total_scraped,
+        "total_matched": matched.total_matched,
+    })
 
     # Step 3 — Hiring managers (company-level)
     # NOTE: this can be looped per matched job later
+    started = time.perf_counter()
     hiring_managers = await run_hiring_manager_pipeline(
         db=db,
         company=query,   # or derive from matched jobs later
         location=location,
         job_title=None
     )
+    await finish_stage("hiring_managers", started, {
+        "status": hiring_managers.get("status"),
+        "total_managers_found": hiring_managers.get("total_managers_found"),
+    })
 
     return {
         "status": "success",
@@ -0,0 +1,111 @@
+# app/services/description_store.py
+
+import hashlib
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.database import ReadSessionLocal, dialect_insert
+from app.models.job_description import JobDescription
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+settings = get_settings()
+
+ZSTD_LEVEL = 3
+ZLIB_LEVEL = 6
+
+# Rows per SELECT / INSERT — keeps bound parameters well under SQLite's limit
+CHUNK_SIZE = 200
+
+
+def _codec() -> str:
+    if settings.DESCRIPTION_CODEC == "zlib" or zstandard is None:
+        return "zlib"
+    return "zstd"
+
+
+def compress_text(text: str) -> Tuple[bytes, str]:
+    codec = _codec()
+    data = text.encode("utf-8")
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), codec
+    return zlib.compress(data, ZLIB_LEVEL), codec
+
+
+def decompress_text(data: bytes, codec: str) -> str:
+    """Rows record their codec, so zstd and zlib rows can coexist"""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed, cannot read zstd descriptions")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    return zlib.decompress(data).decode("utf-8")
+
+
+async def load_descriptions(db: AsyncSession, job_ids: Iterable[str]) -> Dict[str, str]:
+    """job_id → stored description, for the ids that have one"""
+    job_ids = list(dict.fromkeys(job_ids))
+    descriptions: Dict[str, str] = {}
+
+    for start in range(0, len(job_ids), CHUNK_SIZE):
+        result = await db.execute(
+            select(JobDescription.job_id, JobDescription.content, JobDescription.codec)
+            .where(JobDescription.job_id.in_(job_ids[start:start + CHUNK_SIZE]))
+        )
+        for job_id, content, codec in result:
+            descriptions[job_id] = decompress_text(content, codec)
+
+    return descriptions
+
+
+async def save_descriptions(db: AsyncSession, items: Iterable[Tuple[str, str, Optional[str]]]):
+    """Upsert (job_id, text, source_url) rows and commit"""
+    now = datetime.utcnow()
+    rows: List[Dict] = []
+
+    for job_id, text, source_url in items:
+        content, codec = compress_text(text)
+        rows.append({
+            "job_id": job_id,
+            "content": content,
+            "codec": codec,
+            "content_hash": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            "char_count": len(text),
+            "source_url": source_url,
+            "fetched_at": now,
+        })
+
+    for start in range(0, len(rows), CHUNK_SIZE):
+        stmt = dialect_insert(db, JobDescription).values(rows[start:start + CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobDescription.job_id],
+            set_={key: stmt.excluded[key] for key in rows[0] if key != "job_id"}
+        )
+        await db.execute(stmt)
+
+    if rows:
+        await db.commit()
+
+
+async def description_store_stats() -> Dict:
+    async with ReadSessionLocal() as session:
+        count, stored_bytes, chars = (await session.execute(
+            select(
+                func.count(JobDescription.job_id),
+                func.coalesce(func.sum(func.length(JobDescription.content)), 0),
+                func.coalesce(func.sum(JobDescription.char_count), 0),
+            )
+        )).one()
+
+    return {
+        "descriptions": count,
+        "stored_bytes": stored_bytes,
+        "text_chars": chars,
+        "compression_ratio": round(stored_bytes / chars, 3) if chars else None,
+        "codec": _codec(),
+    }
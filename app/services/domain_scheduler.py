@@ -0,0 +1,105 @@
+# app/services/domain_scheduler.py
+
+from typing import Dict, Tuple
+from urllib.parse import urlparse
+import httpx
+from app.core.config import get_settings
+from app.services.rate_limiter import TokenBucket
+
+settings = get_settings()
+
+# Second-level suffixes where the registrable domain has three labels
+MULTI_PART_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk",
+    "co.in", "net.in", "org.in", "gov.in", "ac.in",
+    "com.au", "net.au", "org.au",
+    "co.jp", "com.br", "com.sg", "com.mx", "co.za", "co.nz",
+}
+
+
+def registered_domain(url: str) -> str:
+    """
+    'https://careers.example.co.uk/jobs/1' → 'example.co.uk'
+
+    Good enough for politeness grouping; not a full public-suffix lookup.
+    """
+    host = (urlparse(url).hostname or "").lower().rstrip(".")
+    labels = host.split(".")
+
+    if len(labels) <= 2 or host.replace(".", "").isdigit():
+        return host
+    if ".".join(labels[-2:]) in MULTI_PART_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _check_limit(domain: str, rate: float, burst: int):
+    # Caught here rather than as a ZeroDivisionError on the domain's first request
+    if rate <= 0 or burst < 1:
+        raise ValueError(f"Invalid politeness limit for {domain}: rate must be > 0 and burst >= 1, got ({rate}, {burst})")
+
+
+class DomainScheduler:
+    """
+    Per-domain politeness: one token bucket per registered domain.
+
+    Requests to different domains never wait on each other; requests to
+    the same domain are spaced to `rate` per second after a `burst`.
+    """
+
+    def __init__(self, default_rate: float, default_burst: int, limits: Dict[str, Tuple[float, int]]):
+        _check_limit("default", default_rate, default_burst)
+        for domain, (rate, burst) in limits.items():
+            _check_limit(domain, rate, burst)
+
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.limits = dict(limits)
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.requests: Dict[str, int] = {}
+        self.waited: Dict[str, float] = {}
+
+    def register(self, domain: str, rate: float, burst: int):
+        """Set a custom rate (requests/sec) and burst for one domain"""
+        _check_limit(domain, rate, burst)
+        self.limits[domain] = (rate, burst)
+        self.buckets.pop(domain, None)
+
+    def _bucket(self, domain: str) -> TokenBucket:
+        bucket = self.buckets.get(domain)
+        if bucket is None:
+            rate, burst = self.limits.get(domain, (self.default_rate, self.default_burst))
+            bucket = TokenBucket(rate=rate, capacity=burst)
+            self.buckets[domain] = bucket
+        return bucket
+
+    async def acquire(self, url: str):
+        """Wait for this URL's domain to allow another request"""
+        domain = registered_domain(url)
+        waited = await self._bucket(domain).acquire()
+        self.requests[domain] = self.requests.get(domain, 0) + 1
+        self.waited[domain] = self.waited.get(domain, 0.0) + waited
+
+    async def throttle_request(self, request: httpx.Request):
+        """httpx request hook — runs for every hop, including redirects"""
+        await self.acquire(str(request.url))
+
+    def stats(self, top: int = 20) -> Dict:
+        busiest = sorted(self.requests, key=self.requests.get, reverse=True)[:top]
+        return {
+            "domains": len(self.requests),
+            "busiest": {
+                domain: {
+                    "requests": self.requests[domain],
+                    "seconds_waited": round(self.waited[domain], 2),
+                }
+                for domain in busiest
+            },
+        }
+
+
+domain_scheduler = DomainScheduler(
+    default_rate=settings.SCRAPE_DOMAIN_RATE,
+    default_burst=settings.SCRAPE_DOMAIN_BURST,
+    limits=settings.SCRAPE_DOMAIN_LIMITS
+)
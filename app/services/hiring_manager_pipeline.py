@@ -1,36 +1,30 @@
 # app/services/hiring_manager_pipeline.py
 
-import asyncio
+from typing import AsyncIterator, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.tavily_service import find_hiring_manager_urls
 from app.services.scraper_service import JobScraperService
 from app.services.people_extractor_service import LLMPeopleExtractor
 from app.services.email_pattern_service import EmailPatternService
-from app.services.hiring_manager_service import upsert_hiring_manager
+from app.services.hiring_manager_service import upsert_hiring_managers
 
 from app.schemas.hiring_manager import Person
 from app.models.hiring_manager import HiringManager
 
 
-async def run_hiring_manager_pipeline(
+async def stream_hiring_manager_pipeline(
     db: AsyncSession,
     company: str,
     location: str,
     job_title: str,
     max_urls: int = 8
-):
+) -> AsyncIterator[Dict]:
     """
-    Full pipeline until Step 6.
-    No email sending — final step prints 'sent'.
-
-    Steps:
-    1. Tavily → Find URLs where hiring managers appear
-    2. Scrape each URL
-    3. LLM → Extract names, titles, company
-    4. Upsert into DB
-    5. Generate email patterns
-    6. Return structured output
+    Same pipeline as run_hiring_manager_pipeline, yielding one
+    {"event": "person"} record per extracted person as soon as the page
+    is processed, {"event": "page"} for pages that yield nobody,
+    and a final {"event": "summary"}.
     """
 
     print("\n🔍 STEP 1 — Searching for hiring manager URLs...\n")
@@ -40,10 +34,11 @@ async def run_hiring_manager_pipeline(
     print(f"   → Found {len(urls)} candidate pages\n")
 
     if not urls:
-        return {
+        yield {"event": "summary", "result": {
             "status": "no_urls",
             "message": f"No hiring manager pages found for {company}"
-        }
+        }}
+        return
 
     scraper = JobScraperService()
     extractor = LLMPeopleExtractor()
@@ -58,6 +53,7 @@ async def run_hiring_manager_pipeline(
         text = await scraper.fetch_text(url)
         if not text or len(text) < 100:
             print("    ↳ ❌ Not enough text, skipping\n")
+            yield {"event": "page", "url": url, "people_found": 0, "reason": "not_enough_text"}
             continue
 
         print("    ↳ Extracting people...")
@@ -67,36 +63,61 @@ async def run_hiring_manager_pipeline(
 
         if not people:
             print("    ↳ ❌ No managers found\n")
+            yield {"event": "page", "url": url, "people_found": 0, "reason": "no_people"}
             continue
 
         print(f"    ↳ ✅ Found {len(people)} people\n")
 
+        # STEP 4 — Store in DB (one statement per page)
+        await upsert_hiring_managers(
+            db=db,
+            response=people_response,
+            source_url=url
+        )
+
         for person in people:
-            # STEP 4 — Store in DB
-            manager_obj = await upsert_hiring_manager(
-                db=db,
-                person=person,
-                source_url=url
-            )
-
-            extracted_people.append({
+            manager = {
                 "name": person.name,
                 "title": person.title,
                 "company": person.company,
                 "location": person.location,
                 "profile_source": url,
-            })
-
-        # Rate limit respectfully
-        await asyncio.sleep(2)
+            }
+            extracted_people.append(manager)
+            yield {"event": "person", **manager}
 
     print("\n🎯 STEP 6 — Pipeline complete (no email sent)")
     print("sent\n")  # <-- Testing only
 
-    return {
+    yield {"event": "summary", "result": {
         "status": "success",
         "company": company,
         "location": location,
         "total_managers_found": len(extracted_people),
         "managers": extracted_people
-    }
+    }}
+
+
+async def run_hiring_manager_pipeline(
+    db: AsyncSession,
+    company: str,
+    location: str,
+    job_title: str,
+    max_urls: int = 8
+):
+    """
+    Full pipeline until Step 6.
+    No email sending — final step prints 'sent'.
+
+    Steps:
+    1. Tavily → Find URLs where hiring managers appear
+    2. Scrape each URL
+    3. LLM → Extract names, titles, company
+    4. Upsert into DB
+    5. Generate email patterns
+    6. Return structured output
+    """
+
+    async for event in stream_hiring_manager_pipeline(db, company, location, job_title, max_urls):
+        if event["event"] == "summary":
+            return event["result"]
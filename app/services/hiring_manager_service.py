@@ -1,52 +1,118 @@
 # app/services/hiring_manager_service.py
 
+from datetime import datetime
+from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import text, func, literal_column
+from app.database import dialect_insert
 from app.models.hiring_manager import HiringManager
-from app.schemas.hiring_manager import Person
+from app.schemas.hiring_manager import Person, PeopleExtractionResponse
 import uuid
 
+UNIQUE_INDEX_NAME = "uq_hiring_managers_name_company"
 
-async def upsert_hiring_manager(db: AsyncSession, person: Person, source_url: str):
+# Must match the expressions of uq_hiring_managers_name_company exactly
+NAME_COMPANY_KEY = [
+    func.lower(HiringManager.name),
+    func.lower(func.coalesce(HiringManager.company, literal_column("''"))),
+]
+
+
+def _unique_index_exists(sync_conn) -> bool:
+    # Queried directly: SQLite reflection does not report expression indexes
+    if sync_conn.dialect.name == "sqlite":
+        query = "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :name"
+    else:
+        query = "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    return sync_conn.execute(text(query), {"name": UNIQUE_INDEX_NAME}).first() is not None
+
+
+def collapse_duplicate_hiring_managers(sync_conn):
     """
-    Insert or update hiring manager entry based on (name + company).
+    One-off migration: remove rows that predate the unique (name, company)
+    index so it can be created. Keeps the most recently updated row of each
+    group. Once the index exists duplicates can't reappear, so this is a no-op.
     """
+    if _unique_index_exists(sync_conn):
+        return
 
-    # Check existing by name + company
-    existing_query = await db.execute(
-        select(HiringManager).where(
-            HiringManager.name.ilike(person.name),
-            HiringManager.company.ilike(person.company or "")
+    sync_conn.execute(text("""
+        DELETE FROM hiring_managers WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY lower(name), lower(coalesce(company, ''))
+                    ORDER BY updated_at DESC, id
+                ) AS rn
+                FROM hiring_managers
+            ) ranked
+            WHERE rn > 1
         )
-    )
-    existing = existing_query.scalars().first()
-
-    if existing:
-        # Update fields that may change
-        existing.title = person.title
-        existing.location = person.location
-        existing.source_url = source_url
-
-        await db.commit()
-        await db.refresh(existing)
-        return existing
-
-    # Create new entry
-    new_entry = HiringManager(
-        id=str(uuid.uuid4()),
-        name=person.name,
-        title=person.title,
-        company=person.company,
-        location=person.location,
-        source_url=source_url,
-        email=None,
-        email_pattern=None,
-        email_confidence=None,
-        email_attempts=0,
-        last_emailed_at=None
-    )
+    """))
+
+
+async def upsert_hiring_managers(
+    db: AsyncSession,
+    response: PeopleExtractionResponse,
+    source_url: str
+) -> List[HiringManager]:
+    """
+    Insert or update every extracted person in one statement.
+
+    Identity is (lower(name), lower(company)), enforced by a unique index,
+    so existing rows are matched by the database rather than scanned.
+    Returns the resulting HiringManager rows.
+    """
 
-    db.add(new_entry)
+    now = datetime.utcnow()
+
+    # The same person can appear twice on one page — last mention wins
+    rows_by_key = {}
+    for person in response.people:
+        name = person.name.strip()
+        if not name:
+            continue
+
+        key = (name.lower(), (person.company or "").lower())
+        rows_by_key[key] = {
+            "id": str(uuid.uuid4()),
+            "name": name,
+            "title": person.title,
+            "company": person.company,
+            "location": person.location,
+            "source_url": source_url,
+            "email_attempts": 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    if not rows_by_key:
+        return []
+
+    stmt = dialect_insert(db, HiringManager).values(list(rows_by_key.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=NAME_COMPANY_KEY,
+        set_={
+            # Update fields that may change
+            "title": stmt.excluded.title,
+            "location": stmt.excluded.location,
+            "source_url": stmt.excluded.source_url,
+            "updated_at": stmt.excluded.updated_at,
+        }
+    ).returning(HiringManager)
+
+    result = await db.scalars(stmt, execution_options={"populate_existing": True})
+    managers = result.all()
     await db.commit()
-    await db.refresh(new_entry)
-    return new_entry
+    return managers
+
+
+async def upsert_hiring_manager(db: AsyncSession, person: Person, source_url: str):
+    """
+    Insert or update a single hiring manager entry based on (name + company).
+    """
+    managers = await upsert_hiring_managers(
+        db=db,
+        response=PeopleExtractionResponse(people=[person]),
+        source_url=source_url
+    )
+    return managers[0] if managers else None
@@ -0,0 +1,278 @@
+# app/services/http_cache.py
+
+import hashlib
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Set
+import httpx
+from sqlalchemy import select, delete, func
+from app.core.config import get_settings
+from app.database import AsyncSessionLocal, dialect_insert
+from app.models.http_cache import HttpCacheEntry
+
+settings = get_settings()
+
+# Bump when text extraction changes so stale cleaned text is ignored
+TEXT_CACHE_VERSION = 2
+
+# Body hashes per query when sweeping — keeps bound parameters well under SQLite's limit
+SWEEP_CHUNK_SIZE = 200
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class HttpCache:
+    """
+    Content-addressed on-disk cache for scraped pages.
+
+    Layout under `root`:
+        bodies/ab/abcdef...          raw body, named by its sha256
+        texts/ab/abcdef....jd.v2     cleaned text for that body + extraction mode
+                                     (suffix: v<TEXT_CACHE_VERSION>)
+
+    Per-URL validators (ETag / Last-Modified) live in `http_cache_entries`.
+    Entries younger than `fresh_ttl` are served without touching the
+    network; older ones are revalidated with a conditional GET. Partial
+    bodies (byte cap / early stop) are kept without validators, so once
+    stale they are fetched again rather than confirmed by a 304. Once the
+    total body size passes `max_bytes`, least recently used entries go.
+    Body and text files are deleted as soon as no entry references them
+    (a changed page replaces its body; eviction drops it).
+    """
+
+    def __init__(self, root: str, max_bytes: int, fresh_ttl_seconds: int, enabled: bool = True):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.fresh_ttl = timedelta(seconds=fresh_ttl_seconds)
+        self.enabled = enabled
+
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.text_hits = 0
+        self.swept = False
+
+    # ------------------------------------------------------
+    #  PATHS
+    # ------------------------------------------------------
+    def _body_path(self, body_hash: str) -> Path:
+        return self.root / "bodies" / body_hash[:2] / body_hash
+
+    def _text_path(self, body_hash: str, mode: str) -> Path:
+        return self.root / "texts" / body_hash[:2] / f"{body_hash}.{mode}.v{TEXT_CACHE_VERSION}"
+
+    def _delete_files(self, body_hash: str):
+        self._body_path(body_hash).unlink(missing_ok=True)
+        for text_file in self._text_path(body_hash, "*").parent.glob(f"{body_hash}.*"):
+            text_file.unlink(missing_ok=True)
+
+    @staticmethod
+    async def _unreferenced(session, body_hashes: Set[str]) -> Set[str]:
+        """The hashes in `body_hashes` that no entry points at any more"""
+        if not body_hashes:
+            return set()
+        # Bodies are shared between URLs — only unreferenced ones may go
+        still_used = set((await session.execute(
+            select(HttpCacheEntry.body_hash).where(HttpCacheEntry.body_hash.in_(body_hashes))
+        )).scalars().all())
+        return body_hashes - still_used
+
+    @staticmethod
+    def _write(path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)  # atomic, so readers never see half a file
+
+    # ------------------------------------------------------
+    #  LOOKUP
+    # ------------------------------------------------------
+    async def lookup(self, url: str) -> Optional[HttpCacheEntry]:
+        if not self.enabled:
+            return None
+
+        async with AsyncSessionLocal() as session:
+            entry = await session.get(HttpCacheEntry, _sha256(url.encode()))
+            if entry is None:
+                self.misses += 1
+                return None
+
+            entry.last_accessed_at = datetime.utcnow()
+            await session.commit()
+            return entry
+
+    def is_fresh(self, entry: HttpCacheEntry) -> bool:
+        return datetime.utcnow() - entry.fetched_at < self.fresh_ttl
+
+    @staticmethod
+    def conditional_headers(entry: Optional[HttpCacheEntry]) -> Dict[str, str]:
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def has_body(self, entry: HttpCacheEntry) -> bool:
+        return self._body_path(entry.body_hash).exists()
+
+    def read_html(self, entry: HttpCacheEntry) -> Optional[str]:
+        path = self._body_path(entry.body_hash)
+        if not path.exists():
+            return None
+        return path.read_bytes().decode(entry.encoding or "utf-8", errors="replace")
+
+    def read_text(self, entry: HttpCacheEntry, mode: str) -> Optional[str]:
+        path = self._text_path(entry.body_hash, mode)
+        if not path.exists():
+            return None
+        self.text_hits += 1
+        return path.read_text(encoding="utf-8")
+
+    def write_text(self, entry: HttpCacheEntry, mode: str, text: str):
+        if self.enabled and entry is not None:
+            self._write(self._text_path(entry.body_hash, mode), text.encode("utf-8"))
+
+    # ------------------------------------------------------
+    #  STORE
+    # ------------------------------------------------------
+    async def mark_fresh(self, entry: HttpCacheEntry, served_from_cache: bool):
+        """Record a 304 (or a fresh hit) so the TTL restarts from now"""
+        if served_from_cache:
+            self.fresh_hits += 1
+            return
+
+        self.revalidated += 1
+        async with AsyncSessionLocal() as session:
+            stored = await session.get(HttpCacheEntry, entry.url_hash)
+            if stored is not None:
+                stored.fetched_at = datetime.utcnow()
+                await session.commit()
+
+    async def store(
+        self,
+        url: str,
+        response: httpx.Response,
+        body: bytes,
+        partial: bool = False
+    ) -> Optional[HttpCacheEntry]:
+        if not self.enabled:
+            return None
+
+        body_hash = _sha256(body)
+        body_path = self._body_path(body_hash)
+        if not body_path.exists():
+            self._write(body_path, body)
+
+        now = datetime.utcnow()
+        values = {
+            "url_hash": _sha256(url.encode()),
+            "url": url,
+            "body_hash": body_hash,
+            "body_size": len(body),
+            "encoding": response.encoding,
+            "content_type": response.headers.get("content-type"),
+            # A 304 would vouch for the whole document, not the prefix we kept
+            "etag": None if partial else response.headers.get("etag"),
+            "last_modified": None if partial else response.headers.get("last-modified"),
+            "partial": partial,
+            "fetched_at": now,
+            "last_accessed_at": now,
+        }
+
+        async with AsyncSessionLocal() as session:
+            previous = await session.scalar(
+                select(HttpCacheEntry.body_hash).where(HttpCacheEntry.url_hash == values["url_hash"])
+            )
+            stmt = dialect_insert(session, HttpCacheEntry).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[HttpCacheEntry.url_hash],
+                set_={k: v for k, v in values.items() if k != "url_hash"}
+            )
+            await session.execute(stmt)
+
+            # The page changed: its old body (and texts) go unless another URL shares them
+            replaced = await self._unreferenced(session, {previous} - {body_hash, None})
+            await session.commit()
+
+        for old_hash in replaced:
+            self._delete_files(old_hash)
+
+        await self.evict()
+        return HttpCacheEntry(**values)
+
+    async def sweep(self):
+        """Delete body and text files no entry references (left behind by older versions)"""
+        on_disk = {
+            path.name.split(".")[0]
+            for folder in ("bodies", "texts")
+            for path in (self.root / folder).glob("*/*")
+            if path.suffix != ".tmp"
+        }
+
+        async with AsyncSessionLocal() as session:
+            orphans = set()
+            hashes = sorted(on_disk)
+            for start in range(0, len(hashes), SWEEP_CHUNK_SIZE):
+                orphans |= await self._unreferenced(session, set(hashes[start:start + SWEEP_CHUNK_SIZE]))
+
+        for body_hash in orphans:
+            self._delete_files(body_hash)
+        self.swept = True
+        if orphans:
+            print(f"🧹 HTTP cache removed {len(orphans)} unreferenced bodies")
+
+    async def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        if not self.swept:
+            await self.sweep()
+
+        async with AsyncSessionLocal() as session:
+            total = await session.scalar(select(func.coalesce(func.sum(HttpCacheEntry.body_size), 0)))
+            if total <= self.max_bytes:
+                return
+
+            result = await session.execute(
+                select(HttpCacheEntry.url_hash, HttpCacheEntry.body_hash, HttpCacheEntry.body_size)
+                .order_by(HttpCacheEntry.last_accessed_at)
+            )
+
+            evicted, body_hashes = [], set()
+            for url_hash, body_hash, size in result:
+                if total <= self.max_bytes:
+                    break
+                evicted.append(url_hash)
+                body_hashes.add(body_hash)
+                total -= size
+
+            await session.execute(delete(HttpCacheEntry).where(HttpCacheEntry.url_hash.in_(evicted)))
+            unreferenced = await self._unreferenced(session, body_hashes)
+            await session.commit()
+
+        for body_hash in unreferenced:
+            self._delete_files(body_hash)
+
+        print(f"🧹 HTTP cache evicted {len(evicted)} entries")
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "fresh_hits": self.fresh_hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "text_hits": self.text_hits,
+            "fresh_ttl_seconds": int(self.fresh_ttl.total_seconds()),
+            "max_bytes": self.max_bytes,
+        }
+
+
+http_cache = HttpCache(
+    root=settings.HTTP_CACHE_DIR,
+    max_bytes=settings.HTTP_CACHE_MAX_BYTES,
+    fresh_ttl_seconds=settings.HTTP_CACHE_FRESH_TTL_SECONDS,
+    enabled=settings.HTTP_CACHE_ENABLED
+)
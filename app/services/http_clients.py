@@ -0,0 +1,176 @@
+# app/services/http_clients.py
+
+import asyncio
+import importlib.util
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+import httpx
+from app.core.config import get_settings
+from app.services.domain_scheduler import domain_scheduler
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+# HTTP/2 needs the optional `h2` package (pip install "httpx[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Connection": "keep-alive",
+}
+
+
+def _adzuna_pool() -> Dict:
+    return {
+        "base_url": "https://api.adzuna.com",
+        "timeout": httpx.Timeout(10.0, connect=5.0),
+        "limits": httpx.Limits(
+            max_connections=settings.ADZUNA_MAX_CONCURRENCY,
+            max_keepalive_connections=settings.ADZUNA_MAX_CONCURRENCY,
+        ),
+    }
+
+
+def _scraping_pool() -> Dict:
+    # Many hosts, few requests each: wide pool, short keep-alive.
+    # Every request (and redirect hop) waits for its domain's politeness slot.
+    return {
+        "headers": BROWSER_HEADERS,
+        "timeout": httpx.Timeout(15.0, connect=5.0),
+        "follow_redirects": True,
+        "limits": httpx.Limits(
+            max_connections=settings.SCRAPE_CONCURRENCY * 2,
+            max_keepalive_connections=settings.SCRAPE_CONCURRENCY,
+            keepalive_expiry=15.0,
+        ),
+        "event_hooks": {"request": [domain_scheduler.throttle_request]},
+    }
+
+
+def _search_pool() -> Dict:
+    return {
+        "base_url": "https://api.tavily.com",
+        "headers": {"Authorization": f"Bearer {settings.TAVILY_API_KEY}"},
+        "timeout": httpx.Timeout(20.0, connect=5.0),
+        "limits": httpx.Limits(max_connections=4, max_keepalive_connections=4),
+    }
+
+
+POOLS: Dict[str, Callable[[], Dict]] = {
+    "adzuna": _adzuna_pool,
+    "scraping": _scraping_pool,
+    "search": _search_pool,
+}
+
+
+class HttpClientRegistry:
+    """
+    Named, long-lived httpx.AsyncClient pools shared across the app.
+
+    Clients are scoped to the event loop that created them, since a client
+    cannot be used from another loop. The FastAPI lifespan calls start() /
+    aclose() for the app's loop. Code running outside the app (tools) goes
+    through run(), which closes the clients its loop created before the
+    loop ends, so the app's clients are never replaced or leaked.
+    """
+
+    def __init__(self, pools: Dict[str, Callable[[], Dict]], http2: bool):
+        self.pools = pools
+        self.http2 = http2
+        self.clients: Dict[Tuple[str, asyncio.AbstractEventLoop], httpx.AsyncClient] = {}
+        self.max_connections: Dict[str, Optional[int]] = {}
+        self.requests: Dict[str, int] = {name: 0 for name in pools}
+
+    def _create(self, name: str) -> httpx.AsyncClient:
+        options = self.pools[name]()
+        hooks = options.pop("event_hooks", {})
+        self.max_connections[name] = options["limits"].max_connections if "limits" in options else None
+
+        async def count_request(request: httpx.Request):
+            self.requests[name] += 1
+
+        hooks = {**hooks, "request": [count_request, *hooks.get("request", [])]}
+        return httpx.AsyncClient(http2=self.http2, event_hooks=hooks, **options)
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self.clients.get((name, loop))
+
+        if client is None or client.is_closed:
+            # Forget clients of loops that ended without aclose(); nothing can await them now
+            self.clients = {key: c for key, c in self.clients.items() if not key[1].is_closed()}
+            client = self._create(name)
+            self.clients[(name, loop)] = client
+        return client
+
+    async def start(self):
+        for name in self.pools:
+            self.get(name)
+        print(f"🌐 HTTP pools ready: {', '.join(self.pools)} (HTTP/2 {'on' if self.http2 else 'off'})")
+
+    async def aclose(self):
+        """Close the clients created on the running loop"""
+        loop = asyncio.get_running_loop()
+        for key, client in list(self.clients.items()):
+            if key[1] is loop:
+                del self.clients[key]
+                if not client.is_closed:
+                    await client.aclose()
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """asyncio.run for code outside the app: the loop's clients are closed before it ends"""
+        async def main() -> T:
+            try:
+                return await coro
+            finally:
+                await self.aclose()
+
+        return asyncio.run(main())
+
+    @staticmethod
+    def _connections(client: httpx.AsyncClient) -> Optional[List]:
+        # The pool sits behind private attributes of httpx/httpcore — best effort,
+        # None when a version or a custom transport doesn't expose it
+        try:
+            return list(client._transport._pool.connections)
+        except (AttributeError, TypeError):
+            return None
+
+    def _pool_stats(self, name: str, client: httpx.AsyncClient) -> Dict:
+        connections = self._connections(client)
+        if connections is None:
+            return {}
+
+        try:
+            active = sum(1 for conn in connections if not conn.is_idle())
+        except AttributeError:
+            return {"open_connections": len(connections)}
+
+        max_connections = self.max_connections.get(name)
+        return {
+            "max_connections": max_connections,
+            "open_connections": len(connections),
+            "active_connections": active,
+            "utilization": round(active / max_connections, 2) if max_connections else None,
+        }
+
+    def stats(self) -> Dict:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        stats = {}
+        for name in self.pools:
+            client = self.clients.get((name, loop))
+            stats[name] = {
+                "open": client is not None and not client.is_closed,
+                "requests": self.requests[name],
+                **(self._pool_stats(name, client) if client is not None else {}),
+            }
+        return stats
+
+
+http_clients = HttpClientRegistry(POOLS, http2=settings.HTTP2_ENABLED and HTTP2_AVAILABLE)
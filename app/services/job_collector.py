@@ -1,71 +1,138 @@
 # app/services/job_collector.py
-from sqlalchemy.future import select
-from sqlalchemy.exc import IntegrityError
+from typing import AsyncIterator, Dict, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from app.models.job import Job
+from app.database import DATABASE_URL, database_label, dialect_insert
 from app.services.adzuna_service import AdzunaService
+from app.services.near_duplicates import assign_clusters
 
-async def collect_jobs(
-    db: AsyncSession, 
-    query: str, 
-    location: str = "in", 
+# Rows per INSERT statement — keeps bound parameters well under SQLite's limit
+INSERT_CHUNK_SIZE = 200
+
+
+def _job_row(job: Dict, collected_at: datetime) -> Dict:
+    """Map a parsed Adzuna job onto Job column values"""
+    return {
+        "id": str(job["id"]),
+        "title": job.get("title"),
+        "company": job.get("company"),
+        "location": job.get("location"),
+        "description": job.get("description"),
+        "salary_min": job.get("salary_min"),
+        "salary_max": job.get("salary_max"),
+        "contract_type": job.get("contract_type"),
+        "category": job.get("category"),
+        "posted_date": job.get("posted_date"),
+        "apply_link": job.get("apply_link"),
+        "source": job.get("source"),
+        "link_status": job.get("link_status"),
+        "processed": False,
+        "collected_at": collected_at,
+    }
+
+
+async def bulk_insert_jobs(db: AsyncSession, raw_jobs: List[Dict]) -> Tuple[List[str], int, int]:
+    """
+    Insert a batch of parsed jobs in a single transaction.
+
+    Uses INSERT ... ON CONFLICT DO NOTHING RETURNING id, so the database
+    decides what is new — no need to load existing ids into memory.
+
+    Returns:
+        (ids actually inserted, duplicates skipped, jobs without an id skipped)
+    """
+
+    collected_at = datetime.now()
+    rows = [_job_row(job, collected_at) for job in raw_jobs if job.get("id")]
+    missing_id = len(raw_jobs) - len(rows)
+
+    inserted_ids: List[str] = []
+
+    try:
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            chunk = rows[start:start + INSERT_CHUNK_SIZE]
+            stmt = (
+                dialect_insert(db, Job)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=[Job.id])
+                .returning(Job.id)
+            )
+            result = await db.execute(stmt)
+            inserted_ids.extend(result.scalars().all())
+
+        await db.commit()
+
+    except Exception:
+        await db.rollback()
+        raise
+
+    return inserted_ids, len(rows) - len(inserted_ids), missing_id
+
+
+async def stream_collect_jobs(
+    db: AsyncSession,
+    query: str,
+    location: str = "in",
     max_results: int = 20
-) -> dict:
+) -> AsyncIterator[Dict]:
+    """
+    Same as collect_jobs, yielding one {"event": "job"} record per
+    harvested job (with whether it was new) and a final summary.
+    """
     print(f"🔍 Collecting jobs for '{query}' in {location}...")
 
     adzuna = AdzunaService()
-    search_result = await adzuna.search_jobs(query=query, location=location, results_per_page=max_results)
+    search_result = await adzuna.harvest_jobs(query=query, location=location, max_results=max_results)
 
-    if search_result["status"] != "success":
-        return {"status": "error", "message": "Adzuna search failed", "jobs_added": 0}
+    if search_result["status"] not in ("success", "partial"):
+        yield {"event": "summary", "result": {"status": "error", "message": "Adzuna search failed", "jobs_added": 0}}
+        return
 
     raw_jobs = search_result["jobs"]
     print(f"✅ Found {len(raw_jobs)} jobs from Adzuna")
 
-    # Get existing IDs to avoid duplicates
-    result = await db.execute(select(Job.id))
-    existing_ids = set(row[0] for row in result.scalars().all())
-    print(f"📄 Found {len(existing_ids)} existing jobs in database")
+    inserted_ids, skipped, missing_id = await bulk_insert_jobs(db, raw_jobs)
+    jobs_added = len(inserted_ids)
+
+    inserted = set(inserted_ids)
+
+    # Fingerprint new rows now, so matching can skip near-duplicates later
+    clusters = await assign_clusters(db, (
+        (str(job["id"]), job.get("company"), job.get("title"), job.get("description"))
+        for job in raw_jobs if str(job["id"]) in inserted
+    ))
+    near_duplicates = sum(1 for job_id, cluster_id in clusters.items() if job_id != cluster_id)
 
-    new_jobs = []
     for job in raw_jobs:
-        job_id = str(job["id"])
-        if job_id in existing_ids:
-            continue
-
-        new_jobs.append(Job(
-            id=job_id,
-            title=job.get("title"),
-            company=job.get("company"),
-            location=job.get("location"),
-            description=job.get("description"),
-            salary_min=job.get("salary_min"),
-            salary_max=job.get("salary_max"),
-            contract_type=job.get("contract_type"),
-            category=job.get("category"),
-            posted_date=job.get("posted_date"),
-            apply_link=job.get("apply_link"),
-            source=job.get("source"),
-            link_status=job.get("link_status"),
-            processed=False,
-            collected_at=datetime.now()
-        ))
-
-    jobs_added = 0
-    for job_obj in new_jobs:
-        db.add(job_obj)
-        try:
-            await db.commit()
-            jobs_added += 1
-        except IntegrityError:
-            await db.rollback()
-
-    print(f"✅ Added {jobs_added} new jobs (skipped {len(raw_jobs) - jobs_added} duplicates)")
-    return {
+        yield {
+            "event": "job",
+            "job_id": str(job["id"]),
+            "title": job.get("title"),
+            "company": job.get("company"),
+            "apply_link": job.get("apply_link"),
+            "inserted": str(job["id"]) in inserted,
+        }
+
+    print(f"✅ Added {jobs_added} new jobs (skipped {skipped} duplicates, {missing_id} without an id)")
+    yield {"event": "summary", "result": {
         "status": "success",
         "total_found": len(raw_jobs),
         "jobs_added": jobs_added,
-        "duplicates_skipped": len(raw_jobs) - jobs_added,
-        "db_path": "SQLite: ./data/jobs.db"
-    }
+        "duplicates_skipped": skipped,
+        "missing_id_skipped": missing_id,
+        "near_duplicates": near_duplicates,
+        "pages_fetched": search_result.get("pages_fetched", 1),
+        "db_path": database_label(DATABASE_URL)
+    }}
+
+
+async def collect_jobs(
+    db: AsyncSession,
+    query: str,
+    location: str = "in",
+    max_results: int = 20
+) -> dict:
+    async for event in stream_collect_jobs(db, query, location, max_results):
+        if event["event"] == "summary":
+            return event["result"]
@@ -1,37 +1,157 @@
 import asyncio
 from datetime import datetime
+from typing import AsyncIterator, Awaitable, Dict, List, Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import update
 
+from app.core.config import get_settings
+from app.services.description_store import load_descriptions, save_descriptions
+from app.services.link_resolver import follow_job_link, known_job_links, store_job_links
+from app.services.near_duplicates import assign_clusters, normalize_title
 from app.services.scraper_service import JobScraperService
-from app.services.skill_matcher_service import SkillMatcherService
-from app.schemas.job import JobSearchResponse, MatchedJob
+from app.services.skill_matcher_service import SkillMatcherService, prefilter_match
+from app.schemas.job import JobSearchResponse, MatchedJob, SkillMatchResult
 from app.models.job import Job  # your ORM model
+from app.models.job_description import JobDescription
+from app.models.job_link import JobLink
 
 # Remove CSV_PATH, pandas import since no CSV
 
-async def match_unprocessed_jobs(
+settings = get_settings()
+
+
+async def _scrape_with_limits(
+    scraper: JobScraperService,
+    semaphore: asyncio.Semaphore,
+    url: str
+) -> Optional[str]:
+    """Fetch one JD under the global concurrency limit and a per-job timeout"""
+    async with semaphore:
+        try:
+            return await asyncio.wait_for(
+                scraper.fetch_job_description(url),
+                timeout=settings.SCRAPE_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            print(f"  ↳ ❌ Timed out after {settings.SCRAPE_TIMEOUT_SECONDS}s: {url[:80]}")
+            return None
+
+
+async def _scrape_posting(
+    scraper: JobScraperService,
+    semaphore: asyncio.Semaphore,
+    apply_links: List[str],
+    links: Dict[str, JobLink]
+) -> Tuple[Optional[str], Optional[str], List[JobLink]]:
+    """
+    Scrape a posting from the first of its links that yields a usable JD.
+    New links are resolved here, one at a time as they are tried, so no
+    posting waits for every other link's redirects. Updates `links` and
+    returns (jd, url, links resolved on the way) — the caller stores those.
+    """
+    resolved, tried = [], set()
+    for apply_link in apply_links:
+        link = links[apply_link]
+        if link.status_code is None:
+            async with semaphore:
+                link = await follow_job_link(scraper.client, apply_link)
+            links[apply_link] = link
+            resolved.append(link)
+
+        if link.final_url in tried:
+            continue
+        tried.add(link.final_url)
+
+        full_jd = await _scrape_with_limits(scraper, semaphore, link.final_url)
+        if full_jd and len(full_jd) > 100:
+            return full_jd, link.final_url, resolved
+    return None, None, resolved
+
+
+# A canonical URL reached from more distinct apply links than this is a hub
+# (expired postings redirected to a careers page), not one posting
+MAX_LINKS_PER_CANONICAL_URL = 5
+
+
+def _group_postings(jobs: List[Job], links: Dict, clusters: Dict[str, str]) -> Dict[str, List[Job]]:
+    """
+    Union-find over jobs: two jobs are one posting if they have the same
+    title and their links resolve to the same canonical URL or their texts
+    are near-duplicates. Hub URLs shared by many distinct apply links are
+    not used for grouping. Returns representative job id → jobs, in
+    first-seen order.
+    """
+    parent: Dict[str, str] = {}
+
+    apply_links_per_url: Dict[str, Set[str]] = {}
+    for job in jobs:
+        apply_links_per_url.setdefault(links[job.apply_link].canonical_url, set()).add(job.apply_link)
+
+    def find(key: str) -> str:
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    def union(a: str, b: str):
+        parent[find(a)] = find(b)
+
+    for job in jobs:
+        node = f"job:{job.id}"
+        title = normalize_title(job.title)
+        canonical_url = links[job.apply_link].canonical_url
+        if len(apply_links_per_url[canonical_url]) <= MAX_LINKS_PER_CANONICAL_URL:
+            union(node, f"url:{canonical_url}|{title}")
+        # Titles checked here too: clusters stored before they were part of the LSH key may mix roles
+        union(node, f"cluster:{clusters.get(str(job.id), str(job.id))}|{title}")
+
+    groups: Dict[str, List[Job]] = {}
+    for job in jobs:
+        groups.setdefault(find(f"job:{job.id}"), []).append(job)
+
+    return {str(group[0].id): group for group in groups.values()}
+
+
+def _fetched_members(group: List[Job], links: Dict, source_url: str) -> List[Job]:
+    """Jobs of a posting whose apply link resolves to the page that was scraped"""
+    canonical_urls = {links[job.apply_link].canonical_url for job in group if links[job.apply_link].final_url == source_url}
+    return [job for job in group if links[job.apply_link].canonical_url in canonical_urls]
+
+
+async def stream_match_unprocessed_jobs(
     db: AsyncSession,
     min_match_score: int = 40,
-    limit: int = 20
-) -> JobSearchResponse:
+    limit: int = 20,
+    rescore: bool = False,
+    cursor: Optional[str] = None
+) -> AsyncIterator[Dict]:
     """
-    Query unprocessed jobs from DB,
-    scrape job descriptions,
-    match skills using LLM,
-    update processed flag in DB,
-    return matched jobs in Pydantic model.
+    Same pipeline as match_unprocessed_jobs, yielding progress events:
+
+      {"event": "scraped", ...}   once per job, as soon as its page is fetched
+      {"event": "matched", ...}   once per job, as soon as the LLM scores it
+      {"event": "summary", "result": JobSearchResponse}   last
     """
 
-    # Step 1: Fetch unprocessed jobs from DB
-    result = await db.execute(
-        select(Job).where(Job.processed == False).limit(limit)
-    )
+    # Step 1: Fetch unprocessed jobs from DB — or, when re-scoring, jobs
+    # whose descriptions are already stored (no network at all), a page at
+    # a time in job id order: `cursor` is the last id of the previous page
+    if rescore:
+        query = select(Job).join(JobDescription, JobDescription.job_id == Job.id)
+        if cursor is not None:
+            query = query.where(Job.id > cursor)
+    else:
+        query = select(Job).where(Job.processed == False)
+    result = await db.execute(query.order_by(Job.id).limit(limit))
     unprocessed_jobs = result.scalars().all()
 
+    # Processed jobs drop out of the unprocessed query by themselves; only rescoring pages
+    next_cursor = str(unprocessed_jobs[-1].id) if rescore and len(unprocessed_jobs) == limit else None
+
     if not unprocessed_jobs:
-        return JobSearchResponse(
+        yield {"event": "summary", "result": JobSearchResponse(
             status="success",
             query="N/A",
             location="N/A",
@@ -39,56 +159,167 @@ async def match_unprocessed_jobs(
             total_scraped=0,
             total_matched=0,
             matched_jobs=[]
-        )
-    print(f"✅ Found {len(unprocessed_jobs)} unprocessed jobs (limit: {limit})\n")
+        )}
+        return
+    print(f"✅ Found {len(unprocessed_jobs)} {'stored' if rescore else 'unprocessed'} jobs (limit: {limit})\n")
 
-    # Step 2: Scraping job descriptions
-    print(f"📄 Step 2: Scraping job descriptions...")
     scraper = JobScraperService()
+
+    # Step 2: Group listings into postings — links known to resolve to the
+    # same page, or near-duplicate texts, are scraped and matched once.
+    # New links are resolved inside their posting's scrape (step 3).
+    linked_jobs = [job for job in unprocessed_jobs if job.apply_link]
+    links = await known_job_links(db, (job.apply_link for job in linked_jobs))
+    clusters = await assign_clusters(db, ((str(job.id), job.company, job.title, job.description) for job in linked_jobs))
+
+    postings = _group_postings(linked_jobs, links, clusters)
+    posting_of = {job.id: key for key, group in postings.items() for job in group}
+    print(f"🔗 {len(linked_jobs)} links → {len(postings)} unique postings\n")
+
+    # Step 3: Scraping job descriptions (concurrently, collected in order).
+    # Postings with a stored description skip the network entirely.
+    print(f"📄 Step 3: Scraping job descriptions...")
+    semaphore = asyncio.Semaphore(settings.SCRAPE_CONCURRENCY)
     jobs_with_jd = []
 
-    for idx, job in enumerate(unprocessed_jobs, 1):
-        print(f"  [{idx}/{len(unprocessed_jobs)}] {job.title}")
+    stored = await load_descriptions(db, (str(job.id) for job in linked_jobs))
+    stored_by_posting = {
+        key: next(stored[str(job.id)] for job in group if str(job.id) in stored)
+        for key, group in postings.items()
+        if any(str(job.id) in stored for job in group)
+    }
+    print(f"💾 {len(stored_by_posting)}/{len(postings)} postings already stored")
 
-        if not job.apply_link:
-            # Mark as processed even if no link
-            job.processed = True
-            await db.commit()
-            print(f"    ↳ ❌ No link")
-            continue
+    scrape_tasks = {
+        key: asyncio.create_task(_scrape_posting(
+            scraper, semaphore, list(dict.fromkeys(job.apply_link for job in group)), links
+        ))
+        for key, group in postings.items()
+        if key not in stored_by_posting and not rescore
+    }
 
-        full_jd = await scraper.fetch_job_description(job.apply_link)
+    try:
+        for idx, job in enumerate(unprocessed_jobs, 1):
+            print(f"  [{idx}/{len(unprocessed_jobs)}] {job.title}")
 
-        if full_jd and len(full_jd) > 100:
-            job.full_jd = full_jd  # Add attribute dynamically or adjust model
-            jobs_with_jd.append(job)
-            print(f"    ↳ ✅ {len(full_jd)} chars")
-        else:
-            job.processed = True
-            await db.commit()
-            print(f"    ↳ ❌ Failed to scrape")
+            if not job.apply_link:
+                # Mark as processed even if no link
+                job.processed = True
+                await db.commit()
+                print(f"    ↳ ❌ No link")
+                yield {"event": "scraped", "job_id": str(job.id), "title": job.title, "ok": False, "reason": "no_link"}
+                continue
+
+            key = posting_of[job.id]
+            full_jd = stored_by_posting.get(key)
+
+            if full_jd is None and key in scrape_tasks:
+                full_jd, source_url, resolved = await scrape_tasks.pop(key)
+                await store_job_links(db, resolved)
+                if full_jd and len(full_jd) > 100:
+                    # Store for every listing whose own link leads to the fetched page, so
+                    # re-matching never re-scrapes; near-duplicates elsewhere only share it for this run
+                    await save_descriptions(db, (
+                        (str(member.id), full_jd, source_url)
+                        for member in _fetched_members(postings[key], links, source_url)
+                    ))
+                    stored_by_posting[key] = full_jd
+
+            if full_jd and len(full_jd) > 100:
+                job.full_jd = full_jd  # Add attribute dynamically or adjust model
+                jobs_with_jd.append(job)
+                print(f"    ↳ ✅ {len(full_jd)} chars")
+                yield {"event": "scraped", "job_id": str(job.id), "title": job.title, "ok": True, "chars": len(full_jd)}
+            else:
+                job.processed = True
+                await db.commit()
+                print(f"    ↳ ❌ Failed to scrape")
+                yield {"event": "scraped", "job_id": str(job.id), "title": job.title, "ok": False, "reason": "scrape_failed"}
+    finally:
+        # A streaming client may disconnect mid-stage — don't leave fetches running
+        for scrape_task in scrape_tasks.values():
+            if not scrape_task.done():
+                scrape_task.cancel()
 
     print(f"\n✅ Scraped {len(jobs_with_jd)} job descriptions\n")
 
-    # Step 3: Match skills using LLM
-    print(f"🧠 Step 3: Matching skills...")
+    # Step 4: Match skills — once per posting, fanned out to its jobs.
+    # A local regex score settles clear passes/fails; only the uncertain
+    # band below min_match_score goes to the LLM, several JDs per call,
+    # with batches running concurrently under the shared provider limits.
+    print(f"🧠 Step 4: Matching skills...")
     skill_matcher = SkillMatcherService()
     matched_jobs = []
 
-    for idx, job in enumerate(jobs_with_jd, 1):
-        print(f"  [{idx}/{len(jobs_with_jd)}] {job.title}")
+    scraped_postings: Dict[str, List[Job]] = {}
+    for job in jobs_with_jd:
+        scraped_postings.setdefault(posting_of[job.id], []).append(job)
 
+    prefiltered: Dict[str, SkillMatchResult] = {}
+    llm_pending: Dict[str, str] = {}
+    for key, group in scraped_postings.items():
+        local = None
+        if settings.SKILL_PREFILTER_ENABLED:
+            local = prefilter_match(
+                group[0].full_jd,
+                min_match_score,
+                reject_margin=settings.SKILL_PREFILTER_REJECT_MARGIN,
+                accept_margin=settings.SKILL_PREFILTER_ACCEPT_MARGIN
+            )
+        if local is not None:
+            prefiltered[key] = local
+        else:
+            llm_pending[key] = group[0].full_jd
+
+    llm_calls = len(llm_pending)
+    llm_calls_avoided = len(prefiltered)
+
+    async def llm_round(keys: List[str], call: Awaitable[Dict[str, SkillMatchResult]]) -> Tuple[List[str], Dict[str, SkillMatchResult]]:
+        """(posting keys, results) for one LLM round; keys without a result failed"""
         try:
-            match_result = await skill_matcher.match_job(job.full_jd)
-            score = match_result.match_score
-            print(f"    ↳ Score: {score}%")
+            return keys, await call
+        except Exception as e:
+            print(f"    ↳ ❌ Error: {str(e)[:50]}")
+            return keys, {}
+
+    async def match_one(key: str, jd: str) -> Dict[str, SkillMatchResult]:
+        return {key: await skill_matcher.match_job(jd)}
+
+    def start_llm_rounds(cached: Dict[str, SkillMatchResult]) -> List[asyncio.Task]:
+        # Every round starts at once; groq_limiter bounds concurrency and RPM/TPM
+        uncached = {key: jd for key, jd in llm_pending.items() if key not in cached}
+        if not settings.SKILL_BATCH_ENABLED:
+            return [asyncio.create_task(llm_round([key], match_one(key, jd))) for key, jd in uncached.items()]
+
+        batches = skill_matcher.plan_batches(uncached)
+        if batches:
+            print(f"  🧮 {len(uncached)} postings → {len(batches)} LLM batch(es)")
+        return [asyncio.create_task(llm_round(list(batch), skill_matcher.match_batch(batch))) for batch in batches]
+
+    async def finish(keys: List[str], results: Dict[str, SkillMatchResult], method: str) -> AsyncIterator[Dict]:
+        for key in keys:
+            group = scraped_postings[key]
+            duplicates = f" (+{len(group) - 1} duplicate listings)" if len(group) > 1 else ""
+            print(f"  {group[0].title}{duplicates}")
 
             # Mark as processed
-            job.processed = True
+            for job in group:
+                job.processed = True
             await db.commit()
 
-            if score >= min_match_score:
-                matched_jobs.append(MatchedJob(
+            match_result = results.get(key)
+            if match_result is None:
+                print(f"    ↳ ❌ Match failed")
+                for job in group:
+                    yield {"event": "match_failed", "job_id": str(job.id), "title": job.title, "error": "LLM match failed"}
+                continue
+
+            score = match_result.match_score
+            passed = score >= min_match_score
+            print(f"    ↳ Score: {score}% ({method}) {'✅ Matched!' if passed else '❌ Below threshold'}")
+
+            for job in group:
+                matched_job = MatchedJob(
                     id=str(job.id),
                     title=job.title,
                     company=job.company,
@@ -101,29 +332,78 @@ async def match_unprocessed_jobs(
                     match_score=score,
                     matched_skills=match_result.matched_skills,
                     missing_skills=match_result.missing_skills,
-                    jd_preview=job.full_jd[:500]
-                ))
-                print(f"    ↳ ✅ Matched!")
-            else:
-                print(f"    ↳ ❌ Below threshold")
+                    jd_preview=job.full_jd[:500],
+                    match_method=method
+                )
 
-            print("I am going for sleep")
-            await asyncio.sleep(5)  # Keep your delay or adjust as needed
+                if passed:
+                    matched_jobs.append(matched_job)
 
-        except Exception as e:
-            job.processed = True
-            await db.commit()
-            print(f"    ↳ ❌ Error: {str(e)[:50]}")
+                yield {"event": "matched", "job": matched_job, "passed": passed}
+
+    async for event in finish(list(prefiltered), prefiltered, "prefilter"):
+        yield event
+
+    cached = await skill_matcher.cached_matches(llm_pending)
+    async for event in finish(list(cached), cached, "llm"):
+        yield event
+
+    llm_tasks = start_llm_rounds(cached)
+    try:
+        for next_round in asyncio.as_completed(llm_tasks):
+            keys, results = await next_round
+            async for event in finish(keys, results, "llm"):
+                yield event
+    finally:
+        # A streaming client may disconnect mid-stage — don't leave LLM calls running
+        for llm_task in llm_tasks:
+            if not llm_task.done():
+                llm_task.cancel()
+
+    decided = llm_calls + llm_calls_avoided
+    avoided_ratio = round(llm_calls_avoided / decided, 2) if decided else 0.0
 
     print(f"\n✅ Processed {len(unprocessed_jobs)} jobs")
-    print(f"✅ {len(matched_jobs)} jobs passed filter\n")
+    print(f"✅ {len(matched_jobs)} jobs passed filter")
+    print(f"⚡ {llm_calls_avoided}/{decided} postings decided without the LLM")
+    print(f"🧠 {skill_matcher.usage['calls']} LLM requests, {skill_matcher.usage['input_tokens'] + skill_matcher.usage['output_tokens']} tokens\n")
 
-    return JobSearchResponse(
+    yield {"event": "summary", "result": JobSearchResponse(
         status="success",
         query="From DB",
         location="N/A",
         total_found=len(unprocessed_jobs),
         total_scraped=len(jobs_with_jd),
         total_matched=len(matched_jobs),
+        unique_postings=len(postings),
+        llm_calls=llm_calls,
+        llm_calls_avoided=llm_calls_avoided,
+        llm_calls_avoided_ratio=avoided_ratio,
+        llm_requests=skill_matcher.usage["calls"],
+        next_cursor=next_cursor,
         matched_jobs=sorted(matched_jobs, key=lambda x: x.match_score, reverse=True)
-    )
+    )}
+
+
+async def match_unprocessed_jobs(
+    db: AsyncSession,
+    min_match_score: int = 40,
+    limit: int = 20,
+    rescore: bool = False,
+    cursor: Optional[str] = None
+) -> JobSearchResponse:
+    """
+    Query unprocessed jobs from DB,
+    scrape job descriptions (or reuse stored ones),
+    match skills using LLM,
+    update processed flag in DB,
+    return matched jobs in Pydantic model.
+
+    rescore=True re-matches jobs that already have a stored description,
+    processed or not, without any HTTP requests — `limit` per call, resumed
+    from the previous response's next_cursor until it comes back empty.
+    """
+
+    async for event in stream_match_unprocessed_jobs(db, min_match_score, limit, rescore, cursor):
+        if event["event"] == "summary":
+            return event["result"]
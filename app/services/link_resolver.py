@@ -0,0 +1,141 @@
+# app/services/link_resolver.py
+
+import asyncio
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.database import dialect_insert
+from app.models.job_link import JobLink
+from app.services.resilience import resilience
+from app.services.robots_cache import robots_cache
+
+settings = get_settings()
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "_ga", "_gl",
+    "ref", "referrer", "refid", "src", "source", "trk", "trackingid",
+    "campaign", "campaignid", "adid", "clickid",
+}
+
+# Rows per SELECT / INSERT — keeps bound parameters well under SQLite's limit
+CHUNK_SIZE = 200
+
+# Servers that refuse HEAD outright; the link is then followed with a streamed GET
+HEAD_UNSUPPORTED = {405, 501}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normal form used to spot the same posting behind different links:
+    lowercase scheme and host, no 'www.', default port, fragment or
+    trailing slash, tracking parameters removed and the rest sorted.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip("/") or "/"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+async def _follow(client: httpx.AsyncClient, url: str) -> Tuple[str, Optional[int]]:
+    """
+    Follow redirects without downloading the final page: HEAD requests,
+    or a GET whose stream is closed unread when the server rejects HEAD.
+    The page itself is fetched once, later, by the scraper.
+    Returns (final_url, status_code).
+    """
+    if settings.RESPECT_ROBOTS_TXT and not await robots_cache.allowed(url, client):
+        return url, None
+
+    response = await resilience.run(url, lambda: client.head(url), max_attempts=1)
+    if response.status_code not in HEAD_UNSUPPORTED:
+        return str(response.url), response.status_code
+
+    request = client.build_request("GET", url)
+    response = await resilience.run(url, lambda: client.send(request, stream=True), max_attempts=1)
+    await response.aclose()
+    return str(response.url), response.status_code
+
+
+def _unresolved(link: str) -> JobLink:
+    """A link that maps to itself — not (yet) followed, or failed to resolve"""
+    return JobLink(
+        apply_link=link, final_url=link, canonical_url=canonicalize_url(link),
+        status_code=None, resolved_at=datetime.utcnow()
+    )
+
+
+async def known_job_links(db: AsyncSession, apply_links: Iterable[str]) -> Dict[str, JobLink]:
+    """
+    Map each apply link to its JobLink without touching the network:
+    links resolved before come from `job_links`, any other link maps to
+    itself (status_code None) until follow_job_link resolves it.
+    """
+    links = list(dict.fromkeys(link for link in apply_links if link))
+    resolved: Dict[str, JobLink] = {}
+
+    for start in range(0, len(links), CHUNK_SIZE):
+        chunk = links[start:start + CHUNK_SIZE]
+        # Error rows (stored by older versions) are resolved again
+        result = await db.execute(
+            select(JobLink).where(JobLink.apply_link.in_(chunk), JobLink.status_code < 400)
+        )
+        resolved.update({row.apply_link: row for row in result.scalars()})
+
+    return {link: resolved.get(link) or _unresolved(link) for link in links}
+
+
+async def follow_job_link(client: httpx.AsyncClient, link: str) -> JobLink:
+    """Follow one apply link's redirects; a link that cannot be resolved maps to itself"""
+    try:
+        final_url, status_code = await asyncio.wait_for(_follow(client, link), timeout=settings.SCRAPE_TIMEOUT_SECONDS)
+    except Exception as e:
+        print(f"  ↳ ⚠️ Could not resolve {link[:60]}: {str(e)[:60]}")
+        return _unresolved(link)
+
+    return JobLink(
+        apply_link=link, final_url=final_url, canonical_url=canonicalize_url(final_url),
+        status_code=status_code, resolved_at=datetime.utcnow()
+    )
+
+
+async def store_job_links(db: AsyncSession, links: Iterable[JobLink]):
+    """
+    Persist successful resolutions (final status below 400). An error may
+    be transient, so that link is followed again next run.
+    """
+    rows = [
+        {key: getattr(link, key) for key in ("apply_link", "final_url", "canonical_url", "status_code", "resolved_at")}
+        for link in links
+        if link.status_code is not None and link.status_code < 400
+    ]
+
+    for start in range(0, len(rows), CHUNK_SIZE):
+        stmt = dialect_insert(db, JobLink).values(rows[start:start + CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobLink.apply_link],
+            set_={key: stmt.excluded[key] for key in ("final_url", "canonical_url", "status_code", "resolved_at")}
+        )
+        await db.execute(stmt)
+
+    if rows:
+        await db.commit()
+
@@ -0,0 +1,209 @@
+# app/services/llm_cache.py
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type, Union
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select, delete, func, update
+from app.core.config import get_settings
+from app.database import AsyncSessionLocal, ReadSessionLocal, dialect_insert
+from app.models.llm_cache import LLMCacheEntry
+
+settings = get_settings()
+
+# A response schema (structured output) or `str` for plain-text completions
+Schema = Union[Type[BaseModel], Type[str]]
+
+# LRU bookkeeping is coarse: a hit refreshes last_accessed_at only when it is
+# older than this, and refreshes are written in batches, never by the read itself
+TOUCH_INTERVAL = timedelta(hours=1)
+TOUCH_BATCH_SIZE = 50
+
+
+def llm_identity(llm: Any) -> Tuple[str, Optional[float]]:
+    """(model name, temperature) of a LangChain chat model"""
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+    return str(model), getattr(llm, "temperature", None)
+
+
+def _schema_fingerprint(schema: Schema) -> str:
+    if schema is str:
+        return "text"
+    # Any field/description change invalidates old entries
+    return json.dumps(schema.model_json_schema(), sort_keys=True)
+
+
+class LLMResponseCache:
+    """
+    Persistent cache of validated LLM results.
+
+    Keyed by a hash of model name, temperature, response schema and prompt,
+    so a re-processed job or an unchanged re-scraped page costs no tokens.
+    Entries live in the `llm_cache` table, expire after `ttl_seconds` and
+    are evicted least-recently-used beyond `max_entries`. Results are
+    re-validated against the schema on read; anything that no longer
+    validates is a miss. Failed calls are never cached.
+
+    Reads go through the read-only pool; access times are queued and
+    written with the next store (or every TOUCH_BATCH_SIZE hits). The
+    cache is an optimisation only: a database error on read is a miss and
+    on write is a skipped store, never a failed LLM call.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.prompt_chars_saved = 0
+        self._touched: Dict[str, datetime] = {}  # key → access time not yet written
+
+    @staticmethod
+    def make_key(model: str, temperature: Optional[float], schema: Schema, prompt: str) -> str:
+        raw = json.dumps([model, temperature, _schema_fingerprint(schema), prompt])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(self, key: str, schema: Schema) -> Optional[Any]:
+        if self.ttl.total_seconds() <= 0:
+            return None
+
+        try:
+            async with ReadSessionLocal() as session:
+                entry = await session.get(LLMCacheEntry, key)
+        except Exception as e:
+            self.errors += 1
+            self.misses += 1
+            print(f"⚠️ LLM cache read failed: {str(e)[:100]}")
+            return None
+
+        now = datetime.utcnow()
+        if entry is None or now - entry.created_at > self.ttl:
+            self.misses += 1
+            return None
+
+        try:
+            value = json.loads(entry.payload) if schema is str else schema.model_validate_json(entry.payload)
+        except (ValidationError, ValueError):
+            self.misses += 1
+            return None
+
+        if now - entry.last_accessed_at > TOUCH_INTERVAL:
+            self._touched[key] = now
+            if len(self._touched) >= TOUCH_BATCH_SIZE:
+                try:
+                    async with AsyncSessionLocal() as session:
+                        await self._flush_touched(session)
+                        await session.commit()
+                except Exception as e:
+                    self.errors += 1
+                    print(f"⚠️ LLM cache access-time update failed: {str(e)[:100]}")
+
+        self.hits += 1
+        return value
+
+    async def _flush_touched(self, session):
+        """Write queued access times in one UPDATE (the newest time stands for the batch)"""
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, {}
+        await session.execute(
+            update(LLMCacheEntry)
+            .where(LLMCacheEntry.key.in_(list(touched)))
+            .values(last_accessed_at=max(touched.values()))
+        )
+
+    async def set(self, key: str, model: str, schema: Schema, value: Any):
+        if self.ttl.total_seconds() <= 0:
+            return
+
+        try:
+            await self._write(key, model, schema, value)
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ LLM cache write failed, result not cached: {str(e)[:100]}")
+
+    async def _write(self, key: str, model: str, schema: Schema, value: Any):
+        now = datetime.utcnow()
+        payload = json.dumps(value) if schema is str else value.model_dump_json()
+        schema_name = "text" if schema is str else schema.__name__
+
+        async with AsyncSessionLocal() as session:
+            stmt = dialect_insert(session, LLMCacheEntry).values(
+                key=key, model=model[:100], schema_name=schema_name, payload=payload,
+                created_at=now, last_accessed_at=now
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[LLMCacheEntry.key],
+                set_={"payload": payload, "created_at": now, "last_accessed_at": now}
+            )
+            await session.execute(stmt)
+
+            # Access times first, so eviction sees recent hits
+            await self._flush_touched(session)
+
+            # Drop expired entries, then trim the least recently used
+            await session.execute(
+                delete(LLMCacheEntry).where(LLMCacheEntry.created_at < now - self.ttl)
+            )
+            count = await session.scalar(select(func.count()).select_from(LLMCacheEntry))
+            overflow = count - self.max_entries
+            if overflow > 0:
+                oldest = (
+                    select(LLMCacheEntry.key)
+                    .order_by(LLMCacheEntry.last_accessed_at)
+                    .limit(overflow)
+                )
+                await session.execute(
+                    delete(LLMCacheEntry).where(LLMCacheEntry.key.in_(oldest))
+                )
+
+            await session.commit()
+
+    async def lookup(self, llm: Any, schema: Schema, prompt: str) -> Optional[Any]:
+        """Cached result for `prompt` on `llm`, or None"""
+        model, temperature = llm_identity(llm)
+        cached = await self.get(self.make_key(model, temperature, schema, prompt), schema)
+        if cached is not None:
+            self.prompt_chars_saved += len(prompt)
+        return cached
+
+    async def store(self, llm: Any, schema: Schema, prompt: str, value: Any):
+        model, temperature = llm_identity(llm)
+        await self.set(self.make_key(model, temperature, schema, prompt), model, schema, value)
+
+    async def fetch(self, llm: Any, schema: Schema, prompt: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Cached result for `prompt` on `llm`, or await `call()` and store it.
+        `call` must return an instance of `schema` (or a str).
+        """
+        cached = await self.lookup(llm, schema, prompt)
+        if cached is not None:
+            return cached
+
+        result = await call()
+        if isinstance(result, schema):
+            await self.store(llm, schema, prompt, result)
+        return result
+
+    async def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        async with ReadSessionLocal() as session:
+            entries = await session.scalar(select(func.count()).select_from(LLMCacheEntry))
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "prompt_chars_saved": self.prompt_chars_saved,
+            "entries": entries,
+            "ttl_seconds": int(self.ttl.total_seconds()),
+            "max_entries": self.max_entries,
+        }
+
+
+llm_cache = LLMResponseCache(
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES
+)
@@ -0,0 +1,113 @@
+# app/services/llm_limiter.py
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+from app.core.config import get_settings
+from app.services.rate_limiter import TokenBucket
+
+settings = get_settings()
+
+# Buckets hold this many seconds of allowance, so a cold start can't burst a whole minute's quota
+BURST_SECONDS = 10
+
+
+def token_usage(messages: List) -> Dict[str, int]:
+    """Sum the token usage providers report on a LangChain agent's AI messages"""
+    totals = {"input_tokens": 0, "output_tokens": 0}
+    for message in messages:
+        usage = getattr(message, "usage_metadata", None) or {}
+        for field in totals:
+            totals[field] += usage.get(field, 0)
+    return totals
+
+
+class ProviderLimiter:
+    """
+    Shared client-side limits for one LLM provider:
+
+      - requests per minute and tokens per minute (token buckets)
+      - at most `concurrency` calls in flight
+
+    Callers wrap each model call in `slot(estimated_tokens)`. The estimate
+    is reserved up front; once the provider reports real usage
+    (slot["tokens"]), the bucket is corrected in either direction.
+    """
+
+    def __init__(self, name: str, rpm: int, tpm: int, concurrency: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.requests = TokenBucket(rate=rpm / 60, capacity=max(1.0, rpm / 60 * BURST_SECONDS))
+        self.tokens = TokenBucket(rate=tpm / 60, capacity=max(1.0, tpm / 60 * BURST_SECONDS))
+        self.semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.seconds_waited = 0.0
+        self.tokens_used = 0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Semaphores bind to a loop; tools driven through asyncio.run get their own
+        loop = asyncio.get_running_loop()
+        semaphore = self.semaphores.get(loop)
+        if semaphore is None:
+            self.semaphores = {l: s for l, s in self.semaphores.items() if not l.is_closed()}
+            semaphore = asyncio.Semaphore(self.concurrency)
+            self.semaphores[loop] = semaphore
+        return semaphore
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int) -> AsyncIterator[Dict[str, Optional[int]]]:
+        async with self._semaphore():
+            waited = await self.requests.acquire()
+            waited += await self.tokens.acquire(estimated_tokens)
+            self.seconds_waited += waited
+
+            usage: Dict[str, Optional[int]] = {"tokens": None}
+            self.in_flight += 1
+            try:
+                yield usage
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                self.in_flight -= 1
+                self.calls += 1
+
+                used = usage["tokens"] if usage["tokens"] is not None else estimated_tokens
+                self.tokens_used += used
+                if used > estimated_tokens:
+                    self.tokens.reserve(used - estimated_tokens)  # later callers wait for the overrun
+                elif used < estimated_tokens:
+                    self.tokens.refund(estimated_tokens - used)
+
+    def stats(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "seconds_waited": round(self.seconds_waited, 2),
+            "tokens_used": self.tokens_used,
+            "requests_available": round(self.requests.available(), 2),
+            "tokens_available": round(self.tokens.available()),
+        }
+
+
+groq_limiter = ProviderLimiter(
+    name="groq",
+    rpm=settings.GROQ_RPM,
+    tpm=settings.GROQ_TPM,
+    concurrency=settings.LLM_MAX_CONCURRENCY
+)
+
+vertex_limiter = ProviderLimiter(
+    name="vertex",
+    rpm=settings.VERTEX_RPM,
+    tpm=settings.VERTEX_TPM,
+    concurrency=settings.LLM_MAX_CONCURRENCY
+)
+
+
+def llm_limiter_stats() -> Dict:
+    return {limiter.name: limiter.stats() for limiter in (groq_limiter, vertex_limiter)}
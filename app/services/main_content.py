@@ -0,0 +1,245 @@
+# app/services/main_content.py
+
+"""
+Main-content extraction: keep the job posting (or the team/people section)
+and drop cookie banners, related-job lists, legal footers and menus.
+
+Readability-style scoring on the lxml tree:
+  1. strip elements whose class/id looks like boilerplate
+  2. score every text block by length and commas, credit its parent in
+     full and its grandparent by half
+  3. scale each candidate by (1 - link density) and pick the best one,
+     plus any siblings that score close to it
+
+Falls back to the full page text when lxml is missing or the winner is
+too short to trust.
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+from app.services.text_extraction import (
+    BACKENDS, PAGE_DROP_TAGS, html_to_text, join_lines, _lxml_parse,
+)
+
+if "lxml" in BACKENDS:
+    from lxml import etree
+
+# class/id fragments that mark page chrome rather than content
+BOILERPLATE_RE = re.compile(
+    r"cookie|consent|gdpr|banner|related|similar|recommend|share|social|"
+    r"footer|legal|newsletter|subscribe|breadcrumb|sidebar|promo|advert|"
+    r"modal|popup|signup|login|menu|comment",
+    re.I
+)
+
+# Per-focus hints: which class/ids are promising, which tags count as
+# text blocks, and how short a block may be before it is ignored
+FOCUS_PROFILES: Dict[str, Dict] = {
+    "job": {
+        "positive": re.compile(
+            r"job|description|posting|vacanc|position|role|requirement|"
+            r"responsibilit|qualification|content|article|main|detail",
+            re.I
+        ),
+        "block_tags": ("p", "li", "td", "pre", "dd", "blockquote"),
+        "min_block_chars": 25,
+    },
+    "people": {
+        "positive": re.compile(
+            r"team|people|staff|leadership|management|member|author|"
+            r"bio|about|profile|person|employee|content|main",
+            re.I
+        ),
+        "block_tags": ("p", "li", "td", "dd", "h2", "h3", "h4", "h5", "span"),
+        "min_block_chars": 3,
+    },
+}
+
+TAG_WEIGHTS = {
+    "article": 10, "main": 10, "section": 5, "div": 5,
+    "pre": 3, "td": 3, "blockquote": 3,
+    "ul": -3, "ol": -3, "form": -3, "dl": -3,
+    "h1": -5, "h2": -5, "h3": -5, "th": -5,
+}
+
+NEVER_DROP = {"html", "body", "main", "article"}
+
+# Siblings of the winner are kept if they score this fraction of it
+SIBLING_THRESHOLD = 0.2
+
+# Below this many chars the winner is probably a fragment — use the full text
+MIN_MAIN_CONTENT_CHARS = 200
+
+
+class ExtractionStats:
+    """Running totals so the compression ratio can be reported on /metrics"""
+
+    def __init__(self):
+        self.pages = 0
+        self.fallbacks = 0
+        self.chars_in = 0
+        self.chars_out = 0
+
+    def record(self, chars_in: int, chars_out: int, fallback: bool):
+        self.pages += 1
+        self.fallbacks += int(fallback)
+        self.chars_in += chars_in
+        self.chars_out += chars_out
+
+    def stats(self) -> Dict:
+        return {
+            "pages": self.pages,
+            "fallbacks": self.fallbacks,
+            "chars_in": self.chars_in,
+            "chars_out": self.chars_out,
+            "compression_ratio": round(self.chars_out / self.chars_in, 3) if self.chars_in else None,
+        }
+
+
+main_content_stats = ExtractionStats()
+
+
+def _class_id(el) -> str:
+    return f"{el.get('class', '')} {el.get('id', '')}"
+
+
+def _text_len(el) -> int:
+    return len(" ".join(el.text_content().split()))
+
+
+def _link_density(el) -> float:
+    total = _text_len(el)
+    if not total:
+        return 1.0
+    linked = sum(_text_len(a) for a in el.iter("a"))
+    return min(1.0, linked / total)
+
+
+def _drop_boilerplate(doc, positive: re.Pattern):
+    total = max(_text_len(doc), 1)
+    doomed = []
+    for el in doc.iter(etree.Element):
+        if el.tag in NEVER_DROP:
+            continue
+        hints = _class_id(el)
+        if not hints.strip() or not BOILERPLATE_RE.search(hints) or positive.search(hints):
+            continue
+        # A wrapper holding most of the page is mislabelled, not boilerplate
+        if _text_len(el) > total * 0.5:
+            continue
+        doomed.append(el)
+
+    for el in doomed:
+        if el.getparent() is not None:
+            el.drop_tree()
+
+
+def _initial_score(el, positive: re.Pattern) -> float:
+    score = TAG_WEIGHTS.get(el.tag, 0)
+    hints = _class_id(el)
+    if positive.search(hints):
+        score += 25
+    if BOILERPLATE_RE.search(hints):
+        score -= 25
+    return score
+
+
+def _score_candidates(doc, profile: Dict) -> Dict:
+    positive = profile["positive"]
+    block_tags = set(profile["block_tags"])
+    scores: Dict = {}
+
+    for el in doc.iter(etree.Element):
+        is_block = el.tag in block_tags or (
+            # <div>s that hold text directly (common on job boards) act as paragraphs
+            el.tag == "div" and not any(child.tag in block_tags or child.tag == "div" for child in el)
+        )
+        if not is_block:
+            continue
+
+        text = " ".join(el.text_content().split())
+        if len(text) < profile["min_block_chars"]:
+            continue
+
+        points = 1 + text.count(",") + min(len(text) / 100, 3)
+
+        parent = el.getparent()
+        for ancestor, share in ((parent, 1.0), (parent.getparent() if parent is not None else None, 0.5)):
+            if ancestor is None:
+                continue
+            if ancestor not in scores:
+                scores[ancestor] = _initial_score(ancestor, positive)
+            scores[ancestor] += points * share
+
+    return {el: score * (1 - _link_density(el)) for el, score in scores.items()}
+
+
+def _pick_nodes(scores: Dict) -> List:
+    best = max(scores, key=scores.get)
+    best_score = scores[best]
+    parent = best.getparent()
+    if parent is None:
+        return [best]
+
+    threshold = max(10.0, best_score * SIBLING_THRESHOLD)
+    keep = []
+    for sibling in parent:
+        if sibling is best:
+            keep.append(sibling)
+        elif scores.get(sibling, 0) >= threshold:
+            keep.append(sibling)
+        elif sibling.tag == "p" and _text_len(sibling) > 80 and _link_density(sibling) < 0.25:
+            keep.append(sibling)
+    return keep
+
+
+def _lxml_main_content(html: str, drop_tags: Iterable[str], focus: str) -> Tuple[str, str]:
+    """Returns (main_text, full_text)"""
+    profile = FOCUS_PROFILES[focus]
+
+    try:
+        doc = _lxml_parse(html)
+    except etree.ParserError:
+        return "", ""
+
+    etree.strip_elements(doc, etree.Comment, *drop_tags, with_tail=False)
+    full_text = join_lines("\n".join(doc.itertext()))
+
+    _drop_boilerplate(doc, profile["positive"])
+    scores = _score_candidates(doc, profile)
+    if not scores:
+        return "", full_text
+
+    nodes = _pick_nodes(scores)
+    main_text = join_lines("\n".join(t for node in nodes for t in node.itertext()))
+    return main_text, full_text
+
+
+def extract_main_content(
+    html: str,
+    drop_tags: Iterable[str] = PAGE_DROP_TAGS,
+    focus: str = "job",
+    backend: str = "auto"
+) -> str:
+    """
+    Text of the page's main content block for `focus` ("job" or "people").
+    Returns the full page text when no convincing block is found.
+    """
+    if not html:
+        return ""
+
+    if "lxml" not in BACKENDS or backend == "bs4":
+        return html_to_text(html, drop_tags, backend=backend)
+
+    try:
+        main_text, full_text = _lxml_main_content(html, drop_tags, focus)
+    except Exception as e:
+        print(f"⚠️ Main-content extraction failed ({str(e)[:60]}), using full text")
+        return html_to_text(html, drop_tags, backend=backend)
+
+    fallback = len(main_text) < min(MIN_MAIN_CONTENT_CHARS, len(full_text))
+    text = full_text if fallback else main_text
+
+    main_content_stats.record(len(full_text), len(text), fallback)
+    return text
@@ -0,0 +1,208 @@
+# app/services/near_duplicates.py
+
+"""
+Near-duplicate job detection with MinHash LSH.
+
+Each job's title + description is reduced to word bigrams and a MinHash
+signature (NUM_PERMUTATIONS x uint32). The signature is cut into LSH
+bands; every band hashes, together with the normalized company and
+title, to a bucket stored in `job_signature_buckets`. Only listings of
+the same role at the same employer become candidates: Adzuna's short
+description snippets are mostly company boilerplate, so two different
+roles of one employer would otherwise look alike. A job joins the cluster
+whose first member (its leader) is the most similar candidate above the
+threshold; comparing against leaders only means clusters can't grow by
+chaining A ~ B ~ C into jobs unlike the leader.
+
+A lookup costs one indexed query over BANDS buckets, however large the
+table grows.
+"""
+
+import hashlib
+import random
+import re
+import struct
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.database import dialect_insert
+from app.models.job_signature import JobSignature, JobSignatureBucket
+
+settings = get_settings()
+
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS  # 16 x 4 → candidates from Jaccard ≈ 0.5 up
+
+SHINGLE_SIZE = 2
+MIN_SHINGLES = 8  # shorter texts are not fingerprinted
+
+# Rows per SELECT / INSERT — keeps bound parameters well under SQLite's limit
+CHUNK_SIZE = 200
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(1234)  # fixed seed: signatures must be stable across runs
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+JobText = Tuple[str, Optional[str], Optional[str], Optional[str]]  # (job_id, company, title, description)
+
+# Legal-form words that differ between listings of the same employer
+COMPANY_SUFFIXES = {
+    "pvt", "private", "ltd", "limited", "inc", "incorporated", "llc", "llp",
+    "corp", "corporation", "co", "company", "plc", "gmbh",
+}
+
+
+def _hash64(data: str) -> int:
+    return int.from_bytes(hashlib.blake2b(data.encode(), digest_size=8).digest(), "big")
+
+
+def _signed64(value: int) -> int:
+    """SQLite INTEGER is signed"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def normalize_company(company: Optional[str]) -> str:
+    """'Acme Technologies Pvt. Ltd.' → 'acme technologies'"""
+    tokens = TOKEN_RE.findall((company or "").lower())
+    while tokens and tokens[-1] in COMPANY_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """'Senior Python Developer (Remote)' → 'senior python developer remote'"""
+    return " ".join(TOKEN_RE.findall((title or "").lower()))
+
+
+def shingles(title: Optional[str], description: Optional[str]) -> Set[str]:
+    tokens = TOKEN_RE.findall(f"{title or ''} {description or ''}".lower())
+    return {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+
+def minhash(features: Set[str]) -> List[int]:
+    hashes = [_hash64(feature) for feature in features]
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def lsh_buckets(signature: List[int], company: str = "", title: str = "") -> List[int]:
+    """
+    One bucket per band; the band number is hashed in so bands never collide,
+    and the normalized company and title so only listings of the same role
+    at the same employer share buckets
+    """
+    return [
+        _signed64(_hash64(f"{band}:{company}:{title}:" + ",".join(map(str, signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]))))
+        for band in range(BANDS)
+    ]
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """Estimated Jaccard similarity: share of matching MinHash values"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERMUTATIONS
+
+
+def _pack(signature: List[int]) -> bytes:
+    return struct.pack(f"<{NUM_PERMUTATIONS}I", *signature)
+
+
+def _unpack(data: bytes) -> List[int]:
+    return list(struct.unpack(f"<{NUM_PERMUTATIONS}I", data))
+
+
+async def _candidates(db: AsyncSession, buckets: List[int], exclude: str) -> List[JobSignature]:
+    """Cluster leaders sharing a bucket with the job"""
+    result = await db.execute(
+        select(JobSignature)
+        .join(JobSignatureBucket, JobSignatureBucket.job_id == JobSignature.job_id)
+        .where(
+            JobSignatureBucket.bucket.in_(buckets),
+            JobSignature.job_id != exclude,
+            JobSignature.job_id == JobSignature.cluster_id
+        )
+        .distinct()
+    )
+    return list(result.scalars())
+
+
+async def assign_clusters(db: AsyncSession, jobs: Iterable[JobText]) -> Dict[str, str]:
+    """
+    Return job_id → cluster_id for `jobs`, fingerprinting and clustering
+    any that have no signature yet. Jobs in one call can cluster with
+    each other as well as with everything already indexed.
+    """
+    jobs = list({job[0]: job for job in jobs}.values())
+    clusters: Dict[str, str] = {}
+
+    ids = [job[0] for job in jobs]
+    for start in range(0, len(ids), CHUNK_SIZE):
+        result = await db.execute(
+            select(JobSignature.job_id, JobSignature.cluster_id)
+            .where(JobSignature.job_id.in_(ids[start:start + CHUNK_SIZE]))
+        )
+        clusters.update(dict(result.all()))
+
+    pending = [job for job in jobs if job[0] not in clusters]
+    if not settings.NEAR_DUPLICATE_DETECTION or not pending:
+        return {job_id: clusters.get(job_id, job_id) for job_id in ids}
+
+    now = datetime.utcnow()
+    signature_rows, bucket_rows = [], []
+    batch: Dict[int, List[Tuple[str, List[int], str]]] = {}  # bucket → this call's new jobs
+
+    for job_id, company, title, description in pending:
+        features = shingles(title, description)
+        if len(features) < MIN_SHINGLES:
+            clusters[job_id] = job_id
+            signature_rows.append({"job_id": job_id, "minhash": None, "cluster_id": job_id, "created_at": now})
+            continue
+
+        signature = minhash(features)
+        buckets = lsh_buckets(signature, normalize_company(company), normalize_title(title))
+
+        candidates = [
+            (row.cluster_id, _unpack(row.minhash))
+            for row in await _candidates(db, buckets, job_id)
+        ]
+        candidates += [  # leaders among this call's jobs
+            (cluster_id, other)
+            for bucket in buckets
+            for other_id, other, cluster_id in batch.get(bucket, [])
+            if other_id == cluster_id
+        ]
+
+        best_cluster, best_score = job_id, settings.NEAR_DUPLICATE_THRESHOLD
+        for cluster_id, other in candidates:
+            score = similarity(signature, other)
+            if score >= best_score:
+                best_cluster, best_score = cluster_id, score
+
+        clusters[job_id] = best_cluster
+        signature_rows.append({"job_id": job_id, "minhash": _pack(signature), "cluster_id": best_cluster, "created_at": now})
+        for bucket in buckets:
+            bucket_rows.append({"bucket": bucket, "job_id": job_id})
+            batch.setdefault(bucket, []).append((job_id, signature, best_cluster))
+
+    for model, rows in ((JobSignature, signature_rows), (JobSignatureBucket, bucket_rows)):
+        for start in range(0, len(rows), CHUNK_SIZE):
+            await db.execute(
+                dialect_insert(db, model).values(rows[start:start + CHUNK_SIZE]).on_conflict_do_nothing()
+            )
+    await db.commit()
+
+    duplicates = sum(1 for job in pending if clusters[job[0]] != job[0])
+    if duplicates:
+        print(f"🧬 {duplicates} of {len(pending)} newly indexed jobs are near-duplicates of other jobs")
+
+    return {job_id: clusters[job_id] for job_id in ids}
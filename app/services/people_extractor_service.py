@@ -1,6 +1,11 @@
 from langchain.agents import create_agent
 from app.schemas.hiring_manager import PeopleExtractionResponse
 from app.services.llm_service import get_llm_groq
+from app.services.llm_cache import llm_cache
+from app.services.llm_limiter import groq_limiter, token_usage
+
+# Reserved against the TPM limit until the provider reports real usage
+EXPECTED_OUTPUT_TOKENS = 300
 
 
 class LLMPeopleExtractor:
@@ -10,11 +15,11 @@ class LLMPeopleExtractor:
     """
 
     def __init__(self):
-        llm = get_llm_groq()
+        self.llm = get_llm_groq()
 
         # Create a structured-output agent
         self.agent = create_agent(
-            model=llm,
+            model=self.llm,
             response_format=PeopleExtractionResponse  # Pydantic schema
         )
 
@@ -45,16 +50,24 @@ TEXT:
 {text[:6000]}
 """
 
-        try:
-            result = self.agent.invoke({
-                "messages": [{
-                    "role": "user",
-                    "content": prompt
-                }]
-            })
-
+        async def invoke() -> PeopleExtractionResponse:
+            # Async call under the shared Groq RPM/TPM limits
+            async with groq_limiter.slot(len(prompt) // 4 + EXPECTED_OUTPUT_TOKENS) as slot:
+                result = await self.agent.ainvoke({
+                    "messages": [{
+                        "role": "user",
+                        "content": prompt
+                    }]
+                })
+                usage = token_usage(result.get("messages", []))
+                if usage["input_tokens"] or usage["output_tokens"]:
+                    slot["tokens"] = usage["input_tokens"] + usage["output_tokens"]
             return result["structured_response"]
 
+        try:
+            # Unchanged page text → cached people, no tokens spent
+            return await llm_cache.fetch(self.llm, PeopleExtractionResponse, prompt, invoke)
+
         except Exception as e:
             print(f"❌ People extraction failed: {e}")
             return PeopleExtractionResponse(people=[])
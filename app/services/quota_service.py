@@ -0,0 +1,77 @@
+# app/services/quota_service.py
+
+from datetime import datetime
+from sqlalchemy import update
+from app.database import AsyncSessionLocal, ReadSessionLocal, dialect_insert
+from app.models.api_quota import ApiQuota
+
+# Optimistic-concurrency retries before giving up on a contended bucket
+MAX_CAS_ATTEMPTS = 5
+
+
+class PersistentTokenBucket:
+    """
+    Token bucket whose state lives in the `api_quotas` table.
+
+    Every acquire is a compare-and-swap on `updated_at`, so concurrent
+    requests (and separate worker processes) share a single budget.
+    """
+
+    def __init__(self, name: str, capacity: float, refill_per_second: float):
+        self.name = name
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+
+    def _available(self, row: ApiQuota, now: datetime) -> float:
+        elapsed = max((now - row.updated_at).total_seconds(), 0.0)
+        return min(self.capacity, row.tokens + elapsed * self.refill_per_second)
+
+    async def try_acquire(self, tokens: float = 1) -> bool:
+        """
+        Take `tokens` from the bucket if available.
+
+        Returns False when the budget is exhausted (never blocks).
+        """
+
+        for _ in range(MAX_CAS_ATTEMPTS):
+            async with AsyncSessionLocal() as session:
+                row = await session.get(ApiQuota, self.name)
+                now = datetime.utcnow()
+
+                if row is None:
+                    # First use — start with a full bucket
+                    await session.execute(
+                        dialect_insert(session, ApiQuota)
+                        .values(name=self.name, tokens=self.capacity, updated_at=now)
+                        .on_conflict_do_nothing(index_elements=[ApiQuota.name])
+                    )
+                    await session.commit()
+                    continue
+
+                available = self._available(row, now)
+                if available < tokens:
+                    return False
+
+                result = await session.execute(
+                    update(ApiQuota)
+                    .where(
+                        ApiQuota.name == self.name,
+                        ApiQuota.updated_at == row.updated_at
+                    )
+                    .values(tokens=available - tokens, updated_at=now)
+                )
+                await session.commit()
+
+                if result.rowcount == 1:
+                    return True
+
+        print(f"⚠️ Quota bucket '{self.name}' is contended, treating as exhausted")
+        return False
+
+    async def remaining(self) -> float:
+        """Tokens currently available (including refill since last use)"""
+        async with ReadSessionLocal() as session:
+            row = await session.get(ApiQuota, self.name)
+            if row is None:
+                return self.capacity
+            return self._available(row, datetime.utcnow())
@@ -0,0 +1,58 @@
+# app/services/rate_limiter.py
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    In-memory token bucket for asyncio code.
+
+    `acquire` reserves tokens immediately (the balance may go negative)
+    and sleeps until the reservation is covered, so waiters are served in
+    arrival order without needing a lock. A waiter that is cancelled (or
+    timed out by wait_for) gives its reservation back.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be > 0 (got {rate})")
+        if capacity <= 0:
+            raise ValueError(f"Token bucket capacity must be > 0 (got {capacity})")
+        self.rate = rate  # tokens per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take `tokens` now and return how many seconds the caller must wait"""
+        self._refill()
+        self.tokens -= tokens
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def refund(self, tokens: float):
+        """Return tokens that were reserved but not spent"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + tokens)
+
+    async def acquire(self, tokens: float = 1) -> float:
+        """Wait until `tokens` are available; returns the seconds waited"""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.refund(tokens)
+                raise
+        return delay
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
@@ -0,0 +1,261 @@
+# app/services/resilience.py
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Collection, Dict, Optional
+import httpx
+from app.core.config import get_settings
+from app.services.domain_scheduler import registered_domain
+
+settings = get_settings()
+
+# Worth another try: the server is overloaded or a proxy hiccuped
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Network-level failures that count against a domain's breaker
+RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+class CircuitOpenError(Exception):
+    """The domain failed repeatedly; calls fail fast until its breaker resets"""
+
+    def __init__(self, domain: str, retry_in: float):
+        super().__init__(f"circuit open for {domain} (retry in {retry_in:.0f}s)")
+        self.domain = domain
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    closed    → calls go through; `failure_threshold` consecutive failures open it
+    open      → calls fail fast for `reset_seconds`
+    half-open → one probe call; success closes, failure re-opens
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.short_circuited = 0
+
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_at + self.reset_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.state == "open" and self.retry_in() == 0:
+            self.state = "half_open"
+            self.probing = False
+
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self.probing:
+            self.probing = True  # this caller is the probe
+            return True
+
+        self.short_circuited += 1
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.probing = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def record_cancelled(self):
+        """A call was cancelled before it had an outcome"""
+        if self.state == "half_open" and self.probing:
+            self.record_failure()  # the probe never reported back: stay cautious and re-open
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of traffic: every first attempt deposits
+    `ratio` tokens, every retry spends one. A small time-based trickle
+    lets a quiet process still retry. During a wide outage retries stop
+    instead of multiplying the load.
+    """
+
+    def __init__(self, ratio: float, min_per_second: float, max_tokens: float):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.updated = time.monotonic()
+        self.retries = 0
+        self.denied = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.max_tokens, self.tokens + (now - self.updated) * self.min_per_second)
+        self.updated = now
+
+    def deposit(self):
+        self._refill()
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.retries += 1
+            return True
+        self.denied += 1
+        return False
+
+
+def _retry_after(response: Optional[httpx.Response]) -> float:
+    value = response.headers.get("retry-after", "") if response is not None else ""
+    return float(value) if value.isdigit() else 0.0
+
+
+def _failed_url(response: Optional[httpx.Response], error: Optional[Exception], url: str) -> str:
+    """URL of the last hop: the final response, or the request that raised"""
+    if response is not None:
+        return str(response.url)
+    try:
+        return str(error.request.url)
+    except (AttributeError, RuntimeError):
+        return url
+
+
+class Resilience:
+    """
+    Shared retry / circuit-breaker policy for outbound HTTP.
+
+    `run(url, attempt)` calls `attempt()` (which returns an httpx.Response)
+    behind the breaker of the URL's registered domain. It retries transport
+    errors and RETRYABLE_STATUSES with exponential backoff and full jitter,
+    honouring Retry-After, while the global budget allows. The last
+    response is returned as-is, so callers keep their own status handling.
+
+    Callers with a metered API can narrow `retry_statuses` and pass
+    `before_retry`, awaited before every retry: it charges the meter and
+    returns False to stop retrying.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        budget: RetryBudget,
+        failure_threshold: int,
+        reset_seconds: float
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget = budget
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        domain = registered_domain(url)
+        breaker = self.breakers.get(domain)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_seconds)
+            self.breakers[domain] = breaker
+        return breaker
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        return min(self.backoff_max, max(delay, _retry_after(response)))
+
+    async def run(
+        self,
+        url: str,
+        attempt: Callable[[], Awaitable[httpx.Response]],
+        max_attempts: Optional[int] = None,
+        retry_statuses: Collection[int] = RETRYABLE_STATUSES,
+        before_retry: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> httpx.Response:
+        breaker = self.breaker(url)
+        max_attempts = max_attempts or self.max_attempts
+        self.budget.deposit()
+
+        for attempt_no in range(max_attempts):
+            if not breaker.allow():
+                raise CircuitOpenError(registered_domain(url), breaker.retry_in())
+
+            response, error = None, None
+            try:
+                response = await attempt()
+            except RETRYABLE_ERRORS as e:
+                error = e
+            except asyncio.CancelledError:
+                breaker.record_cancelled()
+                raise
+            except BaseException:
+                # Not retryable, but still a failed call — and it must release a half-open probe
+                breaker.record_failure()
+                raise
+
+            # Redirects: charge the hop that actually failed, not the link's domain
+            failed = _failed_url(response, error, url)
+            if registered_domain(failed) != registered_domain(url):
+                breaker.record_success()
+                breaker = self.breaker(failed)
+
+            if error is None and response.status_code not in retry_statuses:
+                breaker.record_success()
+                return response
+
+            breaker.record_failure()
+            breaker = self.breaker(url)
+
+            last_attempt = attempt_no + 1 == max_attempts
+            if last_attempt or not self.budget.withdraw() or (before_retry and not await before_retry()):
+                if error is not None:
+                    raise error
+                return response
+
+            delay = self._backoff(attempt_no, response)
+            reason = type(error).__name__ if error is not None else f"HTTP {response.status_code}"
+            print(f"  ↳ 🔁 {reason} from {registered_domain(failed)}, retry {attempt_no + 1} in {delay:.1f}s")
+
+            if response is not None:
+                await response.aclose()  # release the connection before waiting
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict:
+        return {
+            "retry_budget": {
+                "tokens": round(self.budget.tokens, 2),
+                "retries": self.budget.retries,
+                "denied": self.budget.denied,
+            },
+            "breakers": {
+                domain: {
+                    "state": breaker.state,
+                    "consecutive_failures": breaker.failures,
+                    "short_circuited": breaker.short_circuited,
+                    "retry_in_seconds": round(breaker.retry_in(), 1) if breaker.state == "open" else 0,
+                }
+                for domain, breaker in self.breakers.items()
+                if breaker.state != "closed" or breaker.failures or breaker.short_circuited
+            },
+        }
+
+
+resilience = Resilience(
+    max_attempts=settings.RETRY_MAX_ATTEMPTS,
+    backoff_base=settings.RETRY_BACKOFF_BASE_SECONDS,
+    backoff_max=settings.RETRY_BACKOFF_MAX_SECONDS,
+    budget=RetryBudget(
+        ratio=settings.RETRY_BUDGET_RATIO,
+        min_per_second=settings.RETRY_BUDGET_MIN_PER_SECOND,
+        max_tokens=settings.RETRY_BUDGET_MAX_TOKENS
+    ),
+    failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+    reset_seconds=settings.BREAKER_RESET_SECONDS
+)
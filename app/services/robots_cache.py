@@ -0,0 +1,195 @@
+# app/services/robots_cache.py
+
+import asyncio
+import re
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+import httpx
+from app.core.config import get_settings
+from app.services.domain_scheduler import domain_scheduler, registered_domain
+from app.services.http_clients import http_clients
+from app.services.resilience import resilience
+
+settings = get_settings()
+
+# RFC 9309: crawlers may ignore anything past the first 500 KiB
+MAX_ROBOTS_BYTES = 500 * 1024
+
+# Expired entries are pruned once the cache holds this many hosts
+MAX_CACHED_HOSTS = 10000
+
+
+class _PatternRule:
+    """
+    RFC 9309 rule line: '*' matches any run of characters, a trailing '$'
+    anchors the end. RobotFileParser only does plain prefix matching.
+    Paths arrive percent-quoted, so the wildcards show up as %2A / %24.
+    """
+
+    def __init__(self, rule):
+        self.path = rule.path
+        self.allowance = rule.allowance
+
+        pattern = re.escape(self.path).replace("%2A", ".*")
+        if pattern.endswith("%24"):
+            pattern = pattern[:-3] + "$"
+        self.regex = re.compile(pattern)
+
+    def applies_to(self, filename: str) -> bool:
+        return self.regex.match(filename) is not None
+
+
+def _longest_match_first(parser: RobotFileParser):
+    """
+    RFC 9309: the most specific (longest) matching rule wins and Allow wins
+    ties. RobotFileParser returns the first match, so sort each group.
+    """
+    entries = list(parser.entries)
+    if parser.default_entry is not None:
+        entries.append(parser.default_entry)
+
+    for entry in entries:
+        entry.rulelines = sorted(
+            (_PatternRule(rule) for rule in entry.rulelines),
+            key=lambda rule: (-len(rule.path), not rule.allowance)
+        )
+
+
+class RobotsCache:
+    """
+    Per-origin robots.txt cache shared by the scraper and the tools.
+
+    - parsed with urllib.robotparser (user-agent groups, Crawl-delay), with
+      rules re-ordered for RFC 9309 longest-match and '*' / '$' wildcards
+    - each origin is fetched at most once per TTL; failed fetches are
+      remembered for a shorter TTL
+    - concurrent lookups for the same origin wait on a single fetch
+    - 401/403 disallow everything, other 4xx allow everything (as
+      RobotFileParser.read does); 5xx and network errors allow, like
+      the old tool did
+    """
+
+    def __init__(self, ttl_seconds: int, error_ttl_seconds: int, user_agent: str):
+        self.ttl = ttl_seconds
+        self.error_ttl = error_ttl_seconds
+        self.user_agent = user_agent
+
+        self.entries: Dict[str, Tuple[RobotFileParser, float]] = {}
+        self.inflight: Dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.fetches = 0
+        self.coalesced = 0
+        self.blocked = 0
+
+    # ------------------------------------------------------
+    #  FETCH + PARSE
+    # ------------------------------------------------------
+    async def _fetch(self, origin: str, client: Optional[httpx.AsyncClient]) -> RobotFileParser:
+        self.fetches += 1
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        ttl = self.ttl
+
+        try:
+            client = client or http_clients.get("scraping")
+            # One attempt: a failure here still counts toward the domain's breaker
+            response = await resilience.run(parser.url, lambda: client.get(parser.url), max_attempts=1)
+
+            if response.status_code in (401, 403):
+                parser.disallow_all = True
+            elif 400 <= response.status_code < 500:
+                parser.allow_all = True
+            elif response.status_code != 200:
+                parser.allow_all = True
+                ttl = self.error_ttl
+            else:
+                body = response.content[:MAX_ROBOTS_BYTES]
+                parser.parse(body.decode("utf-8", errors="replace").splitlines())
+                _longest_match_first(parser)
+                self._apply_crawl_delay(origin, parser)
+
+        except Exception as e:
+            print(f"⚠️ robots.txt fetch failed for {origin}: {str(e)[:60]}")
+            parser.allow_all = True
+            ttl = self.error_ttl
+
+        parser.modified()
+        self._prune()
+        self.entries[origin] = (parser, time.monotonic() + ttl)
+        return parser
+
+    def _apply_crawl_delay(self, origin: str, parser: RobotFileParser):
+        """Honour Crawl-delay unless the domain already has an explicit limit"""
+        delay = parser.crawl_delay(self.user_agent)
+        domain = registered_domain(origin)
+        if not delay or domain in domain_scheduler.limits:
+            return
+        rate = 1 / float(delay)
+        if rate < domain_scheduler.default_rate:
+            domain_scheduler.register(domain, rate=rate, burst=1)
+
+    def _prune(self):
+        if len(self.entries) < MAX_CACHED_HOSTS:
+            return
+        now = time.monotonic()
+        for origin in [o for o, (_, expires) in self.entries.items() if expires <= now]:
+            del self.entries[origin]
+
+    async def _parser_for(self, origin: str, client: Optional[httpx.AsyncClient]) -> RobotFileParser:
+        cached = self.entries.get(origin)
+        if cached is not None and cached[1] > time.monotonic():
+            self.hits += 1
+            return cached[0]
+
+        loop = asyncio.get_running_loop()
+        task = self.inflight.get(origin)
+
+        # Tasks from another loop (tools use asyncio.run) cannot be awaited here
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._fetch(origin, client))
+            self.inflight[origin] = task
+            task.add_done_callback(
+                lambda t, o=origin: self.inflight.pop(o, None) if self.inflight.get(o) is t else None
+            )
+        else:
+            self.coalesced += 1
+
+        # shield: one cancelled waiter must not cancel the fetch the others share
+        return await asyncio.shield(task)
+
+    # ------------------------------------------------------
+    #  PUBLIC
+    # ------------------------------------------------------
+    async def allowed(self, url: str, client: Optional[httpx.AsyncClient] = None) -> bool:
+        """
+        Whether robots.txt lets us fetch `url`. Pass the caller's client so
+        the robots.txt request shares its headers and politeness hooks.
+        """
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.netloc:
+            return True
+
+        parser = await self._parser_for(f"{parsed.scheme}://{parsed.netloc}", client)
+        ok = parser.can_fetch(self.user_agent, url)
+        if not ok:
+            self.blocked += 1
+        return ok
+
+    def stats(self) -> Dict:
+        return {
+            "hosts": len(self.entries),
+            "hits": self.hits,
+            "fetches": self.fetches,
+            "coalesced": self.coalesced,
+            "blocked": self.blocked,
+            "ttl_seconds": self.ttl,
+        }
+
+
+robots_cache = RobotsCache(
+    ttl_seconds=settings.ROBOTS_CACHE_TTL_SECONDS,
+    error_ttl_seconds=settings.ROBOTS_ERROR_TTL_SECONDS,
+    user_agent=settings.ROBOTS_USER_AGENT
+)
@@ -1,9 +1,65 @@
 # app/services/scraper_service.py
 
 import httpx
-from bs4 import BeautifulSoup
-import asyncio
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
+from app.core.config import get_settings
+from app.services.http_cache import http_cache
+from app.services.http_clients import http_clients
+from app.services.main_content import extract_main_content
+from app.services.resilience import resilience, CircuitOpenError
+from app.services.robots_cache import robots_cache
+from app.services.text_extraction import html_to_text, VisibleTextCounter, JD_DROP_TAGS, PAGE_DROP_TAGS
+
+settings = get_settings()
+
+# Cached text is keyed by mode, so switching extraction never serves stale text
+JD_MODE = "jd-main" if settings.MAIN_CONTENT_EXTRACTION else "jd"
+TEXT_MODE = "text-main" if settings.MAIN_CONTENT_EXTRACTION else "text"
+
+# Anything else (PDFs, images, archives) is skipped before the body is read
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain", "text/xml", "application/xml")
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Process-wide download counters, reported on /metrics
+download_stats: Dict[str, int] = {
+    "bytes_read": 0,
+    "rejected": 0,
+    "truncated": 0,
+    "stopped_early": 0,
+}
+
+
+class UnsupportedResponse(Exception):
+    """Response refused from its headers: not text, or absurdly large"""
+
+
+class RobotsDisallowed(Exception):
+    """robots.txt forbids fetching this URL"""
+
+
+def _check_headers(response: httpx.Response):
+    content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type and not content_type.startswith(TEXT_CONTENT_TYPES):
+        raise UnsupportedResponse(f"non-text content ({content_type})")
+
+    length = response.headers.get("content-length", "")
+    if length.isdigit() and int(length) > settings.SCRAPE_MAX_CONTENT_LENGTH:
+        raise UnsupportedResponse(f"too large ({int(length) // (1024 * 1024)} MiB)")
+
+
+def _clean_job_description(html: str) -> str:
+    if settings.MAIN_CONTENT_EXTRACTION:
+        text = extract_main_content(html, JD_DROP_TAGS, focus="job", backend=settings.HTML_TEXT_BACKEND)
+    else:
+        text = html_to_text(html, JD_DROP_TAGS, backend=settings.HTML_TEXT_BACKEND)
+    return text[:5000]
+
+
+def _clean_page_text(html: str) -> str:
+    if settings.MAIN_CONTENT_EXTRACTION:
+        return extract_main_content(html, PAGE_DROP_TAGS, focus="people", backend=settings.HTML_TEXT_BACKEND)
+    return html_to_text(html, PAGE_DROP_TAGS, backend=settings.HTML_TEXT_BACKEND)
 
 
 class JobScraperService:
@@ -14,53 +70,151 @@ class JobScraperService:
     """
 
     def __init__(self):
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Connection": "keep-alive",
-        }
-
-        # Persistent client for multiple requests
-        self.client = httpx.AsyncClient(
-            headers=self.headers,
-            timeout=15.0,
-            follow_redirects=True
-        )
+        # Shared pooled client from the registry (browser headers, politeness hooks)
+        self.client = http_clients.get("scraping")
 
     # ------------------------------------------------------
-    #  SCRAPE JOB DESCRIPTION (from job apply links)
+    #  STREAMING DOWNLOAD
     # ------------------------------------------------------
-    async def fetch_job_description(self, url: str) -> Optional[str]:
+    @staticmethod
+    async def _read_capped(response: httpx.Response) -> Tuple[bytes, bool]:
         """
-        Fetch a job description from a job posting URL.
-        Used for Adzuna job links.
+        Read the body in chunks: never more than SCRAPE_MAX_BYTES, and stop
+        as soon as SCRAPE_TEXT_TARGET_CHARS of visible text have arrived.
+
+        Returns (body, partial) — partial is True when reading stopped
+        before the end of the response.
         """
+        counter = VisibleTextCounter()
+        chunks, size = [], 0
+        partial = False
+
+        async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+            chunk = chunk[:settings.SCRAPE_MAX_BYTES - size]
+            chunks.append(chunk)
+            size += len(chunk)
+
+            if size >= settings.SCRAPE_MAX_BYTES:
+                download_stats["truncated"] += 1
+                partial = True
+                break
+            if counter.feed(chunk) >= settings.SCRAPE_TEXT_TARGET_CHARS:
+                download_stats["stopped_early"] += 1
+                partial = True
+                break
+
+        download_stats["bytes_read"] += size
+        return b"".join(chunks), partial
 
-        try:
-            response = await self.client.get(url)
+    # ------------------------------------------------------
+    #  CACHED FETCH + EXTRACT
+    # ------------------------------------------------------
+    async def _fetch_clean_text(
+        self,
+        url: str,
+        mode: str,
+        extract: Callable[[str], str]
+    ) -> Optional[str]:
+        """
+        Return cleaned text for `url`, going through the HTTP cache:
+
+          fresh entry        → cached text (no network, no parsing)
+          stale entry        → conditional GET; 304 reuses the cached body
+          miss / changed     → streamed GET, body and text stored
+
+        Raises httpx.HTTPStatusError for non-200 responses,
+        UnsupportedResponse for non-text or oversized ones,
+        RobotsDisallowed when robots.txt forbids the URL and
+        CircuitOpenError while the domain's breaker is open.
+        Transient failures (429/5xx, timeouts) are retried by `resilience`.
+        """
+
+        if settings.RESPECT_ROBOTS_TXT and not await robots_cache.allowed(url, self.client):
+            raise RobotsDisallowed(url)
+
+        entry = await http_cache.lookup(url)
+        if entry is not None and not http_cache.has_body(entry):
+            entry = None  # body was evicted — validators are useless
+
+        if entry is not None and http_cache.is_fresh(entry):
+            await http_cache.mark_fresh(entry, served_from_cache=True)
+        else:
+            request = self.client.build_request("GET", url, headers=http_cache.conditional_headers(entry))
+            response = await resilience.run(url, lambda: self.client.send(request, stream=True))
+            try:
+                if response.status_code == 304 and entry is not None:
+                    body, partial = None, False
+                else:
+                    if response.status_code != 200:
+                        raise httpx.HTTPStatusError(
+                            f"HTTP {response.status_code}", request=response.request, response=response
+                        )
+                    try:
+                        _check_headers(response)
+                    except UnsupportedResponse:
+                        download_stats["rejected"] += 1
+                        raise
+                    body, partial = await self._read_capped(response)
+            finally:
+                await response.aclose()
+
+            if body is None:
+                await http_cache.mark_fresh(entry, served_from_cache=False)
+            else:
+                entry = await http_cache.store(url, response, body, partial=partial)
+                text = extract(body.decode(response.encoding or "utf-8", errors="replace"))
+                http_cache.write_text(entry, mode, text)
+                return text
+
+        # Served from cache: reuse the cleaned text, or parse the cached body once
+        text = http_cache.read_text(entry, mode)
+        if text is None:
+            text = extract(http_cache.read_html(entry))
+            http_cache.write_text(entry, mode, text)
+        return text
+
+    # ------------------------------------------------------
+    #  SCRAPE JOB DESCRIPTION (from job apply links)
+    # ------------------------------------------------------
+    async def fetch_job_description_result(self, url: str) -> Tuple[Optional[str], str]:
+        """
+        Fetch a job description and say why it failed, if it did.
 
-            if response.status_code != 200:
-                print(f"  ↳ ❌ HTTP {response.status_code}")
-                return None
+        Returns (description, status) where status is "ok", "empty",
+        "robots_blocked", "circuit_open", "http_<code>", "unsupported" or "error".
+        """
 
-            soup = BeautifulSoup(response.text, "html.parser")
+        try:
+            cleaned = await self._fetch_clean_text(url, JD_MODE, _clean_job_description)
+            return (cleaned, "ok") if cleaned else (None, "empty")
 
-            # Remove irrelevant elements
-            for tag in soup(["script", "style", "nav", "header", "footer", "aside", "iframe", "noscript"]):
-                tag.decompose()
+        except httpx.HTTPStatusError as e:
+            print(f"  ↳ ❌ HTTP {e.response.status_code}")
+            return None, f"http_{e.response.status_code}"
 
-            text = soup.get_text(separator="\n", strip=True)
-            lines = [line.strip() for line in text.splitlines() if line.strip()]
-            cleaned = "\n".join(lines)
+        except UnsupportedResponse as e:
+            print(f"  ↳ ⏭️ Skipped: {e}")
+            return None, "unsupported"
 
-            await asyncio.sleep(1)  # avoid rate limit
+        except RobotsDisallowed:
+            print("  ↳ 🤖 Blocked by robots.txt")
+            return None, "robots_blocked"
 
-            return cleaned[:5000] if cleaned else None
+        except CircuitOpenError as e:
+            print(f"  ↳ ⛔ Skipped: {e}")
+            return None, "circuit_open"
 
         except Exception as e:
             print(f"  ↳ ❌ Scrape Error: {str(e)[:80]}")
-            return None
+            return None, "error"
+
+    async def fetch_job_description(self, url: str) -> Optional[str]:
+        """
+        Fetch a job description from a job posting URL.
+        Used for Adzuna job links.
+        """
+        description, _ = await self.fetch_job_description_result(url)
+        return description
 
     # ------------------------------------------------------
     #  SCRAPE GENERAL WEB TEXT (for hiring manager pages)
@@ -72,22 +226,8 @@ class JobScraperService:
         """
 
         try:
-            response = await self.client.get(url)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            for tag in soup(["script", "style", "nav", "header", "footer", "noscript"]):
-                tag.decompose()
-
-            text = soup.get_text(separator="\n")
-            lines = [line.strip() for line in text.splitlines() if line.strip()]
-
-            return "\n".join(lines)
+            return await self._fetch_clean_text(url, TEXT_MODE, _clean_page_text)
 
         except Exception as e:
             print(f"❌ Error scraping {url}: {e}")
             return ""
-
-    async def close(self):
-        await self.client.aclose()
@@ -0,0 +1,149 @@
+# app/services/skill_engine.py
+
+"""
+Compiled multi-skill matcher with synonyms.
+
+Every skill and alias in SKILL_TAXONOMY is folded into a character trie
+and emitted as ONE regex (shared prefixes are factored out, so "react",
+"react.js" and "reactjs" cost a single branch). A description is scanned
+once, whatever the number of skills, and each hit is mapped back to its
+canonical skill: "postgres" → "postgresql", "k8s" → "kubernetes".
+
+Word boundaries allow symbols inside skills ("c++", "c#", ".net",
+"node.js"), and the longest alias wins ("angular js" over "angular").
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set, Tuple
+
+# canonical skill → aliases (matching is case-insensitive; spaces also match hyphens)
+SKILL_TAXONOMY: Dict[str, List[str]] = {
+    "python": ["python3"],
+    "django": [],
+    "flask": [],
+    "fastapi": ["fast api"],
+    "celery": [],
+    "java": [],
+    "c++": ["cpp"],
+    "c#": ["csharp"],
+    ".net": ["dotnet"],
+    "javascript": ["js", "ecmascript", "es6"],
+    "typescript": [],
+    "react": ["reactjs", "react.js"],
+    "angular": ["angularjs", "angular.js", "angular js"],
+    "vue": ["vuejs", "vue.js"],
+    "node.js": ["nodejs", "node js"],
+    "next.js": ["nextjs"],
+    "html": ["html5"],
+    "css": ["css3"],
+    "graphql": [],
+    "rest api": ["rest apis", "restful", "restful api", "restful apis", "restful services"],
+    "postgresql": ["postgres", "psql"],
+    "mysql": [],
+    "sqlite": ["sqlite3"],
+    "mongodb": ["mongo"],
+    "redis": [],
+    "kafka": ["apache kafka"],
+    "rabbitmq": [],
+    "aws": ["amazon web services"],
+    "ec2": ["amazon ec2"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "azure": ["microsoft azure"],
+    "docker": [],
+    "kubernetes": ["k8s"],
+    "terraform": [],
+    "ci/cd": ["cicd", "ci cd"],
+    "linux": [],
+    "git": [],
+    "github": [],
+    "machine learning": ["ml"],
+}
+
+# Characters that glue onto a skill name: "c++" must not match inside "c+++", ".net" not inside "asp.net"
+_BEFORE = r"(?<![\w.])"
+_AFTER = r"(?![\w+#])"
+_SEPARATOR_RE = re.compile(r"[\s\-]+")
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase and collapse whitespace/hyphens to one space"""
+    return _SEPARATOR_RE.sub(" ", skill.strip().lower())
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    trie: Dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end of a phrase
+
+    def emit(node: Dict) -> str:
+        branches = [
+            (r"[\s\-]+" if char == " " else re.escape(char)) + emit(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Greedy optional: the longer alias is tried first
+            return ("(?:" + body + ")?") if len(body) > 1 else body + "?"
+        return body
+
+    return emit(trie)
+
+
+class SkillEngine:
+    """One compiled pattern for a whole taxonomy; build once, reuse everywhere"""
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]]):
+        self.aliases: Dict[str, str] = {}
+        for canonical, aliases in taxonomy.items():
+            canonical = normalize_skill(canonical)
+            for alias in (canonical, *aliases):
+                self.aliases[normalize_skill(alias)] = canonical
+
+        self.pattern = re.compile(_BEFORE + _trie_pattern(self.aliases) + _AFTER)
+
+    def canonical(self, skill: str) -> str:
+        skill = normalize_skill(skill)
+        return self.aliases.get(skill, skill)
+
+    def match(self, text: str) -> Set[str]:
+        """Canonical skills mentioned in `text`"""
+        return {
+            self.aliases[_SEPARATOR_RE.sub(" ", found)]
+            for found in self.pattern.findall(text.lower())
+        }
+
+    def match_batch(self, texts: Iterable[str], skills: List[str]) -> List[List[bool]]:
+        """
+        Job × skill matrix: row i, column j is True when text i mentions
+        skills[j] (under any alias). Each text is scanned once.
+        """
+        columns = [self.canonical(skill) for skill in skills]
+        rows = []
+        for text in texts:
+            found = self.match(text)
+            rows.append([column in found for column in columns])
+        return rows
+
+
+skill_engine = SkillEngine(SKILL_TAXONOMY)
+
+
+@lru_cache(maxsize=32)
+def _engine_with(extra: Tuple[str, ...]) -> SkillEngine:
+    return SkillEngine({**SKILL_TAXONOMY, **{skill: [] for skill in extra}})
+
+
+def engine_for(skills: Iterable[str]) -> SkillEngine:
+    """The shared engine, extended (and cached) when `skills` has names outside the taxonomy"""
+    extra = tuple(sorted({
+        normalize_skill(skill) for skill in skills
+        if normalize_skill(skill) not in skill_engine.aliases
+    }))
+    return _engine_with(extra) if extra else skill_engine
@@ -1,56 +1,259 @@
 # app/services/skill_matcher_service.py
 
+import asyncio
 from langchain_google_vertexai import ChatVertexAI
 from langchain.agents import create_agent
-from app.schemas.job import SkillMatchResult
-from typing import List
+from app.core.config import get_settings
+from app.schemas.job import SkillMatchResult, BatchSkillMatchResult
+from typing import Dict, List, Optional
 from app.services.llm_service import get_llm_groq
+from app.services.llm_cache import llm_cache
+from app.services.llm_limiter import groq_limiter, token_usage
+from app.tools.skill_matcher import score_skills
+
+settings = get_settings()
 
 
 # Your constant skills
 YOUR_SKILLS = [
-    "python", "django", "flask", "fastapi","react"
+    "python", "django", "flask", "fastapi",
     "postgresql", "sqlite", "aws", "docker",
     "react", "javascript", "git", "rest api", "angular js", "github", "ec2","typescript"
 ]
 
 
+# JD characters the per-job prompt includes
+PROMPT_JD_CHARS = 3000
+
+
+def llm_visible_text(job_description: str) -> str:
+    """The part of a JD the LLM is shown (batched prompts truncate harder)"""
+    limit = settings.SKILL_BATCH_JD_CHARS if settings.SKILL_BATCH_ENABLED else PROMPT_JD_CHARS
+    return job_description[:limit]
+
+
+def prefilter_match(
+    job_description: str,
+    min_match_score: int,
+    reject_margin: int,
+    accept_margin: int = 0
+) -> Optional[SkillMatchResult]:
+    """
+    Score the JD locally against YOUR_SKILLS (skill engine, no LLM).
+
+    The local score is the LLM's own metric — the percentage of YOUR_SKILLS
+    the JD mentions — computed on the same truncated text the LLM sees.
+    Regex only finds explicit mentions (aliases included), so it is close
+    to a lower bound of the LLM's score: a JD is accepted once the local
+    score reaches min_match_score + accept_margin, but rejected only when
+    it is more than `reject_margin` points below min_match_score. Anything
+    in between returns None and goes to the LLM.
+    """
+    local = score_skills(llm_visible_text(job_description), YOUR_SKILLS)
+    score = local["match_score"]
+
+    if min_match_score - reject_margin <= score < min_match_score + accept_margin:
+        return None
+
+    return SkillMatchResult(
+        matched_skills=local["matched"],
+        missing_skills=local["missing"],
+        match_score=score
+    )
+
+
+# Rough token estimates for batch packing (~4 chars per token)
+CHARS_PER_TOKEN = 4
+BATCH_HEADER_TOKENS = 150
+RESPONSE_TOKENS_PER_JOB = 120
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
 class SkillMatcherService:
     """
     Match job descriptions against your skills using LLM
     Returns structured Pydantic output
+
+      match_job(jd)    one JD per call
+      match_jobs(jds)  several truncated JDs per call, packed by a token
+                       budget; jobs missing from a batch answer (or a
+                       failed batch) fall back to match_job
     """
     
     def __init__(self):
         
-        llm = get_llm_groq()
+        self.llm = get_llm_groq()
         
         # Create agent with structured output
         self.agent = create_agent(
-            model=llm,
+            model=self.llm,
             response_format=SkillMatchResult  # Pydantic model
         )
+        self.batch_agent = create_agent(
+            model=self.llm,
+            response_format=BatchSkillMatchResult
+        )
+
+        # LLM round trips and tokens spent by this instance
+        self.usage = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+
+    async def _invoke(self, agent, prompt: str, expected_output_tokens: int = RESPONSE_TOKENS_PER_JOB):
+        # Async call under the shared Groq RPM/TPM limits — never blocks the event loop
+        async with groq_limiter.slot(_estimate_tokens(prompt) + expected_output_tokens) as slot:
+            result = await agent.ainvoke({
+                "messages": [{
+                    "role": "user",
+                    "content": prompt
+                }]
+            })
+
+            usage = token_usage(result.get("messages", []))
+            if usage["input_tokens"] or usage["output_tokens"]:
+                slot["tokens"] = usage["input_tokens"] + usage["output_tokens"]
+
+        self.usage["calls"] += 1
+        for field, count in usage.items():
+            self.usage[field] += count
+
+        # Returns the agent's response_format Pydantic model
+        return result["structured_response"]
+
+    @staticmethod
+    def _prompt(job_description: str) -> str:
+        return f"""My skills: {', '.join(YOUR_SKILLS)}
+
+            Job description:
+            {job_description[:PROMPT_JD_CHARS]}
+
+            Analyze which of MY skills are mentioned in this job.
+            Calculate match score as percentage of my skills that match.
+            Return matched skills, missing skills, and score."""
+
+    @staticmethod
+    def _batch_prompt(job_descriptions: List[str]) -> str:
+        jobs = "\n\n".join(
+            f"### JOB {idx}\n{jd[:settings.SKILL_BATCH_JD_CHARS]}"
+            for idx, jd in enumerate(job_descriptions, 1)
+        )
+        return f"""My skills: {', '.join(YOUR_SKILLS)}
+
+            Below are {len(job_descriptions)} job descriptions, each starting with a line "### JOB <id>".
+            For EACH job separately, analyze which of MY skills are mentioned in it.
+            Calculate match score as percentage of my skills that match.
+            Return one result per job: its job_id, matched skills, missing skills, and score.
+
+{jobs}"""
+
+    @classmethod
+    def _batch_cache_prompt(cls, job_description: str) -> str:
+        """
+        Cache key text for a JD scored inside a batch: the batch template with
+        this JD alone, truncated as it was sent. Kept apart from the per-job
+        prompt, which the model never saw for this answer.
+        """
+        return cls._batch_prompt([job_description])
     
     async def match_job(self, job_description: str) -> SkillMatchResult:
         """
         Match job against your skills
         
         Returns Pydantic model: SkillMatchResult
+        (served from the LLM cache when this JD was scored before)
         """
         
-        result = self.agent.invoke({
-            "messages": [{
-                "role": "user",
-                "content": f"""My skills: {', '.join(YOUR_SKILLS)}
+        prompt = self._prompt(job_description)
+        return await llm_cache.fetch(
+            self.llm, SkillMatchResult, prompt, lambda: self._invoke(self.agent, prompt)
+        )
 
-            Job description:
-            {job_description[:3000]}
+    # ------------------------------------------------------
+    #  BATCHED MATCHING
+    # ------------------------------------------------------
+    async def cached_matches(self, jobs: Dict[str, str]) -> Dict[str, SkillMatchResult]:
+        """Results already in the LLM cache (per-job answers first, then batched ones), by job id"""
+        cached = {}
+        for job_id, jd in jobs.items():
+            result = await llm_cache.lookup(self.llm, SkillMatchResult, self._prompt(jd))
+            if result is None:
+                result = await llm_cache.lookup(self.llm, SkillMatchResult, self._batch_cache_prompt(jd))
+            if result is not None:
+                cached[job_id] = result
+        return cached
 
-            Analyze which of MY skills are mentioned in this job.
-            Calculate match score as percentage of my skills that match.
-            Return matched skills, missing skills, and score."""
-                        }]
-                    })
-        
-        # Returns SkillMatchResult Pydantic model
-        return result["structured_response"]
+    @staticmethod
+    def plan_batches(jobs: Dict[str, str]) -> List[Dict[str, str]]:
+        """
+        Split jobs into batches whose estimated prompt + response tokens
+        stay within SKILL_BATCH_TOKEN_BUDGET (and SKILL_BATCH_MAX_JOBS).
+        """
+        batches, batch, tokens = [], {}, BATCH_HEADER_TOKENS
+
+        for job_id, jd in jobs.items():
+            cost = _estimate_tokens(jd[:settings.SKILL_BATCH_JD_CHARS]) + RESPONSE_TOKENS_PER_JOB
+            if batch and (tokens + cost > settings.SKILL_BATCH_TOKEN_BUDGET or len(batch) >= settings.SKILL_BATCH_MAX_JOBS):
+                batches.append(batch)
+                batch, tokens = {}, BATCH_HEADER_TOKENS
+            batch[job_id] = jd
+            tokens += cost
+
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def match_batch(self, batch: Dict[str, str]) -> Dict[str, SkillMatchResult]:
+        """
+        One structured-output call for the whole batch. Jobs the model
+        skipped — or all of them, if the call fails — are matched one by
+        one. Batch answers are cached under a batch key (the truncated JD
+        in the batch template), fallbacks under the per-job key; jobs that
+        still fail are absent from the returned dict.
+        """
+        job_ids = list(batch)
+        results: Dict[str, SkillMatchResult] = {}
+
+        if len(job_ids) > 1:
+            try:
+                response = await self._invoke(
+                    self.batch_agent,
+                    self._batch_prompt(list(batch.values())),
+                    expected_output_tokens=RESPONSE_TOKENS_PER_JOB * len(job_ids)
+                )
+                for item in response.results:
+                    idx = int(item.job_id) if item.job_id.strip().isdigit() else 0
+                    if 1 <= idx <= len(job_ids) and job_ids[idx - 1] not in results:
+                        results[job_ids[idx - 1]] = SkillMatchResult(**item.model_dump(exclude={"job_id"}))
+            except Exception as e:
+                print(f"    ↳ ⚠️ Batch of {len(job_ids)} failed, matching one by one: {str(e)[:80]}")
+            else:
+                if len(results) < len(job_ids):
+                    print(f"    ↳ ⚠️ {len(job_ids) - len(results)}/{len(job_ids)} jobs missing from batch answer, matching one by one")
+
+            for job_id, result in results.items():
+                await llm_cache.store(self.llm, SkillMatchResult, self._batch_cache_prompt(batch[job_id]), result)
+
+        missing = [job_id for job_id in job_ids if job_id not in results]
+
+        async def fallback(job_id: str):
+            try:
+                results[job_id] = await self.match_job(batch[job_id])
+            except Exception as e:
+                print(f"    ↳ ❌ Error: {str(e)[:50]}")  # left out of results → reported as failed
+
+        await asyncio.gather(*(fallback(job_id) for job_id in missing))
+        return results
+
+    async def match_jobs(self, jobs: Dict[str, str]) -> Dict[str, SkillMatchResult]:
+        """
+        Match many JDs (job id → JD) with as few LLM calls as the token
+        budget allows. Returns job id → SkillMatchResult (failed jobs absent).
+        """
+        results = await self.cached_matches(jobs)
+        pending = {job_id: jd for job_id, jd in jobs.items() if job_id not in results}
+
+        # Batches run concurrently; groq_limiter keeps them within provider limits
+        for batch_results in await asyncio.gather(*(self.match_batch(batch) for batch in self.plan_batches(pending))):
+            results.update(batch_results)
+        return results
@@ -0,0 +1,266 @@
+# app/services/task_queue.py
+
+import asyncio
+import os
+import socket
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.automation_task import AutomationTask
+from app.services.automation_pipeline import run_full_automation
+
+settings = get_settings()
+
+
+class AutomationTaskQueue:
+    """
+    Durable queue for full automation runs.
+
+    Tasks are rows in `automation_tasks`; an in-process pool of workers
+    claims queued rows with a conditional UPDATE, so a task is only ever
+    run by one worker. The claim is a lease: the worker stamps the row
+    with this process's owner id and renews `heartbeat_at` while the task
+    runs. Tasks whose lease has lapsed (shutdown or crash of the owning
+    process) are put back in the queue by whichever process notices
+    first, up to AUTOMATION_MAX_ATTEMPTS. Live tasks of other processes
+    sharing the database are left alone.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        poll_seconds: float,
+        max_attempts: int,
+        lease_seconds: float,
+        max_backoff_seconds: float
+    ):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_backoff_seconds = max_backoff_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._worker_tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._next_recovery = datetime.min
+
+    # ------------------------------------------------------
+    #  LIFECYCLE
+    # ------------------------------------------------------
+    async def start(self):
+        await self._recover_expired()
+
+        self._wakeup = asyncio.Event()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(n), name=f"automation-worker-{n}")
+            for n in range(self.workers)
+        ]
+        print(f"✅ Automation queue started with {self.workers} worker(s)")
+
+    async def stop(self):
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+        # Give up our leases now rather than making the next start wait for them to lapse
+        try:
+            await self._update_owned(heartbeat_at=None)
+            await self._recover_expired()
+        except Exception as e:
+            print(f"⚠️ Could not release automation task leases: {str(e)}")
+
+    async def _recover_expired(self):
+        """Re-queue 'running' tasks whose lease has lapsed (their process is gone)"""
+        now = datetime.utcnow()
+        self._next_recovery = now + self.lease / 3
+        expired = (
+            (AutomationTask.status == "running")
+            & (AutomationTask.heartbeat_at.is_(None) | (AutomationTask.heartbeat_at < now - self.lease))
+        )
+
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(AutomationTask)
+                .where(expired, AutomationTask.attempts >= self.max_attempts)
+                .values(
+                    status="failed",
+                    error="Interrupted too many times",
+                    owner=None,
+                    finished_at=now
+                )
+            )
+            result = await session.execute(
+                update(AutomationTask)
+                .where(expired)
+                .values(status="queued", owner=None, heartbeat_at=None)
+            )
+            await session.commit()
+
+        if result.rowcount:
+            print(f"🔁 Re-queued {result.rowcount} interrupted automation task(s)")
+
+    # ------------------------------------------------------
+    #  PUBLIC API
+    # ------------------------------------------------------
+    async def submit(self, params: Dict) -> AutomationTask:
+        async with AsyncSessionLocal() as session:
+            task = AutomationTask(status="queued", params=params, stages={}, attempts=0)
+            session.add(task)
+            await session.commit()
+
+        if self._wakeup:
+            self._wakeup.set()
+        return task
+
+    async def get(self, db: AsyncSession, task_id: str) -> Optional[AutomationTask]:
+        return await db.get(AutomationTask, task_id)
+
+    async def list_tasks(self, db: AsyncSession, status: Optional[str] = None, limit: int = 50) -> List[AutomationTask]:
+        query = select(AutomationTask).order_by(AutomationTask.created_at.desc()).limit(limit)
+        if status:
+            query = query.where(AutomationTask.status == status)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    # ------------------------------------------------------
+    #  WORKERS
+    # ------------------------------------------------------
+    async def _claim(self) -> Optional[AutomationTask]:
+        async with AsyncSessionLocal() as session:
+            candidate = await session.scalar(
+                select(AutomationTask.id)
+                .where(AutomationTask.status == "queued")
+                .order_by(AutomationTask.created_at)
+                .limit(1)
+            )
+            if candidate is None:
+                return None
+
+            result = await session.execute(
+                update(AutomationTask)
+                .where(AutomationTask.id == candidate, AutomationTask.status == "queued")
+                .values(
+                    status="running",
+                    owner=self.owner,
+                    started_at=datetime.utcnow(),
+                    heartbeat_at=datetime.utcnow(),
+                    attempts=AutomationTask.attempts + 1
+                )
+            )
+            await session.commit()
+
+            if result.rowcount != 1:
+                return None  # another worker got there first
+            return await session.get(AutomationTask, candidate)
+
+    async def _worker(self, worker_id: int):
+        failures = 0
+        while True:
+            task = None
+            try:
+                if datetime.utcnow() >= self._next_recovery:
+                    await self._recover_expired()
+
+                # Clear before claiming so a submit during the claim still wakes us
+                self._wakeup.clear()
+                task = await self._claim()
+                failures = 0
+
+                if task is None:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                print(f"▶️ Worker {worker_id} running automation task {task.id}")
+                await self._run(task)
+
+            except Exception as e:
+                # A database hiccup must not kill the worker: log, give up on the task, back off
+                failures += 1
+                traceback.print_exc()
+                print(f"❌ Automation worker {worker_id} error: {str(e)}")
+                if task is not None:
+                    await self._mark_failed(task.id, e)
+                await asyncio.sleep(min(self.poll_seconds * 2 ** failures, self.max_backoff_seconds))
+
+    async def _update(self, task_id: str, **values):
+        """Write to a task this process still owns (a lapsed lease may have been re-queued)"""
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(AutomationTask)
+                .where(AutomationTask.id == task_id, AutomationTask.owner == self.owner)
+                .values(**values)
+            )
+            await session.commit()
+
+    async def _update_owned(self, **values):
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(AutomationTask)
+                .where(AutomationTask.status == "running", AutomationTask.owner == self.owner)
+                .values(**values)
+            )
+            await session.commit()
+
+    async def _mark_failed(self, task_id: str, error: Exception):
+        try:
+            await self._update(task_id, status="failed", error=str(error), finished_at=datetime.utcnow())
+        except Exception as e:
+            # Left 'running': it is re-queued once its lease lapses
+            print(f"⚠️ Could not mark automation task {task_id} failed: {str(e)}")
+
+    async def _heartbeat(self, task_id: str):
+        while True:
+            await asyncio.sleep(self.lease.total_seconds() / 3)
+            try:
+                await self._update(task_id, heartbeat_at=datetime.utcnow())
+            except Exception as e:
+                print(f"⚠️ Lease renewal failed for automation task {task_id}: {str(e)}")
+
+    async def _run(self, task: AutomationTask):
+        stages = {}
+
+        async def record_stage(name: str, seconds: float, summary: Dict):
+            stages[name] = {"seconds": round(seconds, 3), "summary": summary}
+            await self._update(task.id, stages=dict(stages))
+
+        heartbeat = asyncio.create_task(self._heartbeat(task.id))
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await run_full_automation(db=db, on_stage=record_stage, **task.params)
+
+            await self._update(
+                task.id,
+                status="succeeded",
+                result=result,
+                error=None,
+                finished_at=datetime.utcnow()
+            )
+
+        except asyncio.CancelledError:
+            # Shutting down — leave it 'running'; it is re-queued once the lease lapses
+            raise
+
+        except Exception as e:
+            traceback.print_exc()
+            await self._mark_failed(task.id, e)
+
+        finally:
+            heartbeat.cancel()
+
+
+automation_queue = AutomationTaskQueue(
+    workers=settings.AUTOMATION_WORKERS,
+    poll_seconds=settings.AUTOMATION_POLL_SECONDS,
+    max_attempts=settings.AUTOMATION_MAX_ATTEMPTS,
+    lease_seconds=settings.AUTOMATION_LEASE_SECONDS,
+    max_backoff_seconds=settings.AUTOMATION_MAX_BACKOFF_SECONDS
+)
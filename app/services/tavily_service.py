@@ -1,12 +1,9 @@
 # app/services/tavily_service.py
 
-from tavily import TavilyClient
 from app.core.config import get_settings
-
-# Initialize client
+from app.services.http_clients import http_clients
 
 settings = get_settings()
-tavily = TavilyClient(api_key=settings.TAVILY_API_KEY)
 
 class TavilySearchService:
 
@@ -18,14 +15,16 @@ class TavilySearchService:
         """
 
         try:
-            response = tavily.search(
-                query=query,
-                max_results=max_results,
-                include_domains=None,  # Allow global search
-                include_raw_content=False
-            )
-
-            results = response.get("results", [])
+            # REST API on the shared "search" pool — the SDK client is
+            # synchronous and would block the event loop
+            response = await http_clients.get("search").post("/search", json={
+                "query": query,
+                "max_results": max_results,
+                "include_raw_content": False
+            })
+            response.raise_for_status()
+
+            results = response.json().get("results", [])
             return [item["url"] for item in results]
 
         except Exception as e:
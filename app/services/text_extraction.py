@@ -0,0 +1,122 @@
+# app/services/text_extraction.py
+
+"""
+HTML → plain text, shared by the scraper service and the LangChain tools.
+
+Two interchangeable backends:
+  - "lxml": C parser, strips unwanted elements in place — fast path
+  - "bs4":  BeautifulSoup + html.parser — pure Python fallback
+
+"auto" picks lxml when it is installed.
+"""
+
+from typing import Callable, Dict, Iterable
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # optional dependency
+    lxml = None
+
+from bs4 import BeautifulSoup
+
+# Elements dropped before extracting job descriptions
+JD_DROP_TAGS = ("script", "style", "nav", "header", "footer", "aside", "iframe", "noscript")
+
+# Elements dropped before extracting general page text (hiring manager pages)
+PAGE_DROP_TAGS = ("script", "style", "nav", "header", "footer", "noscript")
+
+
+def join_lines(text: str) -> str:
+    """Strip every line and drop blank ones"""
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def _bs4_text(html: str, drop_tags: Iterable[str]) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+
+    for tag in soup(list(drop_tags)):
+        tag.decompose()
+
+    return join_lines(soup.get_text(separator="\n"))
+
+
+def _lxml_parse(html: str):
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # "Unicode strings with encoding declaration are not supported"
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+
+
+def _lxml_text(html: str, drop_tags: Iterable[str]) -> str:
+    try:
+        doc = _lxml_parse(html)
+    except etree.ParserError:
+        return ""  # empty or whitespace-only document
+
+    etree.strip_elements(doc, etree.Comment, *drop_tags, with_tail=False)
+    return join_lines("\n".join(doc.itertext()))
+
+
+BACKENDS: Dict[str, Callable[[str, Iterable[str]], str]] = {"bs4": _bs4_text}
+if lxml is not None:
+    BACKENDS["lxml"] = _lxml_text
+
+
+class VisibleTextCounter:
+    """
+    Parses an HTML byte stream incrementally and counts visible text, so a
+    download can stop once enough has arrived. Text inside `drop_tags` is
+    not counted; tails are skipped too, so the count errs low. Always 0
+    without lxml.
+    """
+
+    def __init__(self, drop_tags: Iterable[str] = PAGE_DROP_TAGS):
+        self.drop_tags = set(drop_tags)
+        self.chars = 0
+        self._dropped_depth = 0
+        self._parser = etree.HTMLPullParser(events=("start", "end")) if lxml is not None else None
+
+    def feed(self, chunk: bytes) -> int:
+        if self._parser is None:
+            return self.chars
+
+        try:
+            self._parser.feed(chunk)
+            for event, el in self._parser.read_events():
+                if el.tag in self.drop_tags:
+                    self._dropped_depth += 1 if event == "start" else -1
+                elif event == "end" and not self._dropped_depth and el.text:
+                    self.chars += len(el.text.strip())
+        except Exception:
+            self._parser = None  # give up counting, the byte cap still applies
+
+        return self.chars
+
+
+def resolve_backend(backend: str = "auto") -> str:
+    if backend == "auto":
+        return "lxml" if "lxml" in BACKENDS else "bs4"
+    if backend not in BACKENDS:
+        print(f"⚠️ HTML backend '{backend}' unavailable, using bs4")
+        return "bs4"
+    return backend
+
+
+def html_to_text(html: str, drop_tags: Iterable[str] = PAGE_DROP_TAGS, backend: str = "auto") -> str:
+    """
+    Extract readable text: drop `drop_tags`, one text node per line,
+    blank lines removed. Falls back to BeautifulSoup if lxml chokes.
+    """
+    if not html:
+        return ""
+
+    name = resolve_backend(backend)
+    try:
+        return BACKENDS[name](html, drop_tags)
+    except Exception as e:
+        if name == "bs4":
+            raise
+        print(f"⚠️ lxml extraction failed ({str(e)[:60]}), falling back to bs4")
+        return _bs4_text(html, drop_tags)
@@ -3,7 +3,7 @@
 from langchain_core.tools import tool
 from app.services.adzuna_service import AdzunaService
 import json
-import asyncio
+from app.services.http_clients import http_clients
 
 @tool
 def search_jobs_adzuna(
@@ -28,7 +28,7 @@ def search_jobs_adzuna(
     service = AdzunaService()
     
     # Search Adzuna
-    result = asyncio.run(
+    result = http_clients.run(
         service.search_jobs(
             query=query,
             location=location,
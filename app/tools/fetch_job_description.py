@@ -1,13 +1,55 @@
 # app/tools/fetch_job_description.py
 
 from langchain_core.tools import tool
-import httpx
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
-import time
+import asyncio
+from typing import Dict, List
+from app.core.config import get_settings
+from app.services.scraper_service import JobScraperService
+
+settings = get_settings()
+
+
+async def _fetch_one(scraper: JobScraperService, semaphore: asyncio.Semaphore, url: str) -> Dict:
+    async with semaphore:
+        try:
+            description, status = await asyncio.wait_for(
+                scraper.fetch_job_description_result(url),
+                timeout=settings.SCRAPE_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            description, status = None, "timeout"
+
+    return {"status": status, "description": description or ""}
+
+
+@tool
+async def fetch_job_descriptions(urls: List[str]) -> Dict[str, Dict]:
+    """
+    Fetch job descriptions for several job posting URLs in parallel.
+
+    Respects robots.txt and per-domain rate limits, reuses cached pages,
+    and keeps only the posting's main text (max 5000 chars each).
+
+    Args:
+        urls: Job posting URLs (e.g. Adzuna apply links)
+
+    Returns:
+        {url: {"status": "ok" | "robots_blocked" | "http_<code>" | "unsupported"
+                          | "empty" | "timeout" | "error",
+               "description": plain text, empty unless status is "ok"}}
+    """
+
+    urls = list(dict.fromkeys(url for url in urls if url))
+    semaphore = asyncio.Semaphore(settings.SCRAPE_CONCURRENCY)
+
+    # The scraper draws on the app-wide pooled client
+    scraper = JobScraperService()
+    results = await asyncio.gather(*(_fetch_one(scraper, semaphore, url) for url in urls))
+    return dict(zip(urls, results))
+
 
 @tool
-def fetch_job_description(url: str) -> str:
+async def fetch_job_description(url: str) -> str:
     """
     Safely fetches the full job description from a job posting URL.
 
@@ -18,61 +60,13 @@ def fetch_job_description(url: str) -> str:
     4. Return plain text (no HTML)
     """
 
-    try:
-        # ---------------------------------------
-        # 1. Extract base site for robots.txt
-        # ---------------------------------------
-        parsed = urlparse(url)
-        base = f"{parsed.scheme}://{parsed.netloc}"
-        robots_url = f"{base}/robots.txt"
-
-        client = httpx.Client(headers={
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-            "Accept-Language": "en-US,en;q=0.9"
-        }, timeout=10.0)
-
-        # ---------------------------------------
-        # 2. Respect robots.txt
-        # ---------------------------------------
-        try:
-            robots = client.get(robots_url)
-            if "Disallow" in robots.text:
-                disallow_rules = [
-                    line.split(":")[1].strip()
-                    for line in robots.text.splitlines()
-                    if line.startswith("Disallow")
-                ]
-
-                for rule in disallow_rules:
-                    if parsed.path.startswith(rule):
-                        return "ROBOTS_BLOCKED"
-        except:
-            # If robots.txt fails, we still proceed safely
-            pass
-
-        # ---------------------------------------
-        # 3. Fetch the page with browser headers
-        # ---------------------------------------
-        page = client.get(url)
-        if page.status_code != 200:
-            return f"FAILED_TO_FETCH_PAGE: {page.status_code}"
-
-        # ---------------------------------------
-        # 4. Parse HTML → readable text
-        # ---------------------------------------
-        soup = BeautifulSoup(page.text, "html.parser")
-
-        # Remove scripts, styles, navbars, footer
-        for tag in soup(["script", "style", "noscript", "header", "footer", "nav"]):
-            tag.decompose()
-
-        text = soup.get_text(separator="\n")
-        cleaned = "\n".join([line.strip() for line in text.splitlines() if line.strip()])
-
-        # Rate limit → avoid bans
-        time.sleep(1)
-
-        return cleaned[:5000]   # limit size for LLM safety
-
-    except Exception as e:
-        return f"ERROR: {str(e)}"
+    result = await _fetch_one(JobScraperService(), asyncio.Semaphore(1), url)
+    status = result["status"]
+
+    if status == "ok":
+        return result["description"]
+    if status == "robots_blocked":
+        return "ROBOTS_BLOCKED"
+    if status.startswith("http_"):
+        return f"FAILED_TO_FETCH_PAGE: {status[5:]}"
+    return f"ERROR: {status}"
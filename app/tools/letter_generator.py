@@ -2,9 +2,11 @@ from langchain_core.tools import tool
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from app.services.llm_service import get_llm
+from app.services.llm_cache import llm_cache
+from app.services.llm_limiter import vertex_limiter
 
 @tool
-def generate_cover_letter(job_title: str, company: str, matched_skills: str) -> str:
+async def generate_cover_letter(job_title: str, company: str, matched_skills: str) -> str:
     """Generate a tailored cover letter based on job details and matched skills"""
     llm = get_llm()
     
@@ -16,8 +18,18 @@ def generate_cover_letter(job_title: str, company: str, matched_skills: str) ->
     )
     
     chain = template | llm | StrOutputParser()
-    return chain.invoke({
+    inputs = {
         "job_title": job_title,
         "company": company,
         "matched_skills": matched_skills
-    })
+    }
+
+    # Same job + skills → cached letter
+    prompt = template.format(**inputs)
+
+    async def invoke() -> str:
+        # ~300 words back; the text parser drops usage, so the estimate stands
+        async with vertex_limiter.slot(len(prompt) // 4 + 500):
+            return await chain.ainvoke(inputs)
+
+    return await llm_cache.fetch(llm, str, prompt, invoke)
@@ -1,8 +1,9 @@
 # app/tools/skill_matcher.py
 
 from langchain_core.tools import tool
+from typing import Dict, List
 import json
-import re
+from app.services.skill_engine import engine_for
 
 # ----------------------------------------------
 # 1. Your constant skill list (editable later)
@@ -21,6 +22,31 @@ CONSTANT_SKILLS = [
     "git"
 ]
 
+
+def score_skills(job_description: str, skills: List[str] = CONSTANT_SKILLS) -> Dict:
+    """
+    Deterministic skill match through the compiled skill engine:
+    one scan per description, aliases included ("postgres" → "postgresql").
+
+    Returns {"matched": [...], "missing": [...], "match_score": 0-100}
+    """
+
+    engine = engine_for(skills)
+    found = engine.match(job_description)
+
+    matched = [skill for skill in skills if engine.canonical(skill) in found]
+    missing = [skill for skill in skills if engine.canonical(skill) not in found]
+
+    # Match score (simple % match)
+    score = int((len(matched) / len(skills)) * 100) if skills else 0
+
+    return {
+        "matched": matched,
+        "missing": missing,
+        "match_score": score
+    }
+
+
 @tool
 def match_skills(job_description: str) -> str:
     """
@@ -35,39 +61,8 @@ def match_skills(job_description: str) -> str:
     """
 
     try:
-        # ----------------------------------------------
-        # 2. Normalize job description for matching
-        # ----------------------------------------------
-        text = job_description.lower()
-
-        matched = []
-        missing = []
-
-        # ----------------------------------------------
-        # 3. Check each constant skill
-        # ----------------------------------------------
-        for skill in CONSTANT_SKILLS:
-            # Use regex to avoid substring false matches
-            pattern = r"\b" + re.escape(skill) + r"\b"
-
-            if re.search(pattern, text):
-                matched.append(skill)
-            else:
-                missing.append(skill)
-
-        # ----------------------------------------------
-        # 4. Match score (simple % match)
-        # ----------------------------------------------
-        score = int((len(matched) / len(CONSTANT_SKILLS)) * 100)
-
-        # ----------------------------------------------
-        # 5. Return structured JSON only
-        # ----------------------------------------------
-        return json.dumps({
-            "matched": matched,
-            "missing": missing,
-            "match_score": score
-        }, indent=2)
+        # Return structured JSON only
+        return json.dumps(score_skills(job_description), indent=2)
 
     except Exception as e:
         return json.dumps({
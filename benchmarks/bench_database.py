@@ -0,0 +1,116 @@
+# benchmarks/bench_database.py
+"""
+SQLite throughput with default pragmas vs the tuned profile in app/database.py.
+
+Runs the same workload against a fresh temporary database per profile:
+  1. concurrent writers, one row per transaction (like pipeline updates)
+  2. concurrent readers doing point lookups while writers keep inserting
+
+Usage:
+    python -m benchmarks.bench_database --rows 2000 --writers 4 --readers 4
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.database import build_engine, sqlite_pragmas
+
+
+async def run_profile(name: str, tuned: bool, rows: int, writers: int, readers: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{tmp}/bench.db"
+        engine = build_engine(url, pragmas=sqlite_pragmas() if tuned else [])
+        read_engine = build_engine(
+            url, read_only=True, pragmas=sqlite_pragmas(read_only=True) if tuned else []
+        )
+
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE TABLE jobs (id TEXT PRIMARY KEY, title TEXT, description TEXT)"
+            ))
+
+        errors = 0
+        per_writer = rows // writers
+
+        async def writer(worker: int, phase: str):
+            nonlocal errors
+            for i in range(per_writer):
+                try:
+                    async with engine.begin() as conn:
+                        await conn.execute(
+                            text("INSERT INTO jobs VALUES (:id, :title, :description)"),
+                            {"id": f"{phase}-{worker}-{i}", "title": "Python Developer", "description": "x" * 300}
+                        )
+                except OperationalError:
+                    errors += 1
+
+        # Phase 1: writes only
+        start = time.perf_counter()
+        await asyncio.gather(*(writer(w, "w") for w in range(writers)))
+        write_elapsed = time.perf_counter() - start
+
+        # Phase 2: reads while writing
+        reads = 0
+        writing = True
+
+        async def reader(worker: int):
+            nonlocal reads, errors
+            i = 0
+            while writing:
+                try:
+                    async with read_engine.connect() as conn:
+                        await conn.execute(
+                            text("SELECT * FROM jobs WHERE id = :id"),
+                            {"id": f"w-{worker % writers}-{i % per_writer}"}
+                        )
+                    reads += 1
+                except OperationalError:
+                    errors += 1
+                i += 1
+
+        async def timed_writers():
+            nonlocal writing
+            await asyncio.gather(*(writer(w, "m") for w in range(writers)))
+            writing = False
+
+        start = time.perf_counter()
+        await asyncio.gather(timed_writers(), *(reader(r) for r in range(readers)))
+        mixed_elapsed = time.perf_counter() - start
+
+        await read_engine.dispose()
+        await engine.dispose()
+
+    return {
+        "profile": name,
+        "writes_per_sec": per_writer * writers / write_elapsed,
+        "mixed_writes_per_sec": per_writer * writers / mixed_elapsed,
+        "mixed_reads_per_sec": reads / mixed_elapsed,
+        "lock_errors": errors,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    results = [
+        await run_profile("defaults", False, args.rows, args.writers, args.readers),
+        await run_profile("tuned", True, args.rows, args.writers, args.readers),
+    ]
+
+    print(f"{'profile':<10} {'writes/s':>10} {'mixed w/s':>10} {'mixed r/s':>10} {'lock errs':>10}")
+    for r in results:
+        print(
+            f"{r['profile']:<10} {r['writes_per_sec']:>10.0f} {r['mixed_writes_per_sec']:>10.0f} "
+            f"{r['mixed_reads_per_sec']:>10.0f} {r['lock_errors']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
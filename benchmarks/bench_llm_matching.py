@@ -0,0 +1,90 @@
+# benchmarks/bench_llm_matching.py
+"""
+Per-job vs batched LLM skill matching on stored job descriptions
+(the `job_descriptions` table): wall time, LLM requests and tokens
+(as reported by the provider), plus how far the batched scores drift
+from the per-job ones.
+
+The LLM cache is bypassed so both paths really call the model. Needs
+the same credentials as the app (.env) and costs real tokens.
+
+Usage:
+    python -m benchmarks.bench_llm_matching --jobs 40
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+from sqlalchemy import select
+from app.core.config import get_settings
+from app.database import ReadSessionLocal
+from app.models.job_description import JobDescription
+from app.services.description_store import load_descriptions
+from app.services.llm_cache import llm_cache
+from app.services.skill_matcher_service import SkillMatcherService
+
+settings = get_settings()
+
+
+async def load_jobs(limit: int) -> dict:
+    async with ReadSessionLocal() as session:
+        ids = (await session.execute(select(JobDescription.job_id).limit(limit))).scalars().all()
+        return await load_descriptions(session, ids)
+
+
+async def per_job(jobs: dict) -> tuple:
+    matcher = SkillMatcherService()
+    start = time.perf_counter()
+    results = {}
+    for job_id, jd in jobs.items():
+        try:
+            results[job_id] = await matcher.match_job(jd)
+        except Exception as e:
+            print(f"  per-job {job_id} failed: {str(e)[:60]}")
+    return results, time.perf_counter() - start, matcher.usage
+
+
+async def batched(jobs: dict) -> tuple:
+    matcher = SkillMatcherService()
+    start = time.perf_counter()
+    results = await matcher.match_jobs(jobs)
+    return results, time.perf_counter() - start, matcher.usage
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=40)
+    args = parser.parse_args()
+
+    jobs = await load_jobs(args.jobs)
+    if not jobs:
+        raise SystemExit("No stored job descriptions — run /match first")
+
+    llm_cache.ttl = timedelta(0)  # measure the model, not the cache
+    print(
+        f"{len(jobs)} jobs, batch budget {settings.SKILL_BATCH_TOKEN_BUDGET} tokens, "
+        f"max {settings.SKILL_BATCH_MAX_JOBS} jobs, {settings.SKILL_BATCH_JD_CHARS} chars/JD\n"
+    )
+
+    single, single_time, single_usage = await per_job(jobs)
+    batch, batch_time, batch_usage = await batched(jobs)
+
+    print(f"{'path':<9} {'wall s':>8} {'requests':>9} {'in tok':>9} {'out tok':>9} {'matched':>8}")
+    for name, results, elapsed, usage in (
+        ("per-job", single, single_time, single_usage),
+        ("batched", batch, batch_time, batch_usage),
+    ):
+        print(
+            f"{name:<9} {elapsed:>8.1f} {usage['calls']:>9} {usage['input_tokens']:>9} "
+            f"{usage['output_tokens']:>9} {len(results):>8}"
+        )
+
+    common = [job_id for job_id in single if job_id in batch]
+    if common:
+        drift = sum(abs(single[j].match_score - batch[j].match_score) for j in common) / len(common)
+        print(f"\nmean |score difference| over {len(common)} jobs: {drift:.1f} points")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
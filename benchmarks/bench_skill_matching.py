@@ -0,0 +1,92 @@
+# benchmarks/bench_skill_matching.py
+"""
+Skill matching throughput: the original one-regex-per-skill loop vs the
+compiled skill engine in app/services/skill_engine.py (one scan per
+description, synonyms included), over a synthetic corpus of job
+descriptions.
+
+"agree" is the share of job × skill cells where both methods say the
+same; the rest are alias hits ("postgres", "k8s") that only the engine
+sees.
+
+Usage:
+    python -m benchmarks.bench_skill_matching --jobs 10000
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import List
+from app.services.skill_engine import SKILL_TAXONOMY, skill_engine
+from app.tools.skill_matcher import CONSTANT_SKILLS
+
+FILLER = (
+    "we are looking for an engineer to join our growing team and build reliable services "
+    "you will work closely with product and design own features end to end and mentor others "
+    "competitive salary hybrid working flexible hours health insurance and learning budget"
+).split()
+
+
+def make_corpus(jobs: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    mentions = [alias for canonical, aliases in SKILL_TAXONOMY.items() for alias in (canonical, *aliases)]
+
+    corpus = []
+    for _ in range(jobs):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(150, 300))]
+        for _ in range(rng.randint(3, 12)):
+            words.insert(rng.randrange(len(words)), rng.choice(mentions).title())
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def per_skill_loop(texts: List[str], skills: List[str]) -> List[List[bool]]:
+    """The original app/tools/skill_matcher.match_skills inner loop"""
+    rows = []
+    for job_description in texts:
+        text = job_description.lower()
+        rows.append([
+            re.search(r"\b" + re.escape(skill) + r"\b", text) is not None
+            for skill in skills
+        ])
+    return rows
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=10000)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.jobs)
+    total_mb = sum(len(text) for text in corpus) / (1024 * 1024)
+    print(f"Corpus: {len(corpus)} synthetic descriptions, {total_mb:.1f} MB\n")
+
+    skill_sets = {
+        "constant": CONSTANT_SKILLS,
+        "taxonomy": list(SKILL_TAXONOMY),
+    }
+
+    print(f"{'skills':<10} {'n':>4} {'loop s':>9} {'engine s':>9} {'speedup':>8} {'agree':>7} {'extra hits':>11}")
+    for name, skills in skill_sets.items():
+        loop_rows, loop_time = timed(per_skill_loop, corpus, skills)
+        engine_rows, engine_time = timed(skill_engine.match_batch, corpus, skills)
+
+        cells = len(corpus) * len(skills)
+        same = sum(a == b for loop_row, engine_row in zip(loop_rows, engine_rows) for a, b in zip(loop_row, engine_row))
+        extra = sum(b and not a for loop_row, engine_row in zip(loop_rows, engine_rows) for a, b in zip(loop_row, engine_row))
+
+        print(
+            f"{name:<10} {len(skills):>4} {loop_time:>9.2f} {engine_time:>9.2f} "
+            f"{loop_time / engine_time:>7.1f}x {same / cells:>7.1%} {extra:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# benchmarks/bench_text_extraction.py
+"""
+HTML → text throughput and peak memory for each backend in
+app/services/text_extraction.py, plus the compression ratio of
+main-content extraction (app/services/main_content.py).
+
+The corpus is any directory of saved pages: *.html files, or the raw
+bodies the scraper's HTTP cache keeps under data/http_cache/bodies.
+--synthetic N generates N job pages instead (site chrome, scripts and
+a job posting body), for machines without a cache to replay.
+
+Each backend runs in its own subprocess. Peak memory is the growth of
+the process's max RSS (resource.getrusage) over one extraction pass,
+so it includes lxml/libxml2's C allocations that tracemalloc can't see.
+
+Usage:
+    python -m benchmarks.bench_text_extraction [corpus_dir] [--repeat 3]
+    python -m benchmarks.bench_text_extraction --synthetic 500
+"""
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from app.services.main_content import extract_main_content, main_content_stats
+from app.services.text_extraction import BACKENDS, JD_DROP_TAGS
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent.parent / "data" / "http_cache" / "bodies"
+
+WORDS = (
+    "engineer team build scalable services python django postgres kubernetes "
+    "ownership mentoring customers product roadmap reliability observability "
+    "hybrid salary benefits learning budget interview process apply today"
+).split()
+
+
+def load_corpus(corpus_dir: Path) -> list:
+    pages = []
+    for path in sorted(corpus_dir.rglob("*")):
+        if path.is_file() and path.suffix not in (".tmp", ".txt"):
+            pages.append(path.read_bytes().decode("utf-8", errors="replace"))
+    return pages
+
+
+def make_corpus(pages: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+
+    def sentence(n: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+    corpus = []
+    for i in range(pages):
+        nav = "".join(f'<li><a href="/p/{j}">{sentence(2)}</a></li>' for j in range(rng.randint(20, 60)))
+        scripts = "".join(f"<script>var s{j} = {json.dumps(sentence(80))};</script>" for j in range(rng.randint(5, 20)))
+        sections = "".join(
+            f"<h2>{sentence(3)}</h2><p>{sentence(rng.randint(30, 90))}</p>"
+            f"<ul>{''.join(f'<li>{sentence(8)}</li>' for _ in range(rng.randint(3, 8)))}</ul>"
+            for _ in range(rng.randint(3, 8))
+        )
+        corpus.append(
+            f"<!DOCTYPE html><html><head><title>Job {i}</title><style>{'.c{color:red}' * 200}</style>{scripts}</head>"
+            f"<body><header><nav><ul>{nav}</ul></nav></header>"
+            f'<main><article class="job-description"><h1>{sentence(4)}</h1>{sections}</article></main>'
+            f"<aside>{sentence(40)}</aside><footer>{sentence(30)}</footer></body></html>"
+        )
+    return corpus
+
+
+def max_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+
+def bench(backend: str, pages: list, repeat: int) -> dict:
+    extract = BACKENDS[backend]
+
+    # Peak memory for a single (cold) pass, measured before anything else grows the heap
+    baseline = max_rss_mb()
+    for html in pages:
+        extract(html, JD_DROP_TAGS)
+    peak = max_rss_mb() - baseline
+
+    start = time.perf_counter()
+    chars = 0
+    for _ in range(repeat):
+        for html in pages:
+            chars += len(extract(html, JD_DROP_TAGS))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "backend": backend,
+        "pages_per_sec": len(pages) * repeat / elapsed,
+        "ms_per_page": elapsed * 1000 / (len(pages) * repeat),
+        "peak_mb": peak,
+        "avg_chars": chars / (len(pages) * repeat),
+    }
+
+
+def bench_in_subprocess(backend: str, args: argparse.Namespace) -> dict:
+    """A fresh interpreter per backend, so one backend's heap can't hide the other's peak"""
+    command = [sys.executable, "-m", "benchmarks.bench_text_extraction", "--backend", backend, "--repeat", str(args.repeat)]
+    command += ["--synthetic", str(args.synthetic)] if args.synthetic else [str(args.corpus)]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", nargs="?", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--synthetic", type=int, default=0, help="generate this many pages instead of reading corpus")
+    parser.add_argument("--backend", choices=list(BACKENDS), help=argparse.SUPPRESS)  # child process mode
+    args = parser.parse_args()
+
+    pages = make_corpus(args.synthetic) if args.synthetic else load_corpus(args.corpus)
+    if not pages:
+        raise SystemExit(f"No pages found in {args.corpus}")
+
+    if args.backend:
+        print(json.dumps(bench(args.backend, pages, args.repeat)))
+        return
+
+    total_mb = sum(len(p) for p in pages) / (1024 * 1024)
+    source = "synthetic" if args.synthetic else args.corpus
+    print(f"Corpus: {len(pages)} pages, {total_mb:.1f} MB from {source}\n")
+
+    print(f"{'backend':<8} {'pages/s':>10} {'ms/page':>10} {'peak MB':>10} {'avg chars':>10}")
+    for backend in BACKENDS:
+        r = bench_in_subprocess(backend, args)
+        print(
+            f"{r['backend']:<8} {r['pages_per_sec']:>10.1f} {r['ms_per_page']:>10.2f} "
+            f"{r['peak_mb']:>10.1f} {r['avg_chars']:>10.0f}"
+        )
+
+    start = time.perf_counter()
+    for html in pages:
+        extract_main_content(html, JD_DROP_TAGS, focus="job")
+    elapsed = time.perf_counter() - start
+    stats = main_content_stats.stats()
+    print(
+        f"\nmain-content: {elapsed * 1000 / len(pages):.2f} ms/page, "
+        f"compression {stats['compression_ratio']}, fallbacks {stats['fallbacks']}/{stats['pages']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# tests/conftest.py
+
+import asyncio
+import importlib
+import os
+import pkgutil
+import tempfile
+
+import pytest
+
+# Settings are read once, at first import — point them at a scratch database
+# and cache directory, and fill in the required API keys, before any app import
+_TMP_DIR = tempfile.mkdtemp(prefix="job-automation-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_TMP_DIR}/test.db"
+os.environ["HTTP_CACHE_DIR"] = os.path.join(_TMP_DIR, "http_cache")
+for _key in ("GOOGLE_CLOUD_PROJECT", "GROQ_API_KEY", "TAVILY_API_KEY", "ADZUNA_APP_ID", "ADZUNA_APP_KEY"):
+    os.environ.setdefault(_key, "test")
+
+import app.models  # noqa: E402
+from app.database import Base, engine, read_engine, create_missing_indexes  # noqa: E402
+
+# Register every table on Base.metadata
+for _module in pkgutil.iter_modules(app.models.__path__):
+    importlib.import_module(f"app.models.{_module.name}")
+
+
+async def _dispose_engines():
+    # Pooled aiosqlite connections belong to the loop that opened them
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+
+
+async def _reset_schema():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_missing_indexes)
+    await _dispose_engines()
+
+
+@pytest.fixture
+def run():
+    """
+    Run a coroutine to completion on its own event loop, against freshly
+    created (empty) tables. No pytest-asyncio needed.
+    """
+    asyncio.run(_reset_schema())
+
+    def _run(coro):
+        async def main():
+            try:
+                return await coro
+            finally:
+                await _dispose_engines()
+
+        return asyncio.run(main())
+
+    return _run
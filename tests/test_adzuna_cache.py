@@ -0,0 +1,112 @@
+# tests/test_adzuna_cache.py
+
+from datetime import datetime, timedelta
+import httpx
+from sqlalchemy import select, update
+from app.database import AsyncSessionLocal
+from app.models.adzuna_cache import AdzunaCacheEntry
+from app.services import adzuna_cache as adzuna_cache_module
+from app.services import adzuna_service
+from app.services.adzuna_cache import AdzunaResponseCache
+from app.services.adzuna_service import AdzunaService
+
+PAGE = {"jobs": [{"id": "1", "title": "Python Developer"}], "status": "success"}
+
+
+def _broken_session():
+    raise RuntimeError("database is locked")
+
+
+async def _access_times():
+    async with AsyncSessionLocal() as session:
+        return dict((await session.execute(select(AdzunaCacheEntry.key, AdzunaCacheEntry.last_accessed_at))).all())
+
+
+def test_hit_and_expiry(run):
+    cache = AdzunaResponseCache(ttl_seconds=60, max_entries=10)
+
+    async def scenario():
+        await cache.set("k", PAGE)
+        hit = await cache.get("k")
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(AdzunaCacheEntry).values(created_at=datetime.utcnow() - timedelta(seconds=120))
+            )
+            await session.commit()
+        return hit, await cache.get("k")
+
+    assert run(scenario()) == (PAGE, None)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_hits_queue_access_times_instead_of_writing(run, monkeypatch):
+    cache = AdzunaResponseCache(ttl_seconds=24 * 3600, max_entries=10)
+    stale = datetime.utcnow() - timedelta(hours=2)
+
+    async def scenario():
+        await cache.set("k", PAGE)
+        async with AsyncSessionLocal() as session:
+            await session.execute(update(AdzunaCacheEntry).values(last_accessed_at=stale))
+            await session.commit()
+
+        with monkeypatch.context() as patch:
+            patch.setattr(adzuna_cache_module, "AsyncSessionLocal", _broken_session)
+            assert await cache.get("k") == PAGE  # no write session opened
+
+        before = await _access_times()
+        await cache.set("other", PAGE)  # the next store writes the queued time
+        return before, await _access_times()
+
+    before, after = run(scenario())
+
+    assert before["k"] == stale
+    assert after["k"] > stale
+
+
+def test_lru_eviction_counts_queued_hits(run):
+    cache = AdzunaResponseCache(ttl_seconds=24 * 3600, max_entries=2)
+
+    async def scenario():
+        await cache.set("a", PAGE)
+        await cache.set("b", PAGE)
+        async with AsyncSessionLocal() as session:
+            for key, hours in (("a", 3), ("b", 2)):
+                await session.execute(
+                    update(AdzunaCacheEntry).where(AdzunaCacheEntry.key == key)
+                    .values(last_accessed_at=datetime.utcnow() - timedelta(hours=hours))
+                )
+            await session.commit()
+        await cache.get("a")
+        await cache.set("c", PAGE)
+        return set(await _access_times())
+
+    assert run(scenario()) == {"a", "c"}
+
+
+def test_database_errors_degrade(run, monkeypatch):
+    cache = AdzunaResponseCache(ttl_seconds=60, max_entries=10)
+    monkeypatch.setattr(adzuna_cache_module, "ReadSessionLocal", _broken_session)
+    monkeypatch.setattr(adzuna_cache_module, "AsyncSessionLocal", _broken_session)
+
+    async def scenario():
+        await cache.set("k", PAGE)
+        return await cache.get("k")
+
+    assert run(scenario()) is None
+    assert (cache.errors, cache.misses) == (2, 1)
+
+
+def test_search_survives_a_broken_cache(run, monkeypatch):
+    monkeypatch.setattr(adzuna_cache_module, "ReadSessionLocal", _broken_session)
+    monkeypatch.setattr(adzuna_cache_module, "AsyncSessionLocal", _broken_session)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"count": 1, "results": [{"id": "42", "title": "Python Developer"}]})
+
+    client = httpx.AsyncClient(base_url="https://api.adzuna.com", transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(adzuna_service.http_clients, "get", lambda name: client)
+
+    result = run(AdzunaService().search_jobs("python developer"))
+
+    assert result["status"] == "success"
+    assert [job["id"] for job in result["jobs"]] == ["42"]
@@ -0,0 +1,89 @@
+# tests/test_description_store.py
+
+import zlib
+import pytest
+from sqlalchemy import select
+from app.database import AsyncSessionLocal
+from app.models.job_description import JobDescription
+from app.services import description_store
+from app.services.description_store import (
+    compress_text,
+    decompress_text,
+    description_store_stats,
+    load_descriptions,
+    save_descriptions,
+)
+
+TEXT = "Senior Python Developer — Bengaluru ✨\n" + "We build async services with FastAPI. " * 20
+
+
+def test_compress_round_trip():
+    content, codec = compress_text(TEXT)
+
+    assert len(content) < len(TEXT.encode("utf-8"))
+    assert decompress_text(content, codec) == TEXT
+
+
+def test_zlib_setting_forces_zlib(monkeypatch):
+    monkeypatch.setattr(description_store.settings, "DESCRIPTION_CODEC", "zlib")
+
+    content, codec = compress_text(TEXT)
+
+    assert codec == "zlib"
+    assert zlib.decompress(content).decode("utf-8") == TEXT
+
+
+def test_zstd_rows_and_zlib_rows_coexist(monkeypatch):
+    pytest.importorskip("zstandard")
+    zstd_row = compress_text(TEXT)
+    monkeypatch.setattr(description_store.settings, "DESCRIPTION_CODEC", "zlib")
+    zlib_row = compress_text(TEXT)
+
+    assert (zstd_row[1], zlib_row[1]) == ("zstd", "zlib")
+    assert decompress_text(*zstd_row) == decompress_text(*zlib_row) == TEXT
+
+
+def test_save_and_load_round_trip(run, monkeypatch):
+    monkeypatch.setattr(description_store, "CHUNK_SIZE", 2)  # exercise the chunked reads and writes
+    texts = {f"job-{n}": f"{TEXT} #{n}" for n in range(5)}
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await save_descriptions(db, [(job_id, text, f"https://acme.test/{job_id}") for job_id, text in texts.items()])
+            loaded = await load_descriptions(db, [*texts, "job-0", "missing"])
+            row = await db.scalar(select(JobDescription).where(JobDescription.job_id == "job-3"))
+        return loaded, row
+
+    loaded, row = run(scenario())
+
+    assert loaded == texts
+    assert (row.source_url, row.char_count) == ("https://acme.test/job-3", len(texts["job-3"]))
+
+
+def test_saving_again_replaces_the_description(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await save_descriptions(db, [("1", "first version", "https://acme.test/old")])
+            await save_descriptions(db, [("1", "second version", "https://acme.test/new")])
+            rows = (await db.scalars(select(JobDescription))).all()
+            return rows, await load_descriptions(db, ["1"])
+
+    rows, loaded = run(scenario())
+
+    assert [(row.job_id, row.source_url) for row in rows] == [("1", "https://acme.test/new")]
+    assert loaded == {"1": "second version"}
+
+
+def test_stats_report_stored_size(run):
+    async def scenario():
+        empty = await description_store_stats()
+        async with AsyncSessionLocal() as db:
+            await save_descriptions(db, [("1", TEXT, None), ("2", TEXT, None)])
+        return empty, await description_store_stats()
+
+    empty, stats = run(scenario())
+
+    assert (empty["descriptions"], empty["compression_ratio"]) == (0, None)
+    assert stats["descriptions"] == 2
+    assert stats["text_chars"] == 2 * len(TEXT)
+    assert 0 < stats["compression_ratio"] < 1
@@ -0,0 +1,118 @@
+# tests/test_hiring_managers.py
+
+from datetime import datetime, timedelta
+from sqlalchemy import select, text
+from app.database import AsyncSessionLocal, engine
+from app.models.hiring_manager import HiringManager
+from app.schemas.hiring_manager import Person, PeopleExtractionResponse
+from app.services.hiring_manager_service import (
+    UNIQUE_INDEX_NAME,
+    _unique_index_exists,
+    collapse_duplicate_hiring_managers,
+    upsert_hiring_manager,
+    upsert_hiring_managers,
+)
+
+
+def _people(*people):
+    return PeopleExtractionResponse(people=[Person(**person) for person in people])
+
+
+async def _all_managers():
+    async with AsyncSessionLocal() as db:
+        return (await db.scalars(select(HiringManager).order_by(HiringManager.name))).all()
+
+
+def test_upsert_inserts_new_people(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            managers = await upsert_hiring_managers(db, _people(
+                {"name": "Ada Lovelace", "title": "CTO", "company": "Acme"},
+                {"name": "Alan Turing", "title": "Head of Data", "company": None},
+            ), source_url="https://acme.test/team")
+        return managers, await _all_managers()
+
+    returned, stored = run(scenario())
+
+    assert sorted(m.name for m in returned) == ["Ada Lovelace", "Alan Turing"]
+    assert [m.name for m in stored] == ["Ada Lovelace", "Alan Turing"]
+
+
+def test_upsert_conflict_is_case_insensitive_and_updates_the_row(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            first = await upsert_hiring_manager(
+                db, Person(name="Ada Lovelace", title="Engineer", company="Acme"), "https://a.test"
+            )
+            second = await upsert_hiring_manager(
+                db, Person(name="ADA LOVELACE", title="CTO", company="acme", location="London"), "https://b.test"
+            )
+        return first.id, second, await _all_managers()
+
+    first_id, second, stored = run(scenario())
+
+    assert len(stored) == 1
+    assert second.id == first_id
+    # Updated fields change, the identity columns keep their first spelling
+    assert (second.title, second.location, second.source_url) == ("CTO", "London", "https://b.test")
+    assert (second.name, second.company) == ("Ada Lovelace", "Acme")
+
+
+def test_upsert_treats_missing_company_as_one_key(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await upsert_hiring_manager(db, Person(name="Grace Hopper", title="Admiral"), "https://a.test")
+            await upsert_hiring_manager(db, Person(name="Grace Hopper", title="Rear Admiral"), "https://b.test")
+        return await _all_managers()
+
+    stored = run(scenario())
+
+    assert [(m.name, m.title) for m in stored] == [("Grace Hopper", "Rear Admiral")]
+
+
+def test_upsert_collapses_repeats_within_one_batch(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            managers = await upsert_hiring_managers(db, _people(
+                {"name": "Ada Lovelace", "title": "Engineer", "company": "Acme"},
+                {"name": "ada lovelace ", "title": "CTO", "company": "ACME"},
+                {"name": "   ", "title": "Nobody"},
+            ), source_url="https://acme.test/team")
+        return managers, await _all_managers()
+
+    returned, stored = run(scenario())
+
+    assert len(returned) == 1
+    assert [(m.name, m.title) for m in stored] == [("ada lovelace", "CTO")]  # last mention wins
+
+
+def test_collapse_duplicates_runs_only_before_the_unique_index(run):
+    now = datetime.utcnow()
+    insert = text(
+        "INSERT INTO hiring_managers (id, name, title, company, email_attempts, created_at, updated_at) "
+        "VALUES (:id, :name, :title, :company, 0, :at, :at)"
+    )
+
+    async def scenario():
+        async with engine.begin() as conn:
+            # A table from before the index: duplicates are possible
+            await conn.execute(text(f"DROP INDEX {UNIQUE_INDEX_NAME}"))
+            index_before = await conn.run_sync(_unique_index_exists)
+            await conn.execute(insert, [
+                {"id": "old", "name": "Ada Lovelace", "title": "Engineer", "company": "Acme", "at": now - timedelta(days=1)},
+                {"id": "new", "name": "ADA LOVELACE", "title": "CTO", "company": "acme", "at": now},
+                {"id": "other", "name": "Alan Turing", "title": "Head of Data", "company": None, "at": now},
+            ])
+            await conn.run_sync(collapse_duplicate_hiring_managers)
+            after_migration = (await conn.execute(text("SELECT id FROM hiring_managers ORDER BY id"))).scalars().all()
+
+            await conn.execute(text(
+                f"CREATE UNIQUE INDEX {UNIQUE_INDEX_NAME} ON hiring_managers (lower(name), lower(coalesce(company, '')))"
+            ))
+            index_after = await conn.run_sync(_unique_index_exists)
+        return index_before, after_migration, index_after
+
+    index_before, after_migration, index_after = run(scenario())
+
+    assert (index_before, index_after) == (False, True)  # the migration is skipped once the index exists
+    assert after_migration == ["new", "other"]  # most recently updated row of each group survives
@@ -0,0 +1,116 @@
+# tests/test_http_cache.py
+
+from datetime import datetime, timedelta
+import httpx
+from sqlalchemy import select, update
+from app.database import AsyncSessionLocal
+from app.models.http_cache import HttpCacheEntry
+from app.services.http_cache import HttpCache
+
+
+def _cache(tmp_path, max_bytes=1024 * 1024) -> HttpCache:
+    return HttpCache(root=str(tmp_path), max_bytes=max_bytes, fresh_ttl_seconds=3600)
+
+
+def _response(**headers) -> httpx.Response:
+    return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8", **headers})
+
+
+def _files(tmp_path, folder):
+    return sorted(path.name for path in (tmp_path / folder).glob("*/*"))
+
+
+async def _rows():
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(select(HttpCacheEntry.url, HttpCacheEntry.body_hash))).all()
+
+
+def test_changed_body_replaces_the_old_files(run, tmp_path):
+    cache = _cache(tmp_path)
+
+    async def scenario():
+        for version in range(5):
+            entry = await cache.store("https://acme.test/jobs/1", _response(), f"<p>version {version}</p>".encode())
+            cache.write_text(entry, "jd", f"version {version}")
+        return entry, await _rows()
+
+    entry, rows = run(scenario())
+
+    assert len(rows) == 1
+    assert _files(tmp_path, "bodies") == [entry.body_hash]
+    assert [name.split(".")[0] for name in _files(tmp_path, "texts")] == [entry.body_hash]
+    assert cache.read_html(entry) == "<p>version 4</p>"
+
+
+def test_shared_body_outlives_one_url_changing(run, tmp_path):
+    cache = _cache(tmp_path)
+
+    async def scenario():
+        shared = await cache.store("https://a.test/job", _response(), b"<p>same posting</p>")
+        await cache.store("https://b.test/job", _response(), b"<p>same posting</p>")
+        await cache.store("https://a.test/job", _response(), b"<p>updated</p>")
+        return shared
+
+    shared = run(scenario())
+
+    assert len(_files(tmp_path, "bodies")) == 2
+    assert cache.has_body(shared)  # b.test still points at it
+
+
+def test_evict_drops_least_recently_used_and_their_files(run, tmp_path):
+    cache = _cache(tmp_path, max_bytes=250)
+    bodies = {url: (url * 10).encode()[:100] for url in ("https://a.test/1", "https://b.test/2", "https://c.test/3")}
+
+    async def scenario():
+        entries = {}
+        for url, body in list(bodies.items())[:2]:
+            entries[url] = await cache.store(url, _response(), body)
+        # a.test was read most recently, so b.test is the LRU entry
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(HttpCacheEntry)
+                .where(HttpCacheEntry.url == "https://b.test/2")
+                .values(last_accessed_at=datetime.utcnow() - timedelta(hours=1))
+            )
+            await session.commit()
+        url, body = list(bodies.items())[2]
+        entries[url] = await cache.store(url, _response(), body)
+        return entries, await _rows()
+
+    entries, rows = run(scenario())
+
+    assert sorted(url for url, _ in rows) == ["https://a.test/1", "https://c.test/3"]
+    assert not cache.has_body(entries["https://b.test/2"])
+    assert len(_files(tmp_path, "bodies")) == 2
+
+
+def test_sweep_removes_files_no_entry_references(run, tmp_path):
+    cache = _cache(tmp_path)
+    orphan = "ab" + "0" * 62
+    (tmp_path / "bodies" / "ab").mkdir(parents=True)
+    (tmp_path / "bodies" / "ab" / orphan).write_bytes(b"left behind")
+    (tmp_path / "texts" / "ab").mkdir(parents=True)
+    (tmp_path / "texts" / "ab" / f"{orphan}.jd.v2").write_text("left behind")
+
+    async def scenario():
+        return await cache.store("https://acme.test/jobs/1", _response(), b"<p>kept</p>")
+
+    entry = run(scenario())
+
+    assert _files(tmp_path, "bodies") == [entry.body_hash]
+    assert _files(tmp_path, "texts") == []
+
+
+def test_partial_body_is_stored_without_validators(run, tmp_path):
+    cache = _cache(tmp_path)
+
+    async def scenario():
+        await cache.store("https://acme.test/full", _response(etag='"v1"'), b"<p>whole page</p>")
+        await cache.store("https://acme.test/partial", _response(etag='"v1"'), b"<p>first bytes", partial=True)
+        return await cache.lookup("https://acme.test/full"), await cache.lookup("https://acme.test/partial")
+
+    full, partial = run(scenario())
+
+    assert cache.conditional_headers(full) == {"If-None-Match": '"v1"'}
+    assert cache.conditional_headers(partial) == {}
+    assert partial.partial
@@ -0,0 +1,76 @@
+# tests/test_job_collector.py
+
+from sqlalchemy import select
+from app.database import AsyncSessionLocal
+from app.models.job import Job
+from app.services import job_collector
+from app.services.job_collector import bulk_insert_jobs
+
+
+def _job(job_id, title="Backend Engineer"):
+    return {"id": job_id, "title": title, "company": "Acme", "description": "Python and Django"}
+
+
+def test_bulk_insert_returns_inserted_ids(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            return await bulk_insert_jobs(db, [_job("1"), _job("2"), _job(3)])
+
+    inserted, duplicates, missing_id = run(scenario())
+
+    assert sorted(inserted) == ["1", "2", "3"]
+    assert duplicates == 0
+    assert missing_id == 0
+
+
+def test_bulk_insert_skips_existing_rows_on_conflict(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await bulk_insert_jobs(db, [_job("1", title="Original")])
+            result = await bulk_insert_jobs(db, [_job("1", title="Changed"), _job("2")])
+            titles = dict((await db.execute(select(Job.id, Job.title))).all())
+        return result, titles
+
+    (inserted, duplicates, missing_id), titles = run(scenario())
+
+    assert inserted == ["2"]
+    assert duplicates == 1
+    assert missing_id == 0
+    assert titles == {"1": "Original", "2": "Backend Engineer"}  # DO NOTHING: the first row stands
+
+
+def test_bulk_insert_counts_duplicates_within_one_batch(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            return await bulk_insert_jobs(db, [_job("1"), _job("1")])
+
+    inserted, duplicates, _ = run(scenario())
+
+    assert inserted == ["1"]
+    assert duplicates == 1
+
+
+def test_bulk_insert_counts_jobs_without_id_separately(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            return await bulk_insert_jobs(db, [_job("1"), _job(None), {"title": "No id"}])
+
+    inserted, duplicates, missing_id = run(scenario())
+
+    assert inserted == ["1"]
+    assert duplicates == 0
+    assert missing_id == 2
+
+
+def test_bulk_insert_spans_chunks(run, monkeypatch):
+    monkeypatch.setattr(job_collector, "INSERT_CHUNK_SIZE", 2)
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await bulk_insert_jobs(db, [_job("2")])
+            return await bulk_insert_jobs(db, [_job(str(i)) for i in range(5)])
+
+    inserted, duplicates, _ = run(scenario())
+
+    assert sorted(inserted) == ["0", "1", "3", "4"]
+    assert duplicates == 1
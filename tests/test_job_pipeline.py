@@ -0,0 +1,131 @@
+# tests/test_job_pipeline.py
+
+import asyncio
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_google_vertexai")
+
+from app.services import job_pipeline  # noqa: E402
+from app.services.job_pipeline import _fetched_members, _group_postings, _scrape_posting  # noqa: E402
+from app.services.link_resolver import canonicalize_url  # noqa: E402
+
+
+def _job(job_id, title, apply_link):
+    return SimpleNamespace(id=job_id, title=title, apply_link=apply_link)
+
+
+def _links(**final_urls):
+    """apply link → resolved link, from apply_link=final_url pairs"""
+    return {
+        link: SimpleNamespace(apply_link=link, final_url=final, canonical_url=canonicalize_url(final))
+        for link, final in final_urls.items()
+    }
+
+
+def test_same_page_same_title_is_one_posting():
+    jobs = [_job("1", "Python Developer", "a"), _job("2", "Python developer", "b")]
+    links = _links(a="https://acme.test/jobs/1?utm_source=adzuna", b="https://www.acme.test/jobs/1/")
+
+    postings = _group_postings(jobs, links, clusters={})
+
+    assert {key: [job.id for job in group] for key, group in postings.items()} == {"1": ["1", "2"]}
+
+
+def test_different_titles_on_one_page_stay_apart():
+    jobs = [_job("1", "Senior Java Developer", "a"), _job("2", "Python Developer", "b")]
+    links = _links(a="https://acme.test/careers", b="https://acme.test/careers")
+
+    assert list(_group_postings(jobs, links, clusters={})) == ["1", "2"]
+
+
+def test_cluster_with_different_titles_stays_apart():
+    # A cluster stored before titles were part of the LSH key
+    jobs = [_job("1", "Senior Java Developer", "a"), _job("2", "Python Developer", "b")]
+    links = _links(a="https://acme.test/jobs/java", b="https://acme.test/jobs/python")
+
+    postings = _group_postings(jobs, links, clusters={"1": "1", "2": "1"})
+
+    assert list(postings) == ["1", "2"]
+
+
+def test_near_duplicates_with_the_same_title_share_a_posting():
+    jobs = [_job("1", "Python Developer", "a"), _job("2", "Python Developer", "b")]
+    links = _links(a="https://acme.test/jobs/1", b="https://jobs.example.test/acme/99")
+
+    postings = _group_postings(jobs, links, clusters={"1": "1", "2": "1"})
+
+    assert [job.id for job in postings["1"]] == ["1", "2"]
+
+
+def test_hub_urls_do_not_group():
+    jobs = [_job(str(i), "Python Developer", f"link{i}") for i in range(7)]
+    links = _links(**{f"link{i}": "https://acme.test/careers" for i in range(7)})
+
+    assert len(_group_postings(jobs, links, clusters={})) == 7
+
+
+def test_description_is_owned_by_jobs_whose_link_was_fetched():
+    group = [
+        _job("1", "Python Developer", "a"),
+        _job("2", "Python Developer", "b"),  # near-duplicate listed elsewhere
+        _job("3", "Python Developer", "c"),  # same page, tracking parameters
+    ]
+    links = _links(
+        a="https://acme.test/jobs/1",
+        b="https://jobs.example.test/acme/99",
+        c="https://acme.test/jobs/1?utm_source=adzuna",
+    )
+
+    owners = _fetched_members(group, links, "https://acme.test/jobs/1")
+
+    assert [job.id for job in owners] == ["1", "3"]
+
+
+def _fake_scraper(pages):
+    """A scraper whose fetches return pages[url] (None for unknown URLs)"""
+    fetched = []
+
+    async def fetch_job_description(url):
+        fetched.append(url)
+        return pages.get(url)
+
+    return SimpleNamespace(client=None, fetch_job_description=fetch_job_description), fetched
+
+
+def test_scrape_posting_resolves_new_links_as_it_tries_them(run, monkeypatch):
+    followed = []
+
+    async def follow(client, link):
+        followed.append(link)
+        final = {"a": "https://acme.test/jobs/1", "b": "https://acme.test/jobs/1?utm_source=x"}[link]
+        return SimpleNamespace(apply_link=link, final_url=final, canonical_url=canonicalize_url(final), status_code=200)
+
+    monkeypatch.setattr(job_pipeline, "follow_job_link", follow)
+    scraper, fetched = _fake_scraper({"https://acme.test/jobs/1": "x" * 200})
+
+    links = {link: SimpleNamespace(final_url=link, status_code=None) for link in ("a", "b")}
+
+    jd, url, resolved = run(_scrape_posting(scraper, asyncio.Semaphore(2), ["a", "b"], links))
+
+    assert (jd, url) == ("x" * 200, "https://acme.test/jobs/1")
+    assert followed == ["a"]  # the first link worked: the second is never followed
+    assert [link.apply_link for link in resolved] == ["a"]
+    assert links["a"].final_url == "https://acme.test/jobs/1"
+    assert fetched == ["https://acme.test/jobs/1"]
+
+
+def test_scrape_posting_tries_each_page_once(run, monkeypatch):
+    async def follow(client, link):
+        return SimpleNamespace(apply_link=link, final_url="https://acme.test/expired", canonical_url="", status_code=200)
+
+    monkeypatch.setattr(job_pipeline, "follow_job_link", follow)
+    scraper, fetched = _fake_scraper({})
+    links = {link: SimpleNamespace(final_url=link, status_code=None) for link in ("a", "b")}
+
+    jd, url, resolved = run(_scrape_posting(scraper, asyncio.Semaphore(2), ["a", "b"], links))
+
+    assert (jd, url) == (None, None)
+    assert len(resolved) == 2
+    assert fetched == ["https://acme.test/expired"]
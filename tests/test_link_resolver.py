@@ -0,0 +1,131 @@
+# tests/test_link_resolver.py
+
+import asyncio
+from datetime import datetime
+import httpx
+import pytest
+from sqlalchemy import select
+from app.database import AsyncSessionLocal
+from app.models.job_link import JobLink
+from app.services import link_resolver
+from app.services.link_resolver import canonicalize_url, follow_job_link, known_job_links, store_job_links
+
+
+@pytest.mark.parametrize("url, canonical", [
+    ("HTTPS://WWW.Acme.TEST/jobs/1/", "https://acme.test/jobs/1"),
+    ("https://acme.test:443/jobs/1#apply", "https://acme.test/jobs/1"),
+    ("http://acme.test:8080/jobs/1", "http://acme.test:8080/jobs/1"),
+    ("https://acme.test/jobs?utm_source=adzuna&id=7&gclid=x&ref=feed", "https://acme.test/jobs?id=7"),
+    ("https://acme.test/jobs?b=2&a=1", "https://acme.test/jobs?a=1&b=2"),
+    ("https://acme.test", "https://acme.test/"),
+])
+def test_canonicalize_url(url, canonical):
+    assert canonicalize_url(url) == canonical
+
+
+@pytest.fixture
+def no_robots(monkeypatch):
+    monkeypatch.setattr(link_resolver.settings, "RESPECT_ROBOTS_TXT", False)
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True)
+
+
+def test_follow_uses_head_through_redirects(no_robots):
+    methods = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        methods.append((request.method, request.url.host))
+        if request.url.host == "redirect.adzuna.test":
+            return httpx.Response(302, headers={"location": "https://www.acme-head.test/jobs/1/?utm_source=adzuna"})
+        return httpx.Response(200)
+
+    async def scenario():
+        async with _client(handler) as client:
+            return await follow_job_link(client, "https://redirect.adzuna.test/land/1")
+
+    link = asyncio.run(scenario())
+
+    assert link.final_url == "https://www.acme-head.test/jobs/1/?utm_source=adzuna"
+    assert link.canonical_url == "https://acme-head.test/jobs/1"
+    assert link.status_code == 200
+    assert methods == [("HEAD", "redirect.adzuna.test"), ("HEAD", "www.acme-head.test")]
+
+
+def test_follow_falls_back_to_get_when_head_is_rejected(no_robots):
+    methods = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        methods.append(request.method)
+        if request.method == "HEAD":
+            return httpx.Response(405)
+        return httpx.Response(200, text="<html>full page</html>")
+
+    async def scenario():
+        async with _client(handler) as client:
+            return await follow_job_link(client, "https://no-head.test/jobs/1")
+
+    link = asyncio.run(scenario())
+
+    assert methods == ["HEAD", "GET"]
+    assert link.status_code == 200
+
+
+def test_unresolvable_link_maps_to_itself(no_robots):
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    async def scenario():
+        async with _client(handler) as client:
+            return await follow_job_link(client, "https://down.test/jobs/1?utm_source=x")
+
+    link = asyncio.run(scenario())
+
+    assert link.final_url == "https://down.test/jobs/1?utm_source=x"
+    assert link.canonical_url == "https://down.test/jobs/1"
+    assert link.status_code is None
+
+
+def test_only_successful_resolutions_are_stored_and_known(run):
+    now = datetime.utcnow()
+
+    def job_link(apply_link, final_url, status_code):
+        return JobLink(
+            apply_link=apply_link, final_url=final_url, canonical_url=canonicalize_url(final_url),
+            status_code=status_code, resolved_at=now
+        )
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await store_job_links(db, [
+                job_link("a", "https://acme.test/jobs/1", 200),
+                job_link("b", "https://acme.test/gone", 404),
+                job_link("c", "c", None),
+            ])
+            stored = (await db.scalars(select(JobLink.apply_link))).all()
+            known = await known_job_links(db, ["a", "b", "c", "a", None])
+        return stored, known
+
+    stored, known = run(scenario())
+
+    assert stored == ["a"]
+    assert list(known) == ["a", "b", "c"]
+    assert (known["a"].final_url, known["a"].status_code) == ("https://acme.test/jobs/1", 200)
+    # Not stored: they map to themselves until followed again
+    assert (known["b"].final_url, known["b"].status_code) == ("b", None)
+    assert (known["c"].final_url, known["c"].status_code) == ("c", None)
+
+
+def test_known_links_ignore_stored_error_rows(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            # Older versions stored failed resolutions too
+            db.add(JobLink(
+                apply_link="x", final_url="https://acme.test/500", canonical_url="https://acme.test/500",
+                status_code=500, resolved_at=datetime.utcnow()
+            ))
+            await db.commit()
+            return await known_job_links(db, ["x"])
+
+    assert run(scenario())["x"].status_code is None
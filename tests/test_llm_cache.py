@@ -0,0 +1,160 @@
+# tests/test_llm_cache.py
+
+from datetime import datetime, timedelta
+from pydantic import BaseModel
+from sqlalchemy import select, update
+from app.database import AsyncSessionLocal
+from app.models.llm_cache import LLMCacheEntry
+from app.services import llm_cache as llm_cache_module
+from app.services.llm_cache import LLMResponseCache
+
+
+class Answer(BaseModel):
+    score: int
+
+
+class FakeLLM:
+    model_name = "fake-model"
+    temperature = 0.0
+
+
+async def _backdate(key: str, **ages: timedelta):
+    """Shift an entry's timestamps (created_at / last_accessed_at) into the past"""
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(LLMCacheEntry).where(LLMCacheEntry.key == key).values(
+                **{column: now - age for column, age in ages.items()}
+            )
+        )
+        await session.commit()
+
+
+async def _keys():
+    async with AsyncSessionLocal() as session:
+        return set((await session.scalars(select(LLMCacheEntry.key))).all())
+
+
+def test_store_then_lookup_hits(run):
+    cache = LLMResponseCache(ttl_seconds=3600, max_entries=10)
+    llm = FakeLLM()
+
+    async def scenario():
+        await cache.store(llm, Answer, "prompt", Answer(score=80))
+        return await cache.lookup(llm, Answer, "prompt"), await cache.lookup(llm, Answer, "other prompt")
+
+    hit, miss = run(scenario())
+
+    assert hit == Answer(score=80)
+    assert miss is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_key_covers_model_temperature_and_schema():
+    key = LLMResponseCache.make_key("m", 0.0, Answer, "p")
+
+    assert key == LLMResponseCache.make_key("m", 0.0, Answer, "p")
+    assert key != LLMResponseCache.make_key("other", 0.0, Answer, "p")
+    assert key != LLMResponseCache.make_key("m", 0.7, Answer, "p")
+    assert key != LLMResponseCache.make_key("m", 0.0, str, "p")
+
+
+def test_expired_entry_is_a_miss_and_dropped_on_next_write(run):
+    cache = LLMResponseCache(ttl_seconds=60, max_entries=10)
+
+    async def scenario():
+        await cache.set("old", "fake-model", Answer, Answer(score=1))
+        await _backdate("old", created_at=timedelta(seconds=120))
+        expired = await cache.get("old", Answer)
+
+        await cache.set("new", "fake-model", Answer, Answer(score=2))
+        return expired, await _keys()
+
+    expired, keys = run(scenario())
+
+    assert expired is None
+    assert cache.misses == 1
+    assert keys == {"new"}
+
+
+def test_lru_eviction_beyond_max_entries(run):
+    cache = LLMResponseCache(ttl_seconds=7 * 24 * 3600, max_entries=2)
+
+    async def scenario():
+        await cache.set("a", "fake-model", Answer, Answer(score=1))
+        await cache.set("b", "fake-model", Answer, Answer(score=2))
+        await _backdate("a", last_accessed_at=timedelta(hours=3))
+        await _backdate("b", last_accessed_at=timedelta(hours=2))
+
+        # A hit on the least recently used entry protects it from eviction
+        assert await cache.get("a", Answer) == Answer(score=1)
+
+        await cache.set("c", "fake-model", Answer, Answer(score=3))
+        return await _keys()
+
+    assert run(scenario()) == {"a", "c"}
+
+
+def test_hits_do_not_write(run, monkeypatch):
+    cache = LLMResponseCache(ttl_seconds=3600, max_entries=10)
+
+    async def scenario():
+        await cache.set("a", "fake-model", Answer, Answer(score=1))
+        await _backdate("a", last_accessed_at=timedelta(hours=2))
+
+        def no_writes():
+            raise AssertionError("a cache hit opened a write session")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(llm_cache_module, "AsyncSessionLocal", no_writes)
+            return await cache.get("a", Answer)
+
+    assert run(scenario()) == Answer(score=1)
+    assert list(cache._touched) == ["a"]  # queued for the next write
+
+
+def test_invalid_payload_is_a_miss(run):
+    cache = LLMResponseCache(ttl_seconds=3600, max_entries=10)
+
+    class Renamed(BaseModel):
+        label: str
+
+    async def scenario():
+        await cache.set("a", "fake-model", Answer, Answer(score=1))
+        return await cache.get("a", Renamed)
+
+    assert run(scenario()) is None
+    assert cache.misses == 1
+
+
+def test_database_errors_degrade(run, monkeypatch):
+    cache = LLMResponseCache(ttl_seconds=3600, max_entries=10)
+    llm = FakeLLM()
+    calls = []
+
+    def broken_session():
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(llm_cache_module, "ReadSessionLocal", broken_session)
+    monkeypatch.setattr(llm_cache_module, "AsyncSessionLocal", broken_session)
+
+    async def call():
+        calls.append(1)
+        return Answer(score=42)
+
+    result = run(cache.fetch(llm, Answer, "prompt", call))
+
+    assert result == Answer(score=42)  # the LLM result still comes back
+    assert len(calls) == 1
+    assert cache.errors == 2  # failed read (a miss) and skipped store
+    assert cache.misses == 1
+
+
+def test_ttl_zero_disables_the_cache(run):
+    cache = LLMResponseCache(ttl_seconds=0, max_entries=10)
+
+    async def scenario():
+        await cache.set("a", "fake-model", Answer, Answer(score=1))
+        return await cache.get("a", Answer), await _keys()
+
+    assert run(scenario()) == (None, set())
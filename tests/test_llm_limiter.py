@@ -0,0 +1,66 @@
+# tests/test_llm_limiter.py
+
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.services.llm_limiter import ProviderLimiter, token_usage
+
+
+def _limiter() -> ProviderLimiter:
+    # 100 tokens/s with a 1000-token bucket: refill during a test is well under a token
+    return ProviderLimiter("test", rpm=6000, tpm=6000, concurrency=2)
+
+
+async def _call(limiter: ProviderLimiter, estimated: int, reported=None, error: Exception = None):
+    async with limiter.slot(estimated) as slot:
+        if reported is not None:
+            slot["tokens"] = reported
+        if error is not None:
+            raise error
+
+
+def test_overrun_is_charged_to_the_bucket():
+    limiter = _limiter()
+
+    asyncio.run(_call(limiter, estimated=100, reported=300))
+
+    assert limiter.tokens.available() == pytest.approx(700, abs=2)
+    assert limiter.tokens_used == 300
+
+
+def test_underrun_is_refunded():
+    limiter = _limiter()
+
+    asyncio.run(_call(limiter, estimated=300, reported=100))
+
+    assert limiter.tokens.available() == pytest.approx(900, abs=2)
+    assert limiter.tokens_used == 100
+
+
+def test_estimate_stands_without_reported_usage():
+    limiter = _limiter()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(_call(limiter, estimated=250, error=RuntimeError("provider error")))
+
+    assert limiter.tokens.available() == pytest.approx(750, abs=2)
+    assert (limiter.calls, limiter.errors, limiter.in_flight) == (1, 1, 0)
+
+
+def test_overrun_can_push_the_bucket_negative():
+    limiter = _limiter()
+
+    asyncio.run(_call(limiter, estimated=100, reported=1500))
+
+    # Later callers wait for the overrun to refill
+    assert limiter.tokens.available() == pytest.approx(-500, abs=2)
+
+
+def test_token_usage_sums_reported_usage():
+    messages = [
+        SimpleNamespace(usage_metadata={"input_tokens": 100, "output_tokens": 20}),
+        SimpleNamespace(usage_metadata=None),
+        SimpleNamespace(),
+        SimpleNamespace(usage_metadata={"input_tokens": 50, "output_tokens": 5}),
+    ]
+    assert token_usage(messages) == {"input_tokens": 150, "output_tokens": 25}
@@ -0,0 +1,99 @@
+# tests/test_near_duplicates.py
+
+from app.database import AsyncSessionLocal
+from app.services.near_duplicates import (
+    assign_clusters,
+    lsh_buckets,
+    minhash,
+    normalize_company,
+    normalize_title,
+    shingles,
+    similarity,
+)
+
+BOILERPLATE = (
+    "Acme Technologies is a global leader in digital transformation. We value ownership, "
+    "curiosity and customer obsession. Join our award winning engineering team in Bengaluru "
+    "and build products used by millions of people every day across the world."
+)
+
+
+def _assign(run, jobs):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            return await assign_clusters(db, jobs)
+
+    return run(scenario())
+
+
+def test_normalizers():
+    assert normalize_company("Acme Technologies Pvt. Ltd.") == "acme technologies"
+    assert normalize_title("Senior Python Developer (Remote)") == "senior python developer remote"
+
+
+def test_shared_boilerplate_looks_alike_without_the_title_key():
+    java = minhash(shingles("Senior Java Developer", BOILERPLATE))
+    python = minhash(shingles("Python Developer", BOILERPLATE))
+
+    assert similarity(java, python) >= 0.7  # the snippet alone can't tell the roles apart
+    assert set(lsh_buckets(java, "acme", "senior java developer")).isdisjoint(
+        lsh_buckets(python, "acme", "python developer")
+    )
+
+
+def test_different_titles_at_one_company_never_cluster(run):
+    clusters = _assign(run, [
+        ("1", "Acme Technologies", "Senior Java Developer", BOILERPLATE),
+        ("2", "Acme Technologies Pvt Ltd", "Python Developer", BOILERPLATE),
+    ])
+
+    assert clusters == {"1": "1", "2": "2"}
+
+
+def test_same_role_relisted_clusters_with_its_leader(run):
+    first = _assign(run, [("1", "Acme Technologies", "Python Developer", BOILERPLATE)])
+    second = _assign(run, [
+        ("2", "ACME TECHNOLOGIES LTD", "Python Developer", BOILERPLATE + " Apply now."),
+        ("3", "Acme Technologies", "python developer", BOILERPLATE),
+    ])
+
+    assert first == {"1": "1"}
+    assert second == {"2": "1", "3": "1"}
+
+
+def test_same_text_at_different_companies_never_clusters(run):
+    clusters = _assign(run, [
+        ("1", "Acme Technologies", "Python Developer", BOILERPLATE),
+        ("2", "Initech", "Python Developer", BOILERPLATE),
+    ])
+
+    assert clusters == {"1": "1", "2": "2"}
+
+
+def test_jobs_in_one_call_cluster_with_each_other(run):
+    clusters = _assign(run, [
+        ("1", "Acme", "Python Developer", BOILERPLATE),
+        ("2", "Acme", "Python Developer", BOILERPLATE),
+        ("3", "Acme", "Java Developer", BOILERPLATE),
+    ])
+
+    assert clusters == {"1": "1", "2": "1", "3": "3"}
+
+
+def test_short_texts_are_their_own_cluster(run):
+    clusters = _assign(run, [
+        ("1", "Acme", "Python Developer", "Apply now"),
+        ("2", "Acme", "Python Developer", "Apply now"),
+    ])
+
+    assert clusters == {"1": "1", "2": "2"}
+
+
+def test_stored_assignments_are_reused(run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await assign_clusters(db, [("1", "Acme", "Python Developer", BOILERPLATE)])
+            # A later call with other text keeps the stored cluster
+            return await assign_clusters(db, [("1", "Acme", "Java Developer", "something else entirely")])
+
+    assert run(scenario()) == {"1": "1"}
@@ -0,0 +1,59 @@
+# tests/test_prefilter.py
+
+import pytest
+
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_google_vertexai")
+
+from app.services import skill_matcher_service as sms  # noqa: E402
+from app.services.skill_matcher_service import prefilter_match  # noqa: E402
+
+SKILLS = ["python", "django", "docker", "aws"]  # 25 points each
+
+
+@pytest.fixture(autouse=True)
+def four_skills(monkeypatch):
+    monkeypatch.setattr(sms, "YOUR_SKILLS", SKILLS)
+    monkeypatch.setattr(sms.settings, "SKILL_BATCH_ENABLED", False)
+
+
+def _jd(*skills: str) -> str:
+    return "We are hiring. " + " ".join(f"Experience with {skill}." for skill in skills)
+
+
+@pytest.mark.parametrize("skills, decision", [
+    ((), "reject"),                                  # 0: more than 30 below 50
+    (("python",), "llm"),                            # 25: within the reject margin
+    (("python", "django"), "accept"),                # 50: meets min_match_score
+    (("python", "django", "docker", "aws"), "accept"),
+])
+def test_bands(skills, decision):
+    result = prefilter_match(_jd(*skills), min_match_score=50, reject_margin=30)
+
+    if decision == "llm":
+        assert result is None
+    else:
+        assert (result.match_score >= 50) == (decision == "accept")
+        assert result.matched_skills == list(skills)
+
+
+def test_reject_band_edge_goes_to_the_llm():
+    # 25 is exactly min_match_score - reject_margin: not below it, so the LLM decides
+    assert prefilter_match(_jd("python"), min_match_score=50, reject_margin=25) is None
+    assert prefilter_match(_jd("python"), min_match_score=50, reject_margin=24).match_score == 25
+
+
+def test_accept_margin_widens_the_llm_band():
+    jd = _jd("python", "django")
+
+    assert prefilter_match(jd, min_match_score=50, reject_margin=30, accept_margin=25) is None
+    assert prefilter_match(jd + " Also docker.", min_match_score=50, reject_margin=30, accept_margin=25).match_score == 75
+
+
+def test_only_the_text_the_llm_sees_is_scored(monkeypatch):
+    monkeypatch.setattr(sms, "PROMPT_JD_CHARS", 40)
+    jd = "Python and Django." + " " * 100 + "Docker, AWS."
+
+    result = prefilter_match(jd, min_match_score=75, reject_margin=0)
+
+    assert (result.match_score, result.missing_skills) == (50, ["docker", "aws"])
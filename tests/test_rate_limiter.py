@@ -0,0 +1,39 @@
+# tests/test_rate_limiter.py
+
+import asyncio
+import pytest
+from app.services.rate_limiter import TokenBucket
+
+
+def test_reserve_returns_the_wait_for_a_deficit():
+    bucket = TokenBucket(rate=2, capacity=4)
+    assert bucket.reserve(4) == 0.0
+    assert bucket.reserve(3) == pytest.approx(1.5, abs=0.01)  # 3 tokens short at 2/s
+
+
+def test_bucket_refund_is_capped_at_capacity():
+    bucket = TokenBucket(rate=1, capacity=10)
+    bucket.reserve(4)
+    bucket.refund(100)
+    assert bucket.available() == pytest.approx(10)
+
+
+def test_cancelled_waiter_gives_its_reservation_back():
+    bucket = TokenBucket(rate=1, capacity=10)
+
+    async def scenario():
+        bucket.reserve(10)
+        waiter = asyncio.create_task(bucket.acquire(5))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(scenario())
+
+    assert bucket.available() == pytest.approx(0, abs=0.1)
+
+
+def test_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=10)
@@ -0,0 +1,230 @@
+# tests/test_resilience.py
+
+import asyncio
+import httpx
+import pytest
+from app.services.resilience import CircuitBreaker, CircuitOpenError, Resilience, RetryBudget
+
+URL = "https://api.jobs.test/search"
+
+
+def _expire(breaker: CircuitBreaker):
+    """Move the breaker's open window into the past"""
+    breaker.opened_at -= breaker.reset_seconds
+
+
+def _open_breaker(breaker: CircuitBreaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # resets the count
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.short_circuited == 1
+    assert 0 < breaker.retry_in() <= 30
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    _open_breaker(breaker)
+    _expire(breaker)
+
+    assert breaker.allow()  # the probe
+    assert breaker.state == "half_open"
+    assert not breaker.allow()  # everyone else waits for its outcome
+
+
+def test_probe_success_closes():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    _open_breaker(breaker)
+    _expire(breaker)
+    breaker.allow()
+
+    breaker.record_success()
+
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_probe_failure_reopens():
+    breaker = CircuitBreaker(failure_threshold=5, reset_seconds=30)
+    _open_breaker(breaker)
+    _expire(breaker)
+    breaker.allow()
+
+    breaker.record_failure()  # one failure is enough while half-open
+
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_cancelled_probe_reopens_and_is_released():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    _open_breaker(breaker)
+    _expire(breaker)
+    breaker.allow()
+
+    breaker.record_cancelled()
+    assert breaker.state == "open"
+    assert not breaker.probing
+
+    _expire(breaker)
+    assert breaker.allow()  # a new probe can start
+
+
+def test_cancelled_call_while_closed_changes_nothing():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_cancelled()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+# ------------------------------------------------------
+#  Resilience.run
+# ------------------------------------------------------
+def _resilience(failure_threshold: int = 5) -> Resilience:
+    return Resilience(
+        max_attempts=3,
+        backoff_base=0,
+        backoff_max=0,  # no sleeping between retries
+        budget=RetryBudget(ratio=1.0, min_per_second=0, max_tokens=10),
+        failure_threshold=failure_threshold,
+        reset_seconds=30
+    )
+
+
+def _responses(*statuses):
+    """An attempt() returning the given statuses in turn, and its call log"""
+    calls = []
+
+    async def attempt():
+        calls.append(1)
+        status = statuses[len(calls) - 1]
+        if isinstance(status, BaseException):
+            raise status
+        return httpx.Response(status, request=httpx.Request("GET", URL))
+
+    return attempt, calls
+
+
+def test_run_retries_retryable_statuses():
+    resilience = _resilience()
+    attempt, calls = _responses(503, 502, 200)
+
+    response = asyncio.run(resilience.run(URL, attempt))
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert resilience.breaker(URL).state == "closed"
+
+
+def test_run_returns_last_response_after_max_attempts():
+    resilience = _resilience()
+    attempt, calls = _responses(503, 503, 503)
+
+    response = asyncio.run(resilience.run(URL, attempt))
+
+    assert response.status_code == 503
+    assert len(calls) == 3
+    assert resilience.breaker(URL).failures == 3
+
+
+def test_run_respects_narrowed_retry_statuses():
+    resilience = _resilience()
+    attempt, calls = _responses(429, 200)
+
+    response = asyncio.run(resilience.run(URL, attempt, retry_statuses={500, 502, 503, 504}))
+
+    assert response.status_code == 429
+    assert len(calls) == 1
+
+
+def test_run_stops_when_before_retry_declines():
+    resilience = _resilience()
+    attempt, calls = _responses(503, 200)
+    charges = []
+
+    async def before_retry():
+        charges.append(1)
+        return False  # quota spent
+
+    response = asyncio.run(resilience.run(URL, attempt, before_retry=before_retry))
+
+    assert response.status_code == 503
+    assert len(calls) == 1
+    assert len(charges) == 1
+
+
+def test_run_charges_before_every_retry():
+    resilience = _resilience()
+    attempt, calls = _responses(503, 503, 200)
+    charges = []
+
+    async def before_retry():
+        charges.append(1)
+        return True
+
+    asyncio.run(resilience.run(URL, attempt, before_retry=before_retry))
+
+    assert len(calls) == 3
+    assert len(charges) == 2  # first attempts are not retries
+
+
+def test_run_fails_fast_while_open():
+    resilience = _resilience(failure_threshold=2)
+    attempt, calls = _responses(503, 503, 200)
+
+    asyncio.run(resilience.run(URL, attempt, max_attempts=2))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(resilience.run(URL, attempt))
+
+    assert len(calls) == 2
+
+
+def test_run_non_retryable_error_releases_probe():
+    resilience = _resilience(failure_threshold=1)
+    breaker = resilience.breaker(URL)
+    _open_breaker(breaker)
+    _expire(breaker)
+    attempt, calls = _responses(ValueError("bad response"))
+
+    with pytest.raises(ValueError):
+        asyncio.run(resilience.run(URL, attempt))
+
+    assert len(calls) == 1
+    assert breaker.state == "open"
+    assert not breaker.probing
+
+
+def test_run_cancelled_probe_reopens():
+    resilience = _resilience(failure_threshold=1)
+    breaker = resilience.breaker(URL)
+    _open_breaker(breaker)
+    _expire(breaker)
+
+    async def attempt():
+        await asyncio.sleep(10)
+
+    async def scenario():
+        task = asyncio.create_task(resilience.run(URL, attempt))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+
+    assert breaker.state == "open"
+    assert not breaker.probing
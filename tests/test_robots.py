@@ -0,0 +1,102 @@
+# tests/test_robots.py
+
+import asyncio
+from urllib.robotparser import RobotFileParser
+import httpx
+from app.services.robots_cache import RobotsCache, _longest_match_first
+
+AGENT = "JobBot"
+
+
+def _parser(robots_txt: str) -> RobotFileParser:
+    parser = RobotFileParser()
+    parser.parse(robots_txt.strip().splitlines())
+    _longest_match_first(parser)
+    return parser
+
+
+def test_longest_rule_wins_regardless_of_order():
+    parser = _parser("""
+        User-agent: *
+        Disallow: /jobs
+        Allow: /jobs/public
+        Disallow: /jobs/public/drafts
+    """)
+
+    assert not parser.can_fetch(AGENT, "https://x.test/jobs/123")
+    assert parser.can_fetch(AGENT, "https://x.test/jobs/public/123")
+    assert not parser.can_fetch(AGENT, "https://x.test/jobs/public/drafts/1")
+    assert parser.can_fetch(AGENT, "https://x.test/about")
+
+
+def test_allow_wins_a_tie():
+    parser = _parser("""
+        User-agent: *
+        Disallow: /careers
+        Allow: /careers
+    """)
+
+    assert parser.can_fetch(AGENT, "https://x.test/careers/engineer")
+
+
+def test_wildcard_and_end_anchor():
+    parser = _parser("""
+        User-agent: *
+        Disallow: /*.pdf$
+        Disallow: /search*q=
+        Allow: /search
+    """)
+
+    assert not parser.can_fetch(AGENT, "https://x.test/files/offer.pdf")
+    assert parser.can_fetch(AGENT, "https://x.test/files/offer.pdf?download=1")  # $ anchors the end
+    assert not parser.can_fetch(AGENT, "https://x.test/search?page=2&q=python")
+    assert parser.can_fetch(AGENT, "https://x.test/search?page=2")
+
+
+def test_agent_specific_group_is_sorted_too():
+    parser = _parser("""
+        User-agent: JobBot
+        Disallow: /
+        Allow: /jobs/
+
+        User-agent: *
+        Allow: /
+    """)
+
+    assert parser.can_fetch(AGENT, "https://x.test/jobs/1")
+    assert not parser.can_fetch(AGENT, "https://x.test/admin")
+    assert parser.can_fetch("OtherBot", "https://x.test/admin")
+
+
+def _client(status: int, body: str = "") -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/robots.txt"
+        return httpx.Response(status, text=body)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_cache_applies_longest_match_to_fetched_rules():
+    cache = RobotsCache(ttl_seconds=60, error_ttl_seconds=60, user_agent=AGENT)
+    robots_txt = "User-agent: *\nDisallow: /jobs\nAllow: /jobs/open\n"
+
+    async def scenario():
+        async with _client(200, robots_txt) as client:
+            return (
+                await cache.allowed("https://robots-rules.test/jobs/open/1", client),
+                await cache.allowed("https://robots-rules.test/jobs/closed/1", client),
+            )
+
+    assert asyncio.run(scenario()) == (True, False)
+    assert (cache.fetches, cache.hits, cache.blocked) == (1, 1, 1)
+
+
+def test_cache_status_handling():
+    cache = RobotsCache(ttl_seconds=60, error_ttl_seconds=60, user_agent=AGENT)
+
+    async def allowed(status: int, host: str) -> bool:
+        async with _client(status) as client:
+            return await cache.allowed(f"https://{host}/jobs/1", client)
+
+    assert asyncio.run(allowed(403, "robots-forbidden.test")) is False  # 401/403: everything disallowed
+    assert asyncio.run(allowed(404, "robots-missing.test")) is True  # no robots.txt: everything allowed
@@ -0,0 +1,156 @@
+# tests/test_skill_batching.py
+
+import re
+import pytest
+
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_google_vertexai")
+
+from app.schemas.job import BatchSkillMatchItem, BatchSkillMatchResult, SkillMatchResult  # noqa: E402
+from app.services import skill_matcher_service as sms  # noqa: E402
+from app.services.llm_limiter import ProviderLimiter  # noqa: E402
+
+JOB_HEADER = re.compile(r"^### JOB (\d+)$", re.MULTILINE)
+
+
+def _result(score: int) -> SkillMatchResult:
+    return SkillMatchResult(matched_skills=["python"], missing_skills=[], match_score=score)
+
+
+class FakeAgent:
+    """Stands in for a LangChain agent: answers from `respond(prompt)`"""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.prompts = []
+
+    async def ainvoke(self, payload):
+        prompt = payload["messages"][0]["content"]
+        self.prompts.append(prompt)
+        return {"messages": [], "structured_response": self.respond(prompt)}
+
+
+def _score_of(prompt: str) -> int:
+    # Test JDs are "JD <score>"; the score doubles as the job's answer
+    return int(re.search(r"JD (\d+)", prompt).group(1))
+
+
+@pytest.fixture
+def matcher(monkeypatch):
+    monkeypatch.setattr(sms, "get_llm_groq", lambda: type("FakeLLM", (), {"model_name": "fake", "temperature": 0})())
+    monkeypatch.setattr(sms, "create_agent", lambda model, response_format: None)
+    monkeypatch.setattr(sms, "groq_limiter", ProviderLimiter("test", rpm=60000, tpm=6000000, concurrency=8))
+
+    service = sms.SkillMatcherService()
+    service.agent = FakeAgent(lambda prompt: _result(_score_of(prompt)))
+    return service
+
+
+def _batch_agent(skip=(), fail=False):
+    """Answers every '### JOB <n>' section except the job numbers in `skip`"""
+    def respond(prompt):
+        if fail:
+            raise RuntimeError("provider error")
+        sections = JOB_HEADER.split(prompt)[1:]
+        return BatchSkillMatchResult(results=[
+            BatchSkillMatchItem(job_id=number, matched_skills=[], missing_skills=[], match_score=_score_of(body))
+            for number, body in zip(sections[::2], sections[1::2])
+            if int(number) not in skip
+        ])
+
+    return FakeAgent(respond)
+
+
+# ------------------------------------------------------
+#  plan_batches
+# ------------------------------------------------------
+def test_plan_batches_respects_max_jobs(monkeypatch):
+    monkeypatch.setattr(sms.settings, "SKILL_BATCH_MAX_JOBS", 3)
+    monkeypatch.setattr(sms.settings, "SKILL_BATCH_TOKEN_BUDGET", 100000)
+
+    batches = sms.SkillMatcherService.plan_batches({str(i): "short JD" for i in range(7)})
+
+    assert [list(batch) for batch in batches] == [["0", "1", "2"], ["3", "4", "5"], ["6"]]
+
+
+def test_plan_batches_respects_token_budget(monkeypatch):
+    monkeypatch.setattr(sms.settings, "SKILL_BATCH_MAX_JOBS", 100)
+    monkeypatch.setattr(sms.settings, "SKILL_BATCH_JD_CHARS", 2000)
+    # Each JD costs 2000 // 4 + 1 + RESPONSE_TOKENS_PER_JOB tokens
+    per_job = 2000 // sms.CHARS_PER_TOKEN + 1 + sms.RESPONSE_TOKENS_PER_JOB
+    monkeypatch.setattr(sms.settings, "SKILL_BATCH_TOKEN_BUDGET", sms.BATCH_HEADER_TOKENS + 2 * per_job)
+
+    batches = sms.SkillMatcherService.plan_batches({str(i): "x" * 5000 for i in range(5)})  # truncated to 2000
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_plan_batches_keeps_an_oversized_job_alone(monkeypatch):
+    monkeypatch.setattr(sms.settings, "SKILL_BATCH_MAX_JOBS", 8)
+    monkeypatch.setattr(sms.settings, "SKILL_BATCH_TOKEN_BUDGET", 10)
+
+    batches = sms.SkillMatcherService.plan_batches({"a": "JD", "b": "JD"})
+
+    assert [list(batch) for batch in batches] == [["a"], ["b"]]
+
+
+# ------------------------------------------------------
+#  match_batch fallback
+# ------------------------------------------------------
+def test_match_batch_uses_one_call(run, matcher):
+    matcher.batch_agent = _batch_agent()
+
+    results = run(matcher.match_batch({"a": "JD 10", "b": "JD 20", "c": "JD 30"}))
+
+    assert {job_id: r.match_score for job_id, r in results.items()} == {"a": 10, "b": 20, "c": 30}
+    assert len(matcher.batch_agent.prompts) == 1
+    assert matcher.agent.prompts == []
+
+
+def test_match_batch_falls_back_for_jobs_missing_from_the_answer(run, matcher):
+    matcher.batch_agent = _batch_agent(skip={2})
+
+    results = run(matcher.match_batch({"a": "JD 10", "b": "JD 20", "c": "JD 30"}))
+
+    assert {job_id: r.match_score for job_id, r in results.items()} == {"a": 10, "b": 20, "c": 30}
+    assert len(matcher.agent.prompts) == 1
+    assert "JD 20" in matcher.agent.prompts[0]
+
+
+def test_match_batch_falls_back_when_the_call_fails(run, matcher):
+    matcher.batch_agent = _batch_agent(fail=True)
+
+    results = run(matcher.match_batch({"a": "JD 10", "b": "JD 20"}))
+
+    assert {job_id: r.match_score for job_id, r in results.items()} == {"a": 10, "b": 20}
+    assert len(matcher.agent.prompts) == 2
+
+
+def test_match_batch_leaves_out_jobs_whose_fallback_fails(run, matcher):
+    matcher.batch_agent = _batch_agent(fail=True)
+
+    def respond(prompt):
+        if "JD 20" in prompt:
+            raise RuntimeError("provider error")
+        return _result(_score_of(prompt))
+
+    matcher.agent = FakeAgent(respond)
+
+    results = run(matcher.match_batch({"a": "JD 10", "b": "JD 20"}))
+
+    assert list(results) == ["a"]
+
+
+def test_batch_answers_are_cached_under_the_batch_key(run, matcher):
+    matcher.batch_agent = _batch_agent()
+
+    async def scenario():
+        await matcher.match_batch({"a": "JD 10", "b": "JD 20"})
+        return await matcher.match_jobs({"a": "JD 10", "b": "JD 20"})
+
+    results = run(scenario())
+
+    assert {job_id: r.match_score for job_id, r in results.items()} == {"a": 10, "b": 20}
+    assert len(matcher.batch_agent.prompts) == 1  # the second run is served from the cache
+    # ... and not under the per-job prompt, which the model never saw
+    assert run(sms.llm_cache.lookup(matcher.llm, SkillMatchResult, matcher._prompt("JD 10"))) is None
@@ -0,0 +1,88 @@
+# tests/test_skill_engine.py
+
+import pytest
+from app.services.skill_engine import SkillEngine, engine_for, normalize_skill, skill_engine
+from app.tools.skill_matcher import score_skills
+
+
+@pytest.mark.parametrize("text, skill", [
+    ("Experience with Postgres required", "postgresql"),
+    ("We run everything on K8s", "kubernetes"),
+    ("Strong ReactJS and React.js skills", "react"),
+    ("Node JS or node-js backend", "node.js"),
+    ("Comfortable with RESTful services", "rest api"),
+    ("Amazon Web Services certification", "aws"),
+    ("Python3 scripting", "python"),
+])
+def test_aliases_map_to_canonical_skill(text, skill):
+    assert skill in skill_engine.match(text)
+
+
+@pytest.mark.parametrize("text, skill", [
+    ("Modern C++ (C++17)", "c++"),
+    ("C# and .NET Core", "c#"),
+    ("C# and .NET Core", ".net"),
+    ("Node.js services", "node.js"),
+    ("CI/CD pipelines", "ci/cd"),
+])
+def test_symbols_inside_skill_names_match(text, skill):
+    assert skill in skill_engine.match(text)
+
+
+@pytest.mark.parametrize("text, absent", [
+    ("Writes c+++ by accident", "c++"),
+    ("Legacy ASP.NET applications", ".net"),
+    ("JavaScript only", "java"),
+    ("Hosted on GitHub", "git"),
+    ("Pythonic code", "python"),
+    ("Redshift warehouse", "redis"),
+    ("html5lib parser", "html"),
+])
+def test_word_boundaries(text, absent):
+    assert absent not in skill_engine.match(text)
+
+
+def test_longest_alias_wins():
+    assert skill_engine.match("Angular JS frontend") == {"angular"}
+    assert skill_engine.match("Apache Kafka streams") == {"kafka"}
+    assert skill_engine.match("Google Cloud Platform") == {"gcp"}
+
+
+def test_canonical_and_normalize():
+    assert normalize_skill("  Rest-API ") == "rest api"
+    assert skill_engine.canonical("Postgres") == "postgresql"
+    assert skill_engine.canonical("COBOL") == "cobol"  # unknown skills pass through
+
+
+def test_custom_taxonomy():
+    engine = SkillEngine({"golang": ["go lang"], "go": []})
+    assert engine.match("Go-lang and Go") == {"golang", "go"}
+
+
+def test_match_batch_matrix():
+    rows = skill_engine.match_batch(
+        ["Python, Postgres and Docker", "JavaScript and git", ""],
+        ["python", "postgresql", "k8s", "git"]
+    )
+    assert rows == [
+        [True, True, False, False],
+        [False, False, False, True],
+        [False, False, False, False],
+    ]
+
+
+def test_engine_for_extends_taxonomy_with_unknown_skills():
+    assert engine_for(["python", "Postgres"]) is skill_engine
+
+    engine = engine_for(["python", "Elixir"])
+    assert engine is not skill_engine
+    assert engine is engine_for(["elixir", "Python"])  # cached by the extra skills
+    assert engine.match("Elixir and Python3") == {"elixir", "python"}
+
+
+def test_score_skills_uses_aliases():
+    result = score_skills("Python3, postgres and k8s", ["python", "postgresql", "kubernetes", "java"])
+
+    assert result["matched"] == ["python", "postgresql", "kubernetes"]
+    assert result["missing"] == ["java"]
+    assert result["match_score"] == 75
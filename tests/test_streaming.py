@@ -0,0 +1,66 @@
+# tests/test_streaming.py
+
+import json
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.streaming import format_event, stream_pipeline
+
+
+async def _body(response):
+    return "".join([chunk async for chunk in response.body_iterator])
+
+
+def test_ndjson_is_one_json_object_per_line():
+    line = format_event({"event": "job", "title": "Python Developer\nRemote"}, "ndjson")
+
+    assert line.endswith("\n") and line.count("\n") == 1
+    assert json.loads(line) == {"event": "job", "title": "Python Developer\nRemote"}
+
+
+def test_sse_frame_names_the_event():
+    frame = format_event({"event": "progress", "processed": 3}, "sse")
+
+    event, data, blank, end = frame.split("\n")
+    assert (event, blank, end) == ("event: progress", "", "")
+    assert json.loads(data.removeprefix("data: ")) == {"event": "progress", "processed": 3}
+
+
+def test_sse_defaults_to_message_and_encodes_datetimes():
+    frame = format_event({"at": datetime(2024, 1, 2, 3, 4, 5)}, "sse")
+
+    assert frame == 'event: message\ndata: {"at": "2024-01-02T03:04:05"}\n\n'
+
+
+def test_stream_pipeline_frames_each_event_as_it_comes(run):
+    sessions = []
+
+    async def events(db):
+        sessions.append(db)
+        yield {"event": "start"}
+        yield {"event": "done", "matched": 2}
+
+    response = stream_pipeline(events, "sse")
+    body = run(_body(response))
+
+    assert response.media_type == "text/event-stream"
+    assert response.headers["cache-control"] == "no-cache"
+    assert body.split("\n\n")[:-1] == [
+        'event: start\ndata: {"event": "start"}',
+        'event: done\ndata: {"event": "done", "matched": 2}',
+    ]
+    assert isinstance(sessions[0], AsyncSession)  # the pipeline's own session
+
+
+def test_pipeline_error_ends_the_stream_with_an_error_event(run):
+    async def events(db):
+        yield {"event": "start"}
+        raise RuntimeError("Adzuna is down")
+
+    response = stream_pipeline(events, "ndjson")
+    lines = run(_body(response)).splitlines()
+
+    assert response.media_type == "application/x-ndjson"
+    assert [json.loads(line) for line in lines] == [
+        {"event": "start"},
+        {"event": "error", "detail": "Adzuna is down"},
+    ]
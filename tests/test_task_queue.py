@@ -0,0 +1,144 @@
+# tests/test_task_queue.py
+
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import update
+
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_google_vertexai")
+
+from app.database import AsyncSessionLocal, ReadSessionLocal  # noqa: E402
+from app.models.automation_task import AutomationTask  # noqa: E402
+from app.services import task_queue  # noqa: E402
+from app.services.task_queue import AutomationTaskQueue  # noqa: E402
+
+
+def _queue(max_attempts=3) -> AutomationTaskQueue:
+    return AutomationTaskQueue(
+        workers=1, poll_seconds=0.01, max_attempts=max_attempts, lease_seconds=60, max_backoff_seconds=1
+    )
+
+
+async def _lapse(task_id):
+    """Make a running task's lease look expired"""
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(AutomationTask)
+            .where(AutomationTask.id == task_id)
+            .values(heartbeat_at=datetime.utcnow() - timedelta(minutes=5))
+        )
+        await session.commit()
+
+
+async def _task(task_id) -> AutomationTask:
+    async with ReadSessionLocal() as db:
+        return await _queue().get(db, task_id)
+
+
+def test_claim_takes_the_oldest_queued_task_once(run):
+    queue = _queue()
+
+    async def scenario():
+        first = await queue.submit({"query": "first"})
+        second = await queue.submit({"query": "second"})
+        claims = [await queue._claim() for _ in range(3)]
+        return first, second, claims
+
+    first, second, claims = run(scenario())
+
+    assert [task and task.id for task in claims] == [first.id, second.id, None]
+    assert all(task.status == "running" and task.owner == queue.owner for task in claims[:2])
+    assert claims[0].attempts == 1
+
+
+def test_concurrent_claims_never_share_a_task(run):
+    queues = [_queue() for _ in range(4)]
+
+    async def scenario():
+        await queues[0].submit({"query": "only"})
+        return await asyncio.gather(*(queue._claim() for queue in queues))
+
+    claims = run(scenario())
+
+    assert len([task for task in claims if task is not None]) == 1
+
+
+def test_lapsed_lease_is_recovered_by_another_process(run):
+    crashed, survivor = _queue(), _queue()
+
+    async def scenario():
+        lapsed = await crashed.submit({"query": "lapsed"})
+        live = await crashed.submit({"query": "live"})
+        await crashed._claim()
+        await survivor._claim()
+        await _lapse(lapsed.id)
+
+        await survivor._recover_expired()
+        recovered, untouched = await _task(lapsed.id), await _task(live.id)
+        reclaimed = await survivor._claim()
+
+        # The crashed worker's late writes no longer land
+        await crashed._update(lapsed.id, status="succeeded")
+        return recovered, untouched, reclaimed, await _task(lapsed.id)
+
+    recovered, untouched, reclaimed, final = run(scenario())
+
+    assert (recovered.status, recovered.owner, recovered.heartbeat_at) == ("queued", None, None)
+    assert (untouched.status, untouched.owner) == ("running", survivor.owner)
+    assert (reclaimed.id, reclaimed.attempts) == (recovered.id, 2)
+    assert (final.status, final.owner) == ("running", survivor.owner)
+
+
+def test_task_interrupted_too_often_fails(run):
+    queue = _queue(max_attempts=2)
+
+    async def scenario():
+        task = await queue.submit({"query": "flaky"})
+        for _ in range(2):
+            await queue._claim()
+            await _lapse(task.id)
+            await queue._recover_expired()
+        return await _task(task.id)
+
+    task = run(scenario())
+
+    assert (task.status, task.error, task.attempts) == ("failed", "Interrupted too many times", 2)
+    assert task.finished_at is not None
+
+
+def test_stop_releases_leases_for_the_next_start(run):
+    queue = _queue()
+
+    async def scenario():
+        task = await queue.submit({"query": "in flight"})
+        await queue._claim()
+        await queue.stop()
+        return await _task(task.id)
+
+    task = run(scenario())
+
+    assert (task.status, task.owner) == ("queued", None)
+
+
+def test_run_records_stages_and_result(run, monkeypatch):
+    queue = _queue()
+
+    async def run_full_automation(db, on_stage, **params):
+        await on_stage("collect", 0.5, {"saved": 3})
+        return {"query": params["query"], "matched": 1}
+
+    monkeypatch.setattr(task_queue, "run_full_automation", run_full_automation)
+
+    async def scenario():
+        await queue.submit({"query": "python"})
+        task = await queue._claim()
+        await queue._run(task)
+        async with ReadSessionLocal() as db:
+            return await queue.list_tasks(db, status="succeeded")
+
+    tasks = run(scenario())
+
+    assert len(tasks) == 1
+    assert tasks[0].stages == {"collect": {"seconds": 0.5, "summary": {"saved": 3}}}
+    assert tasks[0].result == {"query": "python", "matched": 1}